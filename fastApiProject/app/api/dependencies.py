@@ -0,0 +1,99 @@
+"""
+Repositorios de cada petición, compartidos por todos los servicios que la atienden.
+
+FastAPI resuelve una dependencia una sola vez por petición, así que los
+``get_service`` de las rutas reciben los mismos repositorios y, con ellos, los
+mismos cargadores: una marca, persona o vehículo leído por id por un servicio no
+se vuelve a consultar si otro lo pide en la misma petición, y las lecturas de
+varios ids se agrupan en un único ``IN``.
+
+``marcas_sin_cache`` lee de la base de datos sin pasar por la caché del proceso:
+la caché solo guarda los campos de catálogo de la marca, y ``GET /marcas/{id}``
+necesita la fila actual (versión y contador) para su cuerpo y su ETag.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.domain.repositories import AsyncMarcaRepository, MarcaRepository
+from app.infrastructure.cache import (
+    AsyncCachedMarcaRepository,
+    AsyncLoaderRepository,
+    CachedMarcaRepository,
+    LoaderRepository,
+    get_marca_cache,
+)
+from app.infrastructure.db.repositories import (
+    AsyncSQLAlchemyMarcaRepository,
+    AsyncSQLAlchemyPersonaRepository,
+    AsyncSQLAlchemyVehiculoRepository,
+    SQLAlchemyMarcaRepository,
+    SQLAlchemyPersonaRepository,
+    SQLAlchemyVehiculoRepository,
+)
+from app.infrastructure.db.replicas import lee_de_primaria
+from app.infrastructure.db.session import get_async_db, get_db
+
+
+@dataclass
+class Repositorios:
+    marcas: LoaderRepository
+    marcas_sin_cache: MarcaRepository
+    personas: LoaderRepository
+    vehiculos: LoaderRepository
+
+
+@dataclass
+class AsyncRepositorios:
+    marcas: AsyncLoaderRepository
+    marcas_sin_cache: AsyncMarcaRepository
+    personas: AsyncLoaderRepository
+    vehiculos: AsyncLoaderRepository
+
+
+def get_repositorios(db: Session = Depends(get_db)) -> Repositorios:
+    marcas_sin_cache = SQLAlchemyMarcaRepository(db)
+    marcas = LoaderRepository(
+        CachedMarcaRepository(
+            marcas_sin_cache, get_marca_cache(), puede_guardar=lambda: lee_de_primaria(db)
+        )
+    )
+
+    def al_cambiar_marcas(marcas_ids: Iterable[int]) -> None:
+        # El contador de la marca cambió: la petición no conserva el valor anterior
+        marcas.cargador.forget(list(marcas_ids))
+
+    return Repositorios(
+        marcas=marcas,
+        marcas_sin_cache=marcas_sin_cache,
+        personas=LoaderRepository(SQLAlchemyPersonaRepository(db)),
+        vehiculos=LoaderRepository(
+            SQLAlchemyVehiculoRepository(db, al_cambiar_marcas=al_cambiar_marcas)
+        ),
+    )
+
+
+def get_async_repositorios(db: AsyncSession = Depends(get_async_db)) -> AsyncRepositorios:
+    marcas_sin_cache = AsyncSQLAlchemyMarcaRepository(db)
+    marcas = AsyncLoaderRepository(
+        AsyncCachedMarcaRepository(
+            marcas_sin_cache, get_marca_cache(), puede_guardar=lambda: lee_de_primaria(db)
+        )
+    )
+
+    def al_cambiar_marcas(marcas_ids: Iterable[int]) -> None:
+        marcas.cargador.forget(list(marcas_ids))
+
+    return AsyncRepositorios(
+        marcas=marcas,
+        marcas_sin_cache=marcas_sin_cache,
+        personas=AsyncLoaderRepository(AsyncSQLAlchemyPersonaRepository(db)),
+        vehiculos=AsyncLoaderRepository(
+            AsyncSQLAlchemyVehiculoRepository(db, al_cambiar_marcas=al_cambiar_marcas)
+        ),
+    )
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, Response, status
+
+from app.api.serialization import cabeceras_publicadas
+from app.domain.entities import Marca, Persona, VehiculoDetalle, Version
+
+ETAG_HEADER = "ETag"
+
+
+def etag_para(tipo: str, entidad_id: int, version: Version) -> str:
+    """ETag fuerte de una entidad a partir de sus contadores de versión."""
+    partes = ":".join(str(parte) for parte in (tipo, entidad_id, *version))
+    return f'"{hashlib.sha1(partes.encode()).hexdigest()}"'
+
+
+def etag_lista(etags: Iterable[str]) -> str:
+    """ETag de una página: cambia si cambia cualquier elemento o su orden."""
+    digest = hashlib.sha1()
+    for etag in etags:
+        digest.update(etag.encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_marca(marca: Marca) -> str:
+    """Incluye el contador, que cambia sin incrementar la versión de la marca."""
+    return etag_para("marca", marca.id, (marca.version, marca.vehiculo_count))
+
+
+def etag_persona(persona: Persona) -> str:
+    return etag_para("persona", persona.id, (persona.version, persona.vehiculo_count))
+
+
+def etag_vehiculo(vehiculo: VehiculoDetalle) -> str:
+    """Misma composición que ``VehiculoRepository.get_version`` calcula en SQL."""
+    version = (
+        vehiculo.version,
+        vehiculo.marca.version,
+        len(vehiculo.propietarios),
+        sum(persona.version for persona in vehiculo.propietarios),
+    )
+    return etag_para("vehiculo", vehiculo.id, version)
+
+
+def coincide(cabecera: Optional[str], etag: str, debil: bool = True) -> bool:
+    """Compara ``etag`` con una cabecera ``If-None-Match`` / ``If-Match``.
+
+    ``If-None-Match`` usa comparación débil (se ignora el prefijo ``W/``); ``If-Match``
+    exige comparación fuerte, por lo que las etiquetas débiles nunca coinciden.
+    """
+    if cabecera is None:
+        return False
+    for candidato in (valor.strip() for valor in cabecera.split(",")):
+        if candidato == "*":
+            return True
+        if candidato.startswith("W/"):
+            if not debil:
+                continue
+            candidato = candidato[2:]
+        if candidato == etag:
+            return True
+    return False
+
+
+def no_modificado(etag: str, response: Optional[Response] = None) -> Response:
+    """Respuesta 304 que conserva las cabeceras ya publicadas (p. ej. el cursor)."""
+    headers = cabeceras_publicadas(response) if response is not None else {}
+    headers[ETAG_HEADER] = etag
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def responder_con_etag(
+    response: Response, etag: str, if_none_match: Optional[str]
+) -> Optional[Response]:
+    """Publica el ETag y devuelve un 304 si el cliente ya tiene esa representación."""
+    response.headers[ETAG_HEADER] = etag
+    if coincide(if_none_match, etag):
+        return no_modificado(etag, response)
+    return None
+
+
+def exigir_if_match(if_match: str, etag: str) -> None:
+    """Rechaza con 412 una escritura condicionada a una versión que ya no es la actual."""
+    if not coincide(if_match, etag, debil=False):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="El recurso fue modificado por otra petición.",
+        )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Literal
+
+from app.domain.entities import VehiculoExportado
+
+FormatoExportacion = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+CSV_COLUMNS = (
+    "id",
+    "modelo",
+    "marca_id",
+    "nombre_marca",
+    "numero_puertas",
+    "color",
+    "propietarios_cedulas",
+)
+
+# Filas por fragmento enviado al cliente: evita una escritura de socket por vehículo
+FILAS_POR_FRAGMENTO = 500
+
+
+def _ndjson_formatter() -> Callable[[VehiculoExportado], str]:
+    def formatear(v: VehiculoExportado) -> str:
+        return json.dumps(
+            {
+                "id": v.id,
+                "modelo": v.modelo,
+                "marca_id": v.marca_id,
+                "nombre_marca": v.nombre_marca,
+                "numero_puertas": v.numero_puertas,
+                "color": v.color,
+                "propietarios_cedulas": v.propietarios_cedulas,
+            },
+            ensure_ascii=False,
+        ) + "\n"
+
+    return formatear
+
+
+def _csv_formatter() -> Callable[[VehiculoExportado], str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def formatear(v: VehiculoExportado) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(
+            (
+                v.id,
+                v.modelo,
+                v.marca_id,
+                v.nombre_marca,
+                v.numero_puertas,
+                v.color,
+                ";".join(v.propietarios_cedulas),
+            )
+        )
+        return buffer.getvalue()
+
+    return formatear
+
+
+def _cabecera(formato: FormatoExportacion) -> str:
+    return ",".join(CSV_COLUMNS) + "\n" if formato == "csv" else ""
+
+
+def _formatter(formato: FormatoExportacion) -> Callable[[VehiculoExportado], str]:
+    return _csv_formatter() if formato == "csv" else _ndjson_formatter()
+
+
+def iter_export_chunks(
+    vehiculos: Iterable[VehiculoExportado], formato: FormatoExportacion
+) -> Iterator[str]:
+    """Serializa la exportación en fragmentos de ``FILAS_POR_FRAGMENTO`` filas."""
+    formatear = _formatter(formato)
+    fragmento = [_cabecera(formato)]
+    for vehiculo in vehiculos:
+        fragmento.append(formatear(vehiculo))
+        if len(fragmento) >= FILAS_POR_FRAGMENTO:
+            yield "".join(fragmento)
+            fragmento = []
+    if fragmento:
+        yield "".join(fragmento)
+
+
+async def aiter_export_chunks(
+    vehiculos: AsyncIterable[VehiculoExportado], formato: FormatoExportacion
+) -> AsyncIterator[str]:
+    """Versión asíncrona de :func:`iter_export_chunks`."""
+    formatear = _formatter(formato)
+    fragmento = [_cabecera(formato)]
+    async for vehiculo in vehiculos:
+        fragmento.append(formatear(vehiculo))
+        if len(fragmento) >= FILAS_POR_FRAGMENTO:
+            yield "".join(fragmento)
+            fragmento = []
+    if fragmento:
+        yield "".join(fragmento)
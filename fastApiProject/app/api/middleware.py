@@ -0,0 +1,192 @@
+"""
+Middleware ASGI de la API.
+
+Se escriben como ASGI puro (no ``BaseHTTPMiddleware``) para no añadir una tarea ni
+copiar el cuerpo de la respuesta en cada petición.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.infrastructure.db.replicas import lectura_en_replica
+from app.infrastructure.metricas import ConsumoBD, RegistroMetricas, consumo_bd, get_metricas
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+RUTA_DESCONOCIDA = "<sin ruta>"
+
+_ATRIBUTO_PRESUPUESTO = "__presupuesto_consultas__"
+
+COOKIE_LEER_PRIMARIA = "leer_primaria"
+
+METODOS_LECTURA = frozenset({"GET", "HEAD"})
+
+
+class MetricasMiddleware:
+    """Cuenta y mide cada petición HTTP por método, plantilla de ruta y estado."""
+
+    def __init__(self, app: ASGIApp, registro: Optional[RegistroMetricas] = None) -> None:
+        self.app = app
+        self.registro = registro or get_metricas()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = 500
+
+        async def enviar(mensaje: Message) -> None:
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+
+        self.registro.inicio_peticion()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            # El router de FastAPI deja en el scope la ruta que atendió la petición
+            ruta = scope.get("route")
+            self.registro.fin_peticion(
+                scope["method"],
+                getattr(ruta, "path", RUTA_DESCONOCIDA),
+                estado,
+                time.perf_counter() - inicio,
+            )
+
+
+class PresupuestoConsultasExcedido(RuntimeError):
+    """Una ruta emitió más sentencias SQL que su presupuesto (posible N+1)."""
+
+
+def presupuesto_consultas(maximo: int) -> Callable[[F], F]:
+    """Fija el máximo de sentencias SQL de una ruta en lugar de ``DB_QUERY_BUDGET``.
+
+    Se aplica debajo del decorador de la ruta::
+
+        @router.post("/bulk")
+        @presupuesto_consultas(15)
+        def crear_lote(...): ...
+    """
+
+    def decorar(endpoint: F) -> F:
+        setattr(endpoint, _ATRIBUTO_PRESUPUESTO, maximo)
+        return endpoint
+
+    return decorar
+
+
+class ConsumoBDMiddleware:
+    """Cabeceras ``Server-Timing`` y ``X-DB-Queries`` y control del presupuesto de consultas.
+
+    Las sentencias se cuentan con los eventos del motor (``instrumentar_motor``).
+    Las cabeceras se escriben al empezar la respuesta: en las respuestas en streaming
+    no incluyen las consultas hechas mientras se envía el cuerpo.
+    """
+
+    def __init__(
+        self, app: ASGIApp, presupuesto: Optional[int] = None, estricto: Optional[bool] = None
+    ) -> None:
+        settings = get_settings()
+        self.app = app
+        self.presupuesto = settings.db_query_budget if presupuesto is None else presupuesto
+        self.estricto = settings.db_query_budget_strict if estricto is None else estricto
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        consumo = ConsumoBD()
+        token = consumo_bd.set(consumo)
+        inicio = time.perf_counter()
+
+        async def enviar(mensaje: Message) -> None:
+            if mensaje["type"] == "http.response.start":
+                self._controlar_presupuesto(scope, consumo)
+                total_ms = (time.perf_counter() - inicio) * 1000
+                cabeceras = MutableHeaders(scope=mensaje)
+                cabeceras.append(
+                    "Server-Timing",
+                    f'db;dur={consumo.segundos * 1000:.1f};desc="consultas={consumo.consultas}", '
+                    f"total;dur={total_ms:.1f}",
+                )
+                cabeceras.append("X-DB-Queries", str(consumo.consultas))
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            consumo_bd.reset(token)
+
+    def _controlar_presupuesto(self, scope: Scope, consumo: ConsumoBD) -> None:
+        ruta = scope.get("route")
+        maximo = getattr(getattr(ruta, "endpoint", None), _ATRIBUTO_PRESUPUESTO, self.presupuesto)
+        if not maximo or consumo.consultas <= maximo:
+            return
+        mensaje = (
+            f"{scope['method']} {getattr(ruta, 'path', scope['path'])} emitió "
+            f"{consumo.consultas} sentencias SQL (presupuesto: {maximo})"
+        )
+        if self.estricto:
+            raise PresupuestoConsultasExcedido(mensaje)
+        logger.warning(mensaje)
+
+
+class ReplicasMiddleware:
+    """Decide qué peticiones pueden leer de una réplica (``lectura_en_replica``).
+
+    GET y HEAD leen de una réplica salvo que el cliente haya escrito hace menos de
+    ``DB_READ_YOUR_WRITES_SECONDS``: cada escritura con éxito devuelve la cookie
+    ``leer_primaria`` con el instante hasta el que sus lecturas van a la primaria,
+    así el cliente ve lo que acaba de escribir aunque la réplica vaya retrasada.
+    """
+
+    def __init__(self, app: ASGIApp, ventana: Optional[float] = None) -> None:
+        self.app = app
+        self.ventana = get_settings().db_read_your_writes_seconds if ventana is None else ventana
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in METODOS_LECTURA:
+            token = lectura_en_replica.set(not self._escribio_hace_poco(scope))
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                lectura_en_replica.reset(token)
+            return
+
+        async def enviar(mensaje: Message) -> None:
+            if mensaje["type"] == "http.response.start" and mensaje["status"] < 400:
+                hasta = time.time() + self.ventana
+                MutableHeaders(scope=mensaje).append(
+                    "Set-Cookie",
+                    f"{COOKIE_LEER_PRIMARIA}={hasta:.3f}; Max-Age={math.ceil(self.ventana)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(mensaje)
+
+        await self.app(scope, receive, enviar if self.ventana > 0 else send)
+
+    @staticmethod
+    def _escribio_hace_poco(scope: Scope) -> bool:
+        valor = HTTPConnection(scope).cookies.get(COOKIE_LEER_PRIMARIA)
+        try:
+            return valor is not None and float(valor) > time.time()
+        except ValueError:
+            return False
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, Optional, Sequence, Tuple, Union
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Valor de la columna de orden en la fila ancla de un cursor
+ValorOrden = Union[str, int]
+
+
+def encode_cursor(last_id: int, orden: Optional[str] = None, valor: Any = None) -> str:
+    """Genera un cursor opaco a partir del último id devuelto en la página.
+
+    Con ``orden`` el cursor guarda también el orden del listado y el valor de ese
+    campo en la última fila, para no tener que volver a leerla.
+    """
+    datos = {"id": last_id} if orden is None else {"id": last_id, "sort": orden, "valor": valor}
+    payload = json.dumps(datos, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def _cursor_invalido(detalle: str = "Cursor inválido.") -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detalle)
+
+
+def _leer_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise _cursor_invalido() from exc
+    if not isinstance(payload, dict) or type(payload.get("id")) is not int:
+        raise _cursor_invalido()
+    return payload
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Obtiene el id de referencia de un cursor; ``None`` si no se envió cursor."""
+    if cursor is None:
+        return None
+    return _leer_cursor(cursor)["id"]
+
+
+def decode_cursor_ordenado(
+    cursor: Optional[str], orden: str
+) -> Tuple[Optional[int], Optional[ValorOrden]]:
+    """Id y valor de orden de la fila ancla; rechaza un cursor emitido con otro ``sort``.
+
+    Un cursor sin orden (ordenado por id) solo sirve para ``sort=id``.
+    """
+    if cursor is None:
+        return None, None
+    payload = _leer_cursor(cursor)
+    if payload.get("sort", "id") != orden:
+        raise _cursor_invalido("El cursor pertenece a un listado con otro orden.")
+    if orden.lstrip("-") == "id":
+        return payload["id"], None
+    valor = payload.get("valor")
+    if type(valor) not in (str, int):
+        raise _cursor_invalido()
+    return payload["id"], valor
+
+
+def set_next_cursor(
+    response: Response, items: Sequence, limit: int, orden: Optional[str] = None
+) -> None:
+    """Publica el cursor de la siguiente página cuando la actual está completa."""
+    if limit > 0 and len(items) == limit:
+        ultimo = items[-1]
+        valor = getattr(ultimo, orden.lstrip("-")) if orden is not None else None
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(ultimo.id, orden, valor)
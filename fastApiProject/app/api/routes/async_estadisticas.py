@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.async_estadisticas_service import AsyncEstadisticasService
+from app.core.config import get_settings
+from app.infrastructure.db.repositories import AsyncSQLAlchemyEstadisticasRepository
+from app.infrastructure.db.session import get_async_db
+from app.schemas import ConteoPorMarcaRead, ConteoRead
+
+router = APIRouter(prefix="/api/stats", tags=["Estadísticas"])
+
+
+def get_service(db: AsyncSession = Depends(get_async_db)) -> AsyncEstadisticasService:
+    repository = AsyncSQLAlchemyEstadisticasRepository(db, get_settings().stats_materialized)
+    return AsyncEstadisticasService(repository)
+
+
+@router.get("/vehiculos/por-marca", response_model=List[ConteoPorMarcaRead])
+async def vehiculos_por_marca(
+    limit: int = Query(100, ge=1, le=1000),
+    service: AsyncEstadisticasService = Depends(get_service),
+) -> List[ConteoPorMarcaRead]:
+    return [ConteoPorMarcaRead.model_validate(c) for c in await service.count_by_marca(limit)]
+
+
+@router.get("/vehiculos/por-pais", response_model=List[ConteoRead])
+async def vehiculos_por_pais(
+    limit: int = Query(100, ge=1, le=1000),
+    service: AsyncEstadisticasService = Depends(get_service),
+) -> List[ConteoRead]:
+    return [ConteoRead.model_validate(c) for c in await service.count_by_pais(limit)]
+
+
+@router.get("/vehiculos/por-color", response_model=List[ConteoRead])
+async def vehiculos_por_color(
+    limit: int = Query(100, ge=1, le=1000),
+    service: AsyncEstadisticasService = Depends(get_service),
+) -> List[ConteoRead]:
+    return [ConteoRead.model_validate(c) for c in await service.count_by_color(limit)]
+
+
+@router.get("/vehiculos/por-puertas", response_model=List[ConteoRead])
+async def vehiculos_por_puertas(
+    service: AsyncEstadisticasService = Depends(get_service),
+) -> List[ConteoRead]:
+    return [ConteoRead.model_validate(c) for c in await service.count_by_puertas()]
+
+
+@router.get("/vehiculos/por-propietarios", response_model=List[ConteoRead])
+async def vehiculos_por_numero_de_propietarios(
+    service: AsyncEstadisticasService = Depends(get_service),
+) -> List[ConteoRead]:
+    return [ConteoRead.model_validate(c) for c in await service.propietarios_distribution()]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, Response, status
+
+from app.api.dependencies import AsyncRepositorios, get_async_repositorios
+from app.api.etag import (
+    ETAG_HEADER,
+    etag_lista,
+    etag_para,
+    etag_marca,
+    exigir_if_match,
+    responder_con_etag,
+)
+from app.api.pagination import decode_cursor, set_next_cursor
+from app.api.serialization import respuesta_rapida, serializar_marca
+from app.application.services.async_marca_service import AsyncMarcaService
+from app.core.config import get_settings
+from app.domain.entities import Marca as MarcaEntity
+from app.schemas import MAX_LOTE, MarcaCreate, MarcaLoteRead, MarcaRead, MarcaUpdate
+
+router = APIRouter(prefix="/api/marcas", tags=["Marcas"])
+
+
+def get_service(repos: AsyncRepositorios = Depends(get_async_repositorios)) -> AsyncMarcaService:
+    return AsyncMarcaService(repos.marcas, lectura=repos.marcas_sin_cache)
+
+
+@router.post("/", response_model=MarcaRead, status_code=status.HTTP_201_CREATED)
+async def crear_marca(
+    marca_in: MarcaCreate, service: AsyncMarcaService = Depends(get_service)
+) -> MarcaRead:
+    created = await service.create(MarcaEntity(**marca_in.model_dump()))
+    return MarcaRead.model_validate(created)
+
+
+@router.post("/bulk", response_model=MarcaLoteRead, status_code=status.HTTP_201_CREATED)
+async def crear_marcas_lote(
+    marcas_in: List[MarcaCreate] = Body(..., max_length=MAX_LOTE),
+    service: AsyncMarcaService = Depends(get_service),
+) -> MarcaLoteRead:
+    resultado = await service.create_many([MarcaEntity(**m.model_dump()) for m in marcas_in])
+    return MarcaLoteRead.model_validate(resultado)
+
+
+@router.get("/", response_model=List[MarcaRead])
+async def listar_marcas(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    service: AsyncMarcaService = Depends(get_service),
+) -> List[MarcaRead]:
+    items = await service.list(skip, limit, decode_cursor(cursor))
+    set_next_cursor(response, items, limit)
+    no_modificada = responder_con_etag(
+        response, etag_lista(etag_marca(x) for x in items), if_none_match
+    )
+    if no_modificada is not None:
+        return no_modificada
+    if get_settings().fast_json:
+        return respuesta_rapida(items, serializar_marca, response)
+    return [MarcaRead.model_validate(m) for m in items]
+
+
+@router.get("/{marca_id}", response_model=MarcaRead)
+async def obtener_marca(
+    marca_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: AsyncMarcaService = Depends(get_service),
+) -> MarcaRead:
+    """Lee la fila actual: el 304 y el ETag publicado salen de la misma versión y contador."""
+    marca = await service.get(marca_id)
+    no_modificada = responder_con_etag(response, etag_marca(marca), if_none_match)
+    if no_modificada is not None:
+        return no_modificada
+    return MarcaRead.model_validate(marca)
+
+
+@router.put("/{marca_id}", response_model=MarcaRead)
+async def actualizar_marca(
+    marca_id: int,
+    marca_in: MarcaUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    service: AsyncMarcaService = Depends(get_service),
+) -> MarcaRead:
+    version_esperada = None
+    if if_match is not None:
+        version = await service.get_version(marca_id)
+        exigir_if_match(if_match, etag_para("marca", marca_id, version))
+        version_esperada = version[0]
+    updated = await service.update(
+        marca_id, marca_in.model_dump(exclude_unset=True), version_esperada
+    )
+    response.headers[ETAG_HEADER] = etag_marca(updated)
+    return MarcaRead.model_validate(updated)
+
+
+@router.delete(
+    "/{marca_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+)
+async def eliminar_marca(
+    marca_id: int, service: AsyncMarcaService = Depends(get_service)
+) -> Response:
+    await service.delete(marca_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import AsyncRepositorios, get_async_repositorios
+from app.api.etag import (
+    ETAG_HEADER,
+    coincide,
+    etag_lista,
+    etag_para,
+    etag_vehiculo,
+    exigir_if_match,
+    no_modificado,
+    responder_con_etag,
+)
+from app.api.export import MEDIA_TYPES, FormatoExportacion, aiter_export_chunks
+from app.api.middleware import presupuesto_consultas
+from app.api.pagination import decode_cursor_ordenado, set_next_cursor
+from app.api.serialization import respuesta_rapida, serializar_vehiculo
+from app.application.services.async_vehiculo_service import AsyncVehiculoService
+from app.core.config import get_settings
+from app.domain.entities import FiltroVehiculos, Vehiculo as VehiculoEntity
+from app.schemas import (
+    MAX_LOTE,
+    OrdenVehiculos,
+    PropietarioAsignacion,
+    VehiculoCreate,
+    VehiculoLoteRead,
+    VehiculoRead,
+    VehiculoUpdate,
+)
+
+router = APIRouter(prefix="/api/vehiculos", tags=["Vehículos"])
+
+
+def get_service(
+    repos: AsyncRepositorios = Depends(get_async_repositorios),
+) -> AsyncVehiculoService:
+    return AsyncVehiculoService(repos.vehiculos, repos.marcas, repos.personas)
+
+
+@router.post("/", response_model=VehiculoRead, status_code=status.HTTP_201_CREATED)
+async def crear_vehiculo(
+    vehiculo_in: VehiculoCreate, service: AsyncVehiculoService = Depends(get_service)
+) -> VehiculoRead:
+    created = await service.create(VehiculoEntity(**vehiculo_in.model_dump()))
+    return VehiculoRead.model_validate(created)
+
+
+@router.post("/bulk", response_model=VehiculoLoteRead, status_code=status.HTTP_201_CREATED)
+async def crear_vehiculos_lote(
+    vehiculos_in: List[VehiculoCreate] = Body(..., max_length=MAX_LOTE),
+    service: AsyncVehiculoService = Depends(get_service),
+) -> VehiculoLoteRead:
+    resultado = await service.create_many([VehiculoEntity(**v.model_dump()) for v in vehiculos_in])
+    return VehiculoLoteRead.model_validate(resultado)
+
+
+@router.get("/", response_model=List[VehiculoRead])
+async def listar_vehiculos(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    marca_id: Optional[int] = None,
+    color: Optional[str] = None,
+    numero_puertas: Optional[int] = Query(None, ge=1, le=6),
+    propietario_id: Optional[int] = None,
+    sort: OrdenVehiculos = "id",
+    if_none_match: Optional[str] = Header(None),
+    service: AsyncVehiculoService = Depends(get_service),
+) -> List[VehiculoRead]:
+    """Listado filtrable por marca, color, puertas y propietario.
+
+    ``sort`` acepta un campo (``-`` para descendente); el desempate es siempre el
+    id. El cursor guarda el orden y el valor de la última fila: solo vale con el
+    mismo ``sort`` y sigue funcionando aunque esa fila se borre.
+    """
+    after_id, valor_ancla = decode_cursor_ordenado(cursor, sort)
+    filtro = FiltroVehiculos(
+        marca_id=marca_id,
+        color=color,
+        numero_puertas=numero_puertas,
+        propietario_id=propietario_id,
+        orden=sort,
+        valor_ancla=valor_ancla,
+    )
+    items = await service.list_detailed(skip, limit, after_id, filtro)
+    set_next_cursor(response, items, limit, sort)
+    no_modificada = responder_con_etag(
+        response, etag_lista(etag_vehiculo(x) for x in items), if_none_match
+    )
+    if no_modificada is not None:
+        return no_modificada
+    if get_settings().fast_json:
+        return respuesta_rapida(items, serializar_vehiculo, response)
+    return [VehiculoRead.model_validate(v) for v in items]
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def exportar_vehiculos(
+    formato: FormatoExportacion = Query("ndjson", alias="format"),
+    service: AsyncVehiculoService = Depends(get_service),
+) -> StreamingResponse:
+    """Exporta todo el registro (con marca y cédulas de propietarios) en NDJSON o CSV.
+
+    Las filas se leen con un cursor del lado del servidor y se envían a medida que
+    llegan, por lo que la memoria usada no depende del tamaño de la tabla.
+    """
+    return StreamingResponse(
+        aiter_export_chunks(service.iter_export(), formato),
+        media_type=MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="vehiculos.{formato}"'},
+    )
+
+
+@router.get("/{vehiculo_id}", response_model=VehiculoRead)
+async def obtener_vehiculo(
+    vehiculo_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: AsyncVehiculoService = Depends(get_service),
+) -> VehiculoRead:
+    """Con ``If-None-Match`` se compara primero contra la versión, sin cargar la entidad."""
+    if if_none_match is not None:
+        etag = etag_para("vehiculo", vehiculo_id, await service.get_version(vehiculo_id))
+        if coincide(if_none_match, etag):
+            return no_modificado(etag)
+    vehiculo = await service.get_detailed(vehiculo_id)
+    response.headers[ETAG_HEADER] = etag_vehiculo(vehiculo)
+    return VehiculoRead.model_validate(vehiculo)
+
+
+@router.put("/{vehiculo_id}", response_model=VehiculoRead)
+# Cambiar marca y propietarios a la vez: validación, dos actualizaciones versionadas,
+# reemplazo de propietarios, ajuste de contadores y la relectura final
+@presupuesto_consultas(12)
+async def actualizar_vehiculo(
+    vehiculo_id: int,
+    vehiculo_in: VehiculoUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    service: AsyncVehiculoService = Depends(get_service),
+) -> VehiculoRead:
+    version_esperada = None
+    if if_match is not None:
+        version = await service.get_version(vehiculo_id)
+        exigir_if_match(if_match, etag_para("vehiculo", vehiculo_id, version))
+        version_esperada = version[0]
+    updated = await service.update(
+        vehiculo_id, vehiculo_in.model_dump(exclude_unset=True), version_esperada
+    )
+    response.headers[ETAG_HEADER] = etag_vehiculo(updated)
+    return VehiculoRead.model_validate(updated)
+
+
+@router.delete(
+    "/{vehiculo_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+)
+async def eliminar_vehiculo(
+    vehiculo_id: int, service: AsyncVehiculoService = Depends(get_service)
+) -> Response:
+    await service.delete(vehiculo_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post(
+    "/{vehiculo_id}/propietarios/",
+    response_model=VehiculoRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def agregar_propietario_a_vehiculo(
+    vehiculo_id: int,
+    asignacion: PropietarioAsignacion,
+    service: AsyncVehiculoService = Depends(get_service),
+) -> VehiculoRead:
+    vehiculo = await service.add_propietario(vehiculo_id, asignacion.persona_id)
+    return VehiculoRead.model_validate(vehiculo)
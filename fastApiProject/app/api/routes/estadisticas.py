@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.application.services.estadisticas_service import EstadisticasService
+from app.core.config import get_settings
+from app.infrastructure.db.repositories import SQLAlchemyEstadisticasRepository
+from app.infrastructure.db.session import get_db
+from app.schemas import ConteoPorMarcaRead, ConteoRead
+
+router = APIRouter(prefix="/api/stats", tags=["Estadísticas"])
+
+
+def get_service(db: Session = Depends(get_db)) -> EstadisticasService:
+    repository = SQLAlchemyEstadisticasRepository(db, get_settings().stats_materialized)
+    return EstadisticasService(repository)
+
+
+@router.get("/vehiculos/por-marca", response_model=List[ConteoPorMarcaRead])
+def vehiculos_por_marca(
+    limit: int = Query(100, ge=1, le=1000), service: EstadisticasService = Depends(get_service)
+) -> List[ConteoPorMarcaRead]:
+    """Marcas con más vehículos primero (incluye las que no tienen ninguno)."""
+    return [ConteoPorMarcaRead.model_validate(c) for c in service.count_by_marca(limit)]
+
+
+@router.get("/vehiculos/por-pais", response_model=List[ConteoRead])
+def vehiculos_por_pais(
+    limit: int = Query(100, ge=1, le=1000), service: EstadisticasService = Depends(get_service)
+) -> List[ConteoRead]:
+    return [ConteoRead.model_validate(c) for c in service.count_by_pais(limit)]
+
+
+@router.get("/vehiculos/por-color", response_model=List[ConteoRead])
+def vehiculos_por_color(
+    limit: int = Query(100, ge=1, le=1000), service: EstadisticasService = Depends(get_service)
+) -> List[ConteoRead]:
+    return [ConteoRead.model_validate(c) for c in service.count_by_color(limit)]
+
+
+@router.get("/vehiculos/por-puertas", response_model=List[ConteoRead])
+def vehiculos_por_puertas(service: EstadisticasService = Depends(get_service)) -> List[ConteoRead]:
+    return [ConteoRead.model_validate(c) for c in service.count_by_puertas()]
+
+
+@router.get("/vehiculos/por-propietarios", response_model=List[ConteoRead])
+def vehiculos_por_numero_de_propietarios(
+    service: EstadisticasService = Depends(get_service),
+) -> List[ConteoRead]:
+    """Distribución de propietarios: cuántos vehículos tienen 0, 1, 2… dueños."""
+    return [ConteoRead.model_validate(c) for c in service.propietarios_distribution()]
@@ -1,21 +1,30 @@
 from __future__ import annotations
 
-from typing import List
-
-from fastapi import APIRouter, Depends, Response, status
-from sqlalchemy.orm import Session
-
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, Response, status
+
+from app.api.dependencies import Repositorios, get_repositorios
+from app.api.etag import (
+    ETAG_HEADER,
+    etag_lista,
+    etag_para,
+    etag_marca,
+    exigir_if_match,
+    responder_con_etag,
+)
+from app.api.pagination import decode_cursor, set_next_cursor
+from app.api.serialization import respuesta_rapida, serializar_marca
 from app.application.services.marca_service import MarcaService
+from app.core.config import get_settings
 from app.domain.entities import Marca as MarcaEntity
-from app.infrastructure.db.repositories import SQLAlchemyMarcaRepository
-from app.infrastructure.db.session import get_db
-from app.schemas import MarcaCreate, MarcaRead, MarcaUpdate
+from app.schemas import MAX_LOTE, MarcaCreate, MarcaLoteRead, MarcaRead, MarcaUpdate
 
 router = APIRouter(prefix="/api/marcas", tags=["Marcas"])
 
 
-def get_service(db: Session = Depends(get_db)) -> MarcaService:
-    return MarcaService(SQLAlchemyMarcaRepository(db))
+def get_service(repos: Repositorios = Depends(get_repositorios)) -> MarcaService:
+    return MarcaService(repos.marcas, lectura=repos.marcas_sin_cache)
 
 
 @router.post("/", response_model=MarcaRead, status_code=status.HTTP_201_CREATED)
@@ -24,24 +33,72 @@ def crear_marca(marca_in: MarcaCreate, service: MarcaService = Depends(get_servi
     return MarcaRead.model_validate(created)
 
 
+@router.post("/bulk", response_model=MarcaLoteRead, status_code=status.HTTP_201_CREATED)
+def crear_marcas_lote(
+    marcas_in: List[MarcaCreate] = Body(..., max_length=MAX_LOTE),
+    service: MarcaService = Depends(get_service),
+) -> MarcaLoteRead:
+    resultado = service.create_many([MarcaEntity(**m.model_dump()) for m in marcas_in])
+    return MarcaLoteRead.model_validate(resultado)
+
+
 @router.get("/", response_model=List[MarcaRead])
 def listar_marcas(
-    skip: int = 0, limit: int = 100, service: MarcaService = Depends(get_service)
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    service: MarcaService = Depends(get_service),
 ) -> List[MarcaRead]:
-    return [MarcaRead.model_validate(m) for m in service.list(skip, limit)]
+    """Lista paginada por ``skip`` o, enviando ``cursor``, por keyset sobre el id.
+
+    El cursor de la página siguiente se devuelve en la cabecera ``X-Next-Cursor``.
+    """
+    items = service.list(skip, limit, decode_cursor(cursor))
+    set_next_cursor(response, items, limit)
+    no_modificada = responder_con_etag(
+        response, etag_lista(etag_marca(x) for x in items), if_none_match
+    )
+    if no_modificada is not None:
+        return no_modificada
+    if get_settings().fast_json:
+        return respuesta_rapida(items, serializar_marca, response)
+    return [MarcaRead.model_validate(m) for m in items]
 
 
 @router.get("/{marca_id}", response_model=MarcaRead)
-def obtener_marca(marca_id: int, service: MarcaService = Depends(get_service)) -> MarcaRead:
+def obtener_marca(
+    marca_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: MarcaService = Depends(get_service),
+) -> MarcaRead:
+    """Lee la fila actual: el 304 y el ETag publicado salen de la misma versión y contador."""
     marca = service.get(marca_id)
+    no_modificada = responder_con_etag(response, etag_marca(marca), if_none_match)
+    if no_modificada is not None:
+        return no_modificada
     return MarcaRead.model_validate(marca)
 
 
 @router.put("/{marca_id}", response_model=MarcaRead)
 def actualizar_marca(
-    marca_id: int, marca_in: MarcaUpdate, service: MarcaService = Depends(get_service)
+    marca_id: int,
+    marca_in: MarcaUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    service: MarcaService = Depends(get_service),
 ) -> MarcaRead:
-    updated = service.update(marca_id, marca_in.model_dump(exclude_unset=True))
+    version_esperada = None
+    if if_match is not None:
+        version = service.get_version(marca_id)
+        exigir_if_match(if_match, etag_para("marca", marca_id, version))
+        version_esperada = version[0]
+    updated = service.update(
+        marca_id, marca_in.model_dump(exclude_unset=True), version_esperada
+    )
+    response.headers[ETAG_HEADER] = etag_marca(updated)
     return MarcaRead.model_validate(updated)
 
 
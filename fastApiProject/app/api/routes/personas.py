@@ -1,22 +1,43 @@
 from __future__ import annotations
 
-from typing import List
-
-from fastapi import APIRouter, Depends, Response, status
-from sqlalchemy.orm import Session
-
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, Query, Response, status
+
+from app.api.dependencies import Repositorios, get_repositorios
+from app.api.etag import (
+    ETAG_HEADER,
+    coincide,
+    etag_lista,
+    etag_para,
+    etag_persona,
+    etag_vehiculo,
+    exigir_if_match,
+    no_modificado,
+    responder_con_etag,
+)
+from app.api.pagination import decode_cursor, set_next_cursor
+from app.api.serialization import respuesta_rapida, serializar_persona, serializar_vehiculo
 from app.application.services.persona_service import PersonaService
+from app.application.services.vehiculo_service import VehiculoService
+from app.core.config import get_settings
 from app.domain.entities import Persona as PersonaEntity
-from app.infrastructure.db.repositories import SQLAlchemyPersonaRepository
-from app.infrastructure.db.session import get_db
-from app.schemas import PersonaCreate, PersonaRead, PersonaUpdate, VehiculoRead
-from app.infrastructure.db.models import PersonaDB
+from app.schemas import (
+    MAX_LOTE,
+    PersonaCreate,
+    PersonaLoteRead,
+    PersonaRead,
+    PersonaUpdate,
+    VehiculoRead,
+)
+
+from .vehiculos import get_service as get_vehiculo_service
 
 router = APIRouter(prefix="/api/personas", tags=["Personas"])
 
 
-def get_service(db: Session = Depends(get_db)) -> PersonaService:
-    return PersonaService(SQLAlchemyPersonaRepository(db))
+def get_service(repos: Repositorios = Depends(get_repositorios)) -> PersonaService:
+    return PersonaService(repos.personas)
 
 
 @router.post("/", response_model=PersonaRead, status_code=status.HTTP_201_CREATED)
@@ -25,24 +46,78 @@ def crear_persona(persona_in: PersonaCreate, service: PersonaService = Depends(g
     return PersonaRead.model_validate(created)
 
 
+@router.post("/bulk", response_model=PersonaLoteRead, status_code=status.HTTP_201_CREATED)
+def crear_personas_lote(
+    personas_in: List[PersonaCreate] = Body(..., max_length=MAX_LOTE),
+    service: PersonaService = Depends(get_service),
+) -> PersonaLoteRead:
+    resultado = service.create_many([PersonaEntity(**p.model_dump()) for p in personas_in])
+    return PersonaLoteRead.model_validate(resultado)
+
+
 @router.get("/", response_model=List[PersonaRead])
 def listar_personas(
-    skip: int = 0, limit: int = 100, service: PersonaService = Depends(get_service)
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    service: PersonaService = Depends(get_service),
 ) -> List[PersonaRead]:
-    return [PersonaRead.model_validate(p) for p in service.list(skip, limit)]
+    items = service.list(skip, limit, decode_cursor(cursor))
+    set_next_cursor(response, items, limit)
+    no_modificada = responder_con_etag(
+        response, etag_lista(etag_persona(x) for x in items), if_none_match
+    )
+    if no_modificada is not None:
+        return no_modificada
+    if get_settings().fast_json:
+        return respuesta_rapida(items, serializar_persona, response)
+    return [PersonaRead.model_validate(p) for p in items]
+
+
+@router.get("/search", response_model=List[PersonaRead])
+def buscar_personas(
+    q: str = Query(..., min_length=1, max_length=120),
+    limit: int = Query(20, ge=1, le=100),
+    service: PersonaService = Depends(get_service),
+) -> List[PersonaRead]:
+    return [PersonaRead.model_validate(p) for p in service.search(q, limit)]
 
 
 @router.get("/{persona_id}", response_model=PersonaRead)
-def obtener_persona(persona_id: int, service: PersonaService = Depends(get_service)) -> PersonaRead:
+def obtener_persona(
+    persona_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: PersonaService = Depends(get_service),
+) -> PersonaRead:
+    if if_none_match is not None:
+        etag = etag_para("persona", persona_id, service.get_version(persona_id))
+        if coincide(if_none_match, etag):
+            return no_modificado(etag)
     persona = service.get(persona_id)
+    response.headers[ETAG_HEADER] = etag_persona(persona)
     return PersonaRead.model_validate(persona)
 
 
 @router.put("/{persona_id}", response_model=PersonaRead)
 def actualizar_persona(
-    persona_id: int, persona_in: PersonaUpdate, service: PersonaService = Depends(get_service)
+    persona_id: int,
+    persona_in: PersonaUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    service: PersonaService = Depends(get_service),
 ) -> PersonaRead:
-    updated = service.update(persona_id, persona_in.model_dump(exclude_unset=True))
+    version_esperada = None
+    if if_match is not None:
+        version = service.get_version(persona_id)
+        exigir_if_match(if_match, etag_para("persona", persona_id, version))
+        version_esperada = version[0]
+    updated = service.update(
+        persona_id, persona_in.model_dump(exclude_unset=True), version_esperada
+    )
+    response.headers[ETAG_HEADER] = etag_persona(updated)
     return PersonaRead.model_validate(updated)
 
 
@@ -58,9 +133,22 @@ def eliminar_persona(persona_id: int, service: PersonaService = Depends(get_serv
 
 @router.get("/{persona_id}/vehiculos/", response_model=List[VehiculoRead])
 def listar_vehiculos_por_persona(
-    persona_id: int, db: Session = Depends(get_db), service: PersonaService = Depends(get_service)
-):
-    service.get(persona_id)  # valida existencia
-    orm_persona = db.get(PersonaDB, persona_id)
-    return orm_persona.vehiculos
+    persona_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    vehiculo_service: VehiculoService = Depends(get_vehiculo_service),
+) -> List[VehiculoRead]:
+    items = vehiculo_service.list_by_propietario(persona_id, skip, limit, decode_cursor(cursor))
+    set_next_cursor(response, items, limit)
+    no_modificada = responder_con_etag(
+        response, etag_lista(etag_vehiculo(x) for x in items), if_none_match
+    )
+    if no_modificada is not None:
+        return no_modificada
+    if get_settings().fast_json:
+        return respuesta_rapida(items, serializar_vehiculo, response)
+    return [VehiculoRead.model_validate(v) for v in items]
 
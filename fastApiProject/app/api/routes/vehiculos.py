@@ -1,67 +1,158 @@
 from __future__ import annotations
 
-from typing import List, Type
-
-from fastapi import APIRouter, Depends, Response, status
-from sqlalchemy.orm import Session
-
-from app.application.services.vehiculo_service import VehiculoService
-from app.domain.entities import Vehiculo as VehiculoEntity
-from app.infrastructure.db.repositories import (
-    SQLAlchemyMarcaRepository,
-    SQLAlchemyPersonaRepository,
-    SQLAlchemyVehiculoRepository,
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import Repositorios, get_repositorios
+from app.api.etag import (
+    ETAG_HEADER,
+    coincide,
+    etag_lista,
+    etag_para,
+    etag_vehiculo,
+    exigir_if_match,
+    no_modificado,
+    responder_con_etag,
 )
-from app.infrastructure.db.session import get_db
+from app.api.export import MEDIA_TYPES, FormatoExportacion, iter_export_chunks
+from app.api.middleware import presupuesto_consultas
+from app.api.pagination import decode_cursor_ordenado, set_next_cursor
+from app.api.serialization import respuesta_rapida, serializar_vehiculo
+from app.application.services.vehiculo_service import VehiculoService
+from app.core.config import get_settings
+from app.domain.entities import FiltroVehiculos, Vehiculo as VehiculoEntity
 from app.schemas import (
+    MAX_LOTE,
+    OrdenVehiculos,
     PropietarioAsignacion,
     VehiculoCreate,
+    VehiculoLoteRead,
     VehiculoRead,
     VehiculoUpdate,
 )
-from app.infrastructure.db.models import VehiculoDB
 
 router = APIRouter(prefix="/api/vehiculos", tags=["Vehículos"])
 
 
-def get_service(db: Session = Depends(get_db)) -> VehiculoService:
-    veh_repo = SQLAlchemyVehiculoRepository(db)
-    marca_repo = SQLAlchemyMarcaRepository(db)
-    per_repo = SQLAlchemyPersonaRepository(db)
-    return VehiculoService(veh_repo, marca_repo, per_repo)
+def get_service(repos: Repositorios = Depends(get_repositorios)) -> VehiculoService:
+    return VehiculoService(repos.vehiculos, repos.marcas, repos.personas)
 
 
 @router.post("/", response_model=VehiculoRead, status_code=status.HTTP_201_CREATED)
 def crear_vehiculo(
-    vehiculo_in: VehiculoCreate, db: Session = Depends(get_db), service: VehiculoService = Depends(get_service)
-) -> Type[VehiculoDB] | None:
+    vehiculo_in: VehiculoCreate, service: VehiculoService = Depends(get_service)
+) -> VehiculoRead:
     created = service.create(VehiculoEntity(**vehiculo_in.model_dump()))
-    # devolver ORM para incluir marca y propietarios en respuesta
-    return db.get(VehiculoDB, created.id)
+    return VehiculoRead.model_validate(created)
+
+
+@router.post("/bulk", response_model=VehiculoLoteRead, status_code=status.HTTP_201_CREATED)
+def crear_vehiculos_lote(
+    vehiculos_in: List[VehiculoCreate] = Body(..., max_length=MAX_LOTE),
+    service: VehiculoService = Depends(get_service),
+) -> VehiculoLoteRead:
+    resultado = service.create_many([VehiculoEntity(**v.model_dump()) for v in vehiculos_in])
+    return VehiculoLoteRead.model_validate(resultado)
 
 
 @router.get("/", response_model=List[VehiculoRead])
 def listar_vehiculos(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db), service: VehiculoService = Depends(get_service)
-) -> list[Type[VehiculoDB]]:
-    # por simplicidad, devolver ORM directamente para incluir relaciones
-    return db.query(VehiculoDB).offset(skip).limit(limit).all()
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    marca_id: Optional[int] = None,
+    color: Optional[str] = None,
+    numero_puertas: Optional[int] = Query(None, ge=1, le=6),
+    propietario_id: Optional[int] = None,
+    sort: OrdenVehiculos = "id",
+    if_none_match: Optional[str] = Header(None),
+    service: VehiculoService = Depends(get_service),
+) -> List[VehiculoRead]:
+    """Listado filtrable por marca, color, puertas y propietario.
+
+    ``sort`` acepta un campo (``-`` para descendente); el desempate es siempre el
+    id. El cursor guarda el orden y el valor de la última fila: solo vale con el
+    mismo ``sort`` y sigue funcionando aunque esa fila se borre.
+    """
+    after_id, valor_ancla = decode_cursor_ordenado(cursor, sort)
+    filtro = FiltroVehiculos(
+        marca_id=marca_id,
+        color=color,
+        numero_puertas=numero_puertas,
+        propietario_id=propietario_id,
+        orden=sort,
+        valor_ancla=valor_ancla,
+    )
+    items = service.list_detailed(skip, limit, after_id, filtro)
+    set_next_cursor(response, items, limit, sort)
+    no_modificada = responder_con_etag(
+        response, etag_lista(etag_vehiculo(x) for x in items), if_none_match
+    )
+    if no_modificada is not None:
+        return no_modificada
+    if get_settings().fast_json:
+        return respuesta_rapida(items, serializar_vehiculo, response)
+    return [VehiculoRead.model_validate(v) for v in items]
+
+
+@router.get("/export", response_class=StreamingResponse)
+def exportar_vehiculos(
+    formato: FormatoExportacion = Query("ndjson", alias="format"),
+    service: VehiculoService = Depends(get_service),
+) -> StreamingResponse:
+    """Exporta todo el registro (con marca y cédulas de propietarios) en NDJSON o CSV.
+
+    Las filas se leen con un cursor del lado del servidor y se envían a medida que
+    llegan, por lo que la memoria usada no depende del tamaño de la tabla.
+    """
+    return StreamingResponse(
+        iter_export_chunks(service.iter_export(), formato),
+        media_type=MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="vehiculos.{formato}"'},
+    )
 
 
 @router.get("/{vehiculo_id}", response_model=VehiculoRead)
 def obtener_vehiculo(
-    vehiculo_id: int, db: Session = Depends(get_db), service: VehiculoService = Depends(get_service)
-) -> Type[VehiculoDB] | None:
-    service.get(vehiculo_id)
-    return db.get(VehiculoDB, vehiculo_id)
+    vehiculo_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: VehiculoService = Depends(get_service),
+) -> VehiculoRead:
+    """Con ``If-None-Match`` se compara primero contra la versión, sin cargar la entidad."""
+    if if_none_match is not None:
+        etag = etag_para("vehiculo", vehiculo_id, service.get_version(vehiculo_id))
+        if coincide(if_none_match, etag):
+            return no_modificado(etag)
+    vehiculo = service.get_detailed(vehiculo_id)
+    response.headers[ETAG_HEADER] = etag_vehiculo(vehiculo)
+    return VehiculoRead.model_validate(vehiculo)
 
 
 @router.put("/{vehiculo_id}", response_model=VehiculoRead)
+# Cambiar marca y propietarios a la vez: validación, dos actualizaciones versionadas,
+# reemplazo de propietarios, ajuste de contadores y la relectura final
+@presupuesto_consultas(12)
 def actualizar_vehiculo(
-    vehiculo_id: int, vehiculo_in: VehiculoUpdate, db: Session = Depends(get_db), service: VehiculoService = Depends(get_service)
-) -> Type[VehiculoDB] | None:
-    updated = service.update(vehiculo_id, vehiculo_in.model_dump(exclude_unset=True))
-    return db.get(VehiculoDB, vehiculo_id)
+    vehiculo_id: int,
+    vehiculo_in: VehiculoUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    service: VehiculoService = Depends(get_service),
+) -> VehiculoRead:
+    version_esperada = None
+    if if_match is not None:
+        version = service.get_version(vehiculo_id)
+        exigir_if_match(if_match, etag_para("vehiculo", vehiculo_id, version))
+        version_esperada = version[0]
+    updated = service.update(
+        vehiculo_id, vehiculo_in.model_dump(exclude_unset=True), version_esperada
+    )
+    response.headers[ETAG_HEADER] = etag_vehiculo(updated)
+    return VehiculoRead.model_validate(updated)
 
 
 @router.delete(
@@ -84,9 +175,7 @@ def eliminar_vehiculo(
 def agregar_propietario_a_vehiculo(
     vehiculo_id: int,
     asignacion: PropietarioAsignacion,
-    db: Session = Depends(get_db),
     service: VehiculoService = Depends(get_service),
-) -> Type[VehiculoDB] | None:
+) -> VehiculoRead:
     vehiculo = service.add_propietario(vehiculo_id, asignacion.persona_id)
-    return db.get(VehiculoDB, vehiculo.id)
-
+    return VehiculoRead.model_validate(vehiculo)
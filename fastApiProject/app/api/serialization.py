@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Type, get_args, get_origin
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.schemas import MarcaRead, PersonaRead, VehiculoRead
+
+try:  # pragma: no cover - orjson es opcional; sin él se usa json de la stdlib
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+Serializador = Callable[[Any], Dict[str, Any]]
+
+# Cabeceras que dependen del cuerpo y la respuesta final recalcula
+_CABECERAS_DE_CUERPO = {"content-length", "content-type"}
+
+
+def _es_modelo(tipo: Any) -> bool:
+    return isinstance(tipo, type) and issubclass(tipo, BaseModel)
+
+
+def compilar_serializador(modelo: Type[BaseModel]) -> Serializador:
+    """Precalcula cómo proyectar un objeto sobre los campos de ``modelo``.
+
+    El resultado lee atributos de entidades de dominio (o filas) y arma el ``dict``
+    de salida sin instanciar ni validar el modelo Pydantic. Solo soporta los tipos
+    de los esquemas ``*Read``: escalares, modelos anidados y listas de modelos.
+    """
+    campos = []
+    for nombre, campo in modelo.model_fields.items():
+        anotacion = campo.annotation
+        if _es_modelo(anotacion):
+            anidado = compilar_serializador(anotacion)
+            campos.append((nombre, attrgetter(nombre), anidado, False))
+        elif get_origin(anotacion) is list and _es_modelo(get_args(anotacion)[0]):
+            anidado = compilar_serializador(get_args(anotacion)[0])
+            campos.append((nombre, attrgetter(nombre), anidado, True))
+        else:
+            campos.append((nombre, attrgetter(nombre), None, False))
+
+    def serializar(obj: Any) -> Dict[str, Any]:
+        salida = {}
+        for nombre, leer, anidado, es_lista in campos:
+            valor = leer(obj)
+            if anidado is not None:
+                valor = [anidado(v) for v in valor] if es_lista else anidado(valor)
+            salida[nombre] = valor
+        return salida
+
+    return serializar
+
+
+serializar_marca = compilar_serializador(MarcaRead)
+serializar_persona = compilar_serializador(PersonaRead)
+serializar_vehiculo = compilar_serializador(VehiculoRead)
+
+
+def dumps(contenido: Any) -> bytes:
+    """JSON compacto, con orjson si está instalado."""
+    if orjson is not None:
+        return orjson.dumps(contenido)
+    return json.dumps(contenido, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def cabeceras_publicadas(response: Response) -> Dict[str, str]:
+    """Cabeceras fijadas en el ``Response`` inyectado, para copiarlas a una respuesta propia.
+
+    FastAPI no las fusiona cuando la ruta devuelve un ``Response`` directamente.
+    """
+    return {
+        clave: valor
+        for clave, valor in response.headers.items()
+        if clave.lower() not in _CABECERAS_DE_CUERPO
+    }
+
+
+def respuesta_rapida(
+    items: Iterable[Any], serializador: Serializador, response: Response
+) -> Response:
+    """Serializa una página una sola vez, sin ``model_validate`` ni ``response_model``."""
+    return Response(
+        content=dumps([serializador(item) for item in items]),
+        media_type="application/json",
+        headers=cabeceras_publicadas(response),
+    )
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import List
+
+from app.domain.entities import Conteo, ConteoPorMarca
+from app.domain.repositories import AsyncEstadisticasRepository
+
+
+class AsyncEstadisticasService:
+    def __init__(self, repository: AsyncEstadisticasRepository) -> None:
+        self._repository = repository
+
+    async def count_by_marca(self, limit: int) -> List[ConteoPorMarca]:
+        return await self._repository.count_by_marca(limit)
+
+    async def count_by_pais(self, limit: int) -> List[Conteo]:
+        return await self._repository.count_by_pais(limit)
+
+    async def count_by_color(self, limit: int) -> List[Conteo]:
+        return await self._repository.count_by_color(limit)
+
+    async def count_by_puertas(self) -> List[Conteo]:
+        return await self._repository.count_by_puertas()
+
+    async def propietarios_distribution(self) -> List[Conteo]:
+        return await self._repository.propietarios_distribution()
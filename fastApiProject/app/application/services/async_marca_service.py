@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+
+from app.domain.entities import Marca, ResultadoLote, Version
+from app.domain.exceptions import ConflictoDeVersion, EntidadNoEncontrada
+from app.domain.repositories import AsyncMarcaRepository
+
+
+class AsyncMarcaService:
+    def __init__(
+        self, repository: AsyncMarcaRepository, lectura: Optional[AsyncMarcaRepository] = None
+    ) -> None:
+        """``lectura`` atiende ``get`` y ``get_version``: la marca actual, no la de la caché."""
+        self._repository = repository
+        self._lectura = lectura or repository
+
+    async def create(self, marca: Marca) -> Marca:
+        try:
+            return await self._repository.create(marca)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+    async def create_many(self, marcas: List[Marca]) -> ResultadoLote[Marca]:
+        try:
+            return await self._repository.create_many(marcas)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+    async def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Marca]:
+        return await self._repository.list(skip, limit, after_id)
+
+    async def get(self, marca_id: int) -> Marca:
+        marca = await self._lectura.get(marca_id)
+        if not marca:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Marca no encontrada."
+            )
+        return marca
+
+    async def get_version(self, marca_id: int) -> Version:
+        version = await self._lectura.get_version(marca_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Marca no encontrada."
+            )
+        return version
+
+    async def update(
+        self, marca_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Marca:
+        try:
+            return await self._repository.update(marca_id, data, version_esperada)
+        except ConflictoDeVersion as exc:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+            ) from exc
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+    async def delete(self, marca_id: int) -> None:
+        try:
+            await self._repository.delete(marca_id)
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
+
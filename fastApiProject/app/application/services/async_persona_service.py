@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+
+from app.domain.entities import Persona, ResultadoLote, Version
+from app.domain.exceptions import ConflictoDeVersion, EntidadNoEncontrada
+from app.domain.repositories import AsyncPersonaRepository
+
+
+class AsyncPersonaService:
+    def __init__(self, repository: AsyncPersonaRepository) -> None:
+        self._repository = repository
+
+    async def create(self, persona: Persona) -> Persona:
+        try:
+            return await self._repository.create(persona)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+    async def create_many(self, personas: List[Persona]) -> ResultadoLote[Persona]:
+        try:
+            return await self._repository.create_many(personas)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+    async def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Persona]:
+        return await self._repository.list(skip, limit, after_id)
+
+    async def search(self, q: str, limit: int) -> List[Persona]:
+        return await self._repository.search(q.strip(), limit)
+
+    async def get(self, persona_id: int) -> Persona:
+        persona = await self._repository.get(persona_id)
+        if not persona:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Persona no encontrada."
+            )
+        return persona
+
+    async def get_version(self, persona_id: int) -> Version:
+        version = await self._repository.get_version(persona_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Persona no encontrada."
+            )
+        return version
+
+    async def update(
+        self, persona_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Persona:
+        try:
+            return await self._repository.update(persona_id, data, version_esperada)
+        except ConflictoDeVersion as exc:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+            ) from exc
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+    async def delete(self, persona_id: int) -> None:
+        try:
+            await self._repository.delete(persona_id)
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
+
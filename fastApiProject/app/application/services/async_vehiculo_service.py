@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import AsyncIterator, List, Optional
+
+from fastapi import HTTPException, status
+
+from app.domain.entities import (
+    FiltroVehiculos,
+    Marca,
+    ResultadoLote,
+    Vehiculo,
+    VehiculoDetalle,
+    VehiculoExportado,
+    Version,
+)
+from app.domain.exceptions import ConflictoDeVersion, EntidadNoEncontrada
+from app.domain.repositories import (
+    AsyncMarcaRepository,
+    AsyncPersonaRepository,
+    AsyncVehiculoRepository,
+)
+
+
+class AsyncVehiculoService:
+    def __init__(
+        self,
+        vehiculo_repository: AsyncVehiculoRepository,
+        marca_repository: AsyncMarcaRepository,
+        persona_repository: AsyncPersonaRepository,
+    ) -> None:
+        self._vehiculo_repository = vehiculo_repository
+        self._marca_repository = marca_repository
+        self._persona_repository = persona_repository
+
+    async def create(self, vehiculo: Vehiculo) -> VehiculoDetalle:
+        """Crea el vehículo y arma la respuesta con la marca ya validada, sin releerlo."""
+        marca = await self._ensure_marca_exists(vehiculo.marca_id)
+        try:
+            creado = await self._vehiculo_repository.create(vehiculo)
+        except EntidadNoEncontrada as exc:
+            # La marca se borró entre la validación y la escritura
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
+        return VehiculoDetalle(
+            id=creado.id,
+            modelo=creado.modelo,
+            marca_id=creado.marca_id,
+            numero_puertas=creado.numero_puertas,
+            color=creado.color,
+            marca=marca,
+        )
+
+    async def create_many(self, vehiculos: List[Vehiculo]) -> ResultadoLote[VehiculoDetalle]:
+        return await self._vehiculo_repository.create_many(vehiculos)
+
+    async def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Vehiculo]:
+        return await self._vehiculo_repository.list(skip, limit, after_id)
+
+    async def get(self, vehiculo_id: int) -> Vehiculo:
+        vehiculo = await self._vehiculo_repository.get(vehiculo_id)
+        if not vehiculo:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vehículo no encontrado.",
+            )
+        return vehiculo
+
+    async def list_detailed(
+        self,
+        skip: int,
+        limit: int,
+        after_id: Optional[int] = None,
+        filtro: Optional[FiltroVehiculos] = None,
+    ) -> List[VehiculoDetalle]:
+        return await self._vehiculo_repository.list_detailed(skip, limit, after_id, filtro)
+
+    async def get_detailed(self, vehiculo_id: int) -> VehiculoDetalle:
+        vehiculo = await self._vehiculo_repository.get_detailed(vehiculo_id)
+        if not vehiculo:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vehículo no encontrado.",
+            )
+        return vehiculo
+
+    async def list_by_propietario(
+        self, persona_id: int, skip: int, limit: int, after_id: Optional[int] = None
+    ) -> List[VehiculoDetalle]:
+        """Página de vehículos de una persona; solo comprueba que exista si la página está vacía."""
+        filtro = FiltroVehiculos(propietario_id=persona_id)
+        vehiculos = await self._vehiculo_repository.list_detailed(skip, limit, after_id, filtro)
+        if not vehiculos and await self._persona_repository.get_version(persona_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Persona no encontrada.",
+            )
+        return vehiculos
+
+    def iter_export(self) -> AsyncIterator[VehiculoExportado]:
+        return self._vehiculo_repository.iter_export()
+
+    async def get_version(self, vehiculo_id: int) -> Version:
+        version = await self._vehiculo_repository.get_version(vehiculo_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vehículo no encontrado.",
+            )
+        return version
+
+    async def update(
+        self, vehiculo_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> VehiculoDetalle:
+        """Aplica campos y propietarios en una sola transacción y un único cambio de versión."""
+        if "marca_id" in data:
+            await self._ensure_marca_exists(data["marca_id"])
+        propietarios_ids = data.pop("propietarios_ids", None)
+        if propietarios_ids:
+            await self._ensure_personas_exist(propietarios_ids)
+        try:
+            return await self._vehiculo_repository.update(
+                vehiculo_id, data, version_esperada, propietarios_ids
+            )
+        except ConflictoDeVersion as exc:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+            ) from exc
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
+
+    async def delete(self, vehiculo_id: int) -> None:
+        try:
+            await self._vehiculo_repository.delete(vehiculo_id)
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
+
+    async def add_propietario(self, vehiculo_id: int, persona_id: int) -> VehiculoDetalle:
+        try:
+            return await self._vehiculo_repository.add_propietario(vehiculo_id, persona_id)
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+    async def _ensure_personas_exist(self, personas_ids: List[int]) -> None:
+        """Valida todos los propietarios con una única consulta ``IN``."""
+        faltantes = set(personas_ids) - await self._persona_repository.exists_many(personas_ids)
+        if faltantes:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Propietarios no encontrados: {', '.join(map(str, sorted(faltantes)))}.",
+            )
+
+    async def _ensure_marca_exists(self, marca_id: int) -> Marca:
+        marca = await self._marca_repository.get(marca_id)
+        if not marca:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Marca no encontrada."
+            )
+        return marca
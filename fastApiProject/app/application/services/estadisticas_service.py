@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import List
+
+from app.domain.entities import Conteo, ConteoPorMarca
+from app.domain.repositories import EstadisticasRepository
+
+
+class EstadisticasService:
+    def __init__(self, repository: EstadisticasRepository) -> None:
+        self._repository = repository
+
+    def count_by_marca(self, limit: int) -> List[ConteoPorMarca]:
+        return self._repository.count_by_marca(limit)
+
+    def count_by_pais(self, limit: int) -> List[Conteo]:
+        return self._repository.count_by_pais(limit)
+
+    def count_by_color(self, limit: int) -> List[Conteo]:
+        return self._repository.count_by_color(limit)
+
+    def count_by_puertas(self) -> List[Conteo]:
+        return self._repository.count_by_puertas()
+
+    def propietarios_distribution(self) -> List[Conteo]:
+        return self._repository.propietarios_distribution()
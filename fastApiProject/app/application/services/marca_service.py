@@ -1,16 +1,21 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 from fastapi import HTTPException, status
 
-from app.domain.entities import Marca
+from app.domain.entities import Marca, ResultadoLote, Version
+from app.domain.exceptions import ConflictoDeVersion, EntidadNoEncontrada
 from app.domain.repositories import MarcaRepository
 
 
 class MarcaService:
-    def __init__(self, repository: MarcaRepository) -> None:
+    def __init__(
+        self, repository: MarcaRepository, lectura: Optional[MarcaRepository] = None
+    ) -> None:
+        """``lectura`` atiende ``get`` y ``get_version``: la marca actual, no la de la caché."""
         self._repository = repository
+        self._lectura = lectura or repository
 
     def create(self, marca: Marca) -> Marca:
         try:
@@ -21,21 +26,47 @@ class MarcaService:
                 detail=str(exc),
             ) from exc
 
-    def list(self, skip: int, limit: int) -> List[Marca]:
-        return self._repository.list(skip, limit)
+    def create_many(self, marcas: List[Marca]) -> ResultadoLote[Marca]:
+        try:
+            return self._repository.create_many(marcas)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+    def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Marca]:
+        return self._repository.list(skip, limit, after_id)
 
     def get(self, marca_id: int) -> Marca:
-        marca = self._repository.get(marca_id)
+        marca = self._lectura.get(marca_id)
         if not marca:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Marca no encontrada."
             )
         return marca
 
-    def update(self, marca_id: int, data: dict) -> Marca:
-        self.get(marca_id)
+    def get_version(self, marca_id: int) -> Version:
+        version = self._lectura.get_version(marca_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Marca no encontrada."
+            )
+        return version
+
+    def update(
+        self, marca_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Marca:
         try:
-            return self._repository.update(marca_id, data)
+            return self._repository.update(marca_id, data, version_esperada)
+        except ConflictoDeVersion as exc:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+            ) from exc
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
         except ValueError as exc:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -43,6 +74,10 @@ class MarcaService:
             ) from exc
 
     def delete(self, marca_id: int) -> None:
-        self.get(marca_id)
-        self._repository.delete(marca_id)
+        try:
+            self._repository.delete(marca_id)
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
 
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 from fastapi import HTTPException, status
 
-from app.domain.entities import Persona
+from app.domain.entities import Persona, ResultadoLote, Version
+from app.domain.exceptions import ConflictoDeVersion, EntidadNoEncontrada
 from app.domain.repositories import PersonaRepository
 
 
@@ -21,8 +22,20 @@ class PersonaService:
                 detail=str(exc),
             ) from exc
 
-    def list(self, skip: int, limit: int) -> List[Persona]:
-        return self._repository.list(skip, limit)
+    def create_many(self, personas: List[Persona]) -> ResultadoLote[Persona]:
+        try:
+            return self._repository.create_many(personas)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc),
+            ) from exc
+
+    def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Persona]:
+        return self._repository.list(skip, limit, after_id)
+
+    def search(self, q: str, limit: int) -> List[Persona]:
+        return self._repository.search(q.strip(), limit)
 
     def get(self, persona_id: int) -> Persona:
         persona = self._repository.get(persona_id)
@@ -32,10 +45,27 @@ class PersonaService:
             )
         return persona
 
-    def update(self, persona_id: int, data: dict) -> Persona:
-        self.get(persona_id)
+    def get_version(self, persona_id: int) -> Version:
+        version = self._repository.get_version(persona_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Persona no encontrada."
+            )
+        return version
+
+    def update(
+        self, persona_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Persona:
         try:
-            return self._repository.update(persona_id, data)
+            return self._repository.update(persona_id, data, version_esperada)
+        except ConflictoDeVersion as exc:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+            ) from exc
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
         except ValueError as exc:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -43,6 +73,10 @@ class PersonaService:
             ) from exc
 
     def delete(self, persona_id: int) -> None:
-        self.get(persona_id)
-        self._repository.delete(persona_id)
+        try:
+            self._repository.delete(persona_id)
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
 
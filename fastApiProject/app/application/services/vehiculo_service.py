@@ -1,10 +1,19 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Iterator, List, Optional
 
 from fastapi import HTTPException, status
 
-from app.domain.entities import Vehiculo
+from app.domain.entities import (
+    FiltroVehiculos,
+    Marca,
+    ResultadoLote,
+    Vehiculo,
+    VehiculoDetalle,
+    VehiculoExportado,
+    Version,
+)
+from app.domain.exceptions import ConflictoDeVersion, EntidadNoEncontrada
 from app.domain.repositories import MarcaRepository, PersonaRepository, VehiculoRepository
 
 
@@ -19,12 +28,30 @@ class VehiculoService:
         self._marca_repository = marca_repository
         self._persona_repository = persona_repository
 
-    def create(self, vehiculo: Vehiculo) -> Vehiculo:
-        self._ensure_marca_exists(vehiculo.marca_id)
-        return self._vehiculo_repository.create(vehiculo)
+    def create(self, vehiculo: Vehiculo) -> VehiculoDetalle:
+        """Crea el vehículo y arma la respuesta con la marca ya validada, sin releerlo."""
+        marca = self._ensure_marca_exists(vehiculo.marca_id)
+        try:
+            creado = self._vehiculo_repository.create(vehiculo)
+        except EntidadNoEncontrada as exc:
+            # La marca se borró entre la validación y la escritura
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
+        return VehiculoDetalle(
+            id=creado.id,
+            modelo=creado.modelo,
+            marca_id=creado.marca_id,
+            numero_puertas=creado.numero_puertas,
+            color=creado.color,
+            marca=marca,
+        )
 
-    def list(self, skip: int, limit: int) -> List[Vehiculo]:
-        return self._vehiculo_repository.list(skip, limit)
+    def create_many(self, vehiculos: List[Vehiculo]) -> ResultadoLote[VehiculoDetalle]:
+        return self._vehiculo_repository.create_many(vehiculos)
+
+    def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Vehiculo]:
+        return self._vehiculo_repository.list(skip, limit, after_id)
 
     def get(self, vehiculo_id: int) -> Vehiculo:
         vehiculo = self._vehiculo_repository.get(vehiculo_id)
@@ -35,43 +62,105 @@ class VehiculoService:
             )
         return vehiculo
 
-    def update(self, vehiculo_id: int, data: dict) -> Vehiculo:
+    def list_detailed(
+        self,
+        skip: int,
+        limit: int,
+        after_id: Optional[int] = None,
+        filtro: Optional[FiltroVehiculos] = None,
+    ) -> List[VehiculoDetalle]:
+        return self._vehiculo_repository.list_detailed(skip, limit, after_id, filtro)
+
+    def get_detailed(self, vehiculo_id: int) -> VehiculoDetalle:
+        vehiculo = self._vehiculo_repository.get_detailed(vehiculo_id)
+        if not vehiculo:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vehículo no encontrado.",
+            )
+        return vehiculo
+
+    def list_by_propietario(
+        self, persona_id: int, skip: int, limit: int, after_id: Optional[int] = None
+    ) -> List[VehiculoDetalle]:
+        """Página de vehículos de una persona; solo comprueba que exista si la página está vacía."""
+        filtro = FiltroVehiculos(propietario_id=persona_id)
+        vehiculos = self._vehiculo_repository.list_detailed(skip, limit, after_id, filtro)
+        if not vehiculos and self._persona_repository.get_version(persona_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Persona no encontrada.",
+            )
+        return vehiculos
+
+    def iter_export(self) -> Iterator[VehiculoExportado]:
+        return self._vehiculo_repository.iter_export()
+
+    def get_version(self, vehiculo_id: int) -> Version:
+        version = self._vehiculo_repository.get_version(vehiculo_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vehículo no encontrado.",
+            )
+        return version
+
+    def update(
+        self, vehiculo_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> VehiculoDetalle:
+        """Aplica campos y propietarios en una sola transacción y un único cambio de versión."""
         if "marca_id" in data:
             self._ensure_marca_exists(data["marca_id"])
-        if "propietarios_ids" in data:
-            for persona_id in data["propietarios_ids"]:
-                self._ensure_persona_exists(persona_id)
-            return self._vehiculo_repository.set_propietarios(
-                vehiculo_id, data.pop("propietarios_ids")
+        propietarios_ids = data.pop("propietarios_ids", None)
+        if propietarios_ids:
+            self._ensure_personas_exist(propietarios_ids)
+        try:
+            return self._vehiculo_repository.update(
+                vehiculo_id, data, version_esperada, propietarios_ids
             )
-        return self._vehiculo_repository.update(vehiculo_id, data)
+        except ConflictoDeVersion as exc:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+            ) from exc
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
 
     def delete(self, vehiculo_id: int) -> None:
-        self.get(vehiculo_id)
-        self._vehiculo_repository.delete(vehiculo_id)
+        try:
+            self._vehiculo_repository.delete(vehiculo_id)
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
 
-    def add_propietario(self, vehiculo_id: int, persona_id: int) -> Vehiculo:
-        self.get(vehiculo_id)
-        self._ensure_persona_exists(persona_id)
+    def add_propietario(self, vehiculo_id: int, persona_id: int) -> VehiculoDetalle:
         try:
             return self._vehiculo_repository.add_propietario(vehiculo_id, persona_id)
+        except EntidadNoEncontrada as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
+            ) from exc
         except ValueError as exc:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(exc),
             ) from exc
 
-    def _ensure_marca_exists(self, marca_id: int) -> None:
-        marca = self._marca_repository.get(marca_id)
-        if not marca:
+    def _ensure_personas_exist(self, personas_ids: List[int]) -> None:
+        """Valida todos los propietarios con una única consulta ``IN``."""
+        faltantes = set(personas_ids) - self._persona_repository.exists_many(personas_ids)
+        if faltantes:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Marca no encontrada."
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Propietarios no encontrados: {', '.join(map(str, sorted(faltantes)))}.",
             )
 
-    def _ensure_persona_exists(self, persona_id: int) -> None:
-        persona = self._persona_repository.get(persona_id)
-        if not persona:
+    def _ensure_marca_exists(self, marca_id: int) -> Marca:
+        marca = self._marca_repository.get(marca_id)
+        if not marca:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Persona no encontrada."
+                status_code=status.HTTP_404_NOT_FOUND, detail="Marca no encontrada."
             )
-
+        return marca
@@ -3,12 +3,9 @@ from __future__ import annotations
 import os
 from functools import lru_cache
 from pathlib import Path
+from typing import List
 
-from dotenv import load_dotenv
-
-# Cargar variables de entorno desde archivo .env si existe
 env_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(dotenv_path=env_path)
 
 
 class Settings:
@@ -28,6 +25,67 @@ class Settings:
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
         
+        # Pila asíncrona (AsyncEngine + asyncpg) en lugar de psycopg2 con hilos
+        self.db_async: bool = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+        self.async_database_url: str = (
+            f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}"
+            f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+        )
+
+        # Pool de conexiones por worker (sync y async); ver GET /db/pool para dimensionarlo
+        self.db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+        self.db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+        # Detrás de PgBouncer (modo transaction): sin pool propio ni sentencias preparadas
+        self.db_pgbouncer: bool = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+
+        # Réplicas de lectura (URLs separadas por comas): reciben las lecturas de GET y HEAD
+        self.db_replica_urls: List[str] = [
+            url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()
+        ]
+        # round_robin o least_connections (la réplica con menos peticiones en curso)
+        self.db_replica_strategy: str = os.getenv("DB_REPLICA_STRATEGY", "round_robin")
+        # Tiempo fuera de una réplica que falla al conectar
+        self.db_replica_eject_seconds: float = float(os.getenv("DB_REPLICA_EJECT_SECONDS", "30"))
+        # Tras escribir, el cliente lee de la primaria durante este tiempo (cookie)
+        self.db_read_your_writes_seconds: float = float(
+            os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5")
+        )
+
+        # Sonda /readyz: la conexión se comprueba en segundo plano cada intervalo (segundos) y
+        # el proceso deja de estar disponible con esta fracción del pool en uso
+        self.health_check_interval: float = float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+        self.health_check_timeout: float = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
+        self.health_pool_saturation: float = float(os.getenv("HEALTH_POOL_SATURATION", "1.0"))
+
+        # Máximo de sentencias SQL por petición (0 lo desactiva); las rutas pueden fijar el suyo
+        # con @presupuesto_consultas. Al excederlo se registra un aviso o, en modo estricto
+        # (pruebas), se lanza una excepción
+        self.db_query_budget: int = int(os.getenv("DB_QUERY_BUDGET", "10"))
+        self.db_query_budget_strict: bool = os.getenv(
+            "DB_QUERY_BUDGET_STRICT", "false"
+        ).lower() in ("1", "true", "yes")
+
+        # Caché en memoria del catálogo de marcas (tamaño 0 la desactiva)
+        self.marca_cache_size: int = int(os.getenv("MARCA_CACHE_SIZE", "1024"))
+        self.marca_cache_ttl: float = float(os.getenv("MARCA_CACHE_TTL", "300"))
+
+        # Listados serializados directamente a JSON (orjson), sin pasar por response_model
+        self.fast_json: bool = os.getenv("FAST_JSON", "false").lower() in ("1", "true", "yes")
+
+        # Estadísticas desde vistas materializadas (solo PostgreSQL; ver refrescar_estadisticas.py)
+        self.stats_materialized: bool = os.getenv("STATS_MATERIALIZED", "false").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+
         # Para pruebas, usar la misma configuración por defecto
         # o permitir override con variables específicas de test
         test_host = os.getenv("TEST_POSTGRES_HOST", self.postgres_host)
@@ -44,5 +102,9 @@ class Settings:
 
 @lru_cache
 def get_settings() -> Settings:
+    # El archivo .env se lee en la primera consulta de la configuración, no al importar
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=env_path)
     return Settings()
 
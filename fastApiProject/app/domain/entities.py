@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Generic, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+# Contadores de versión de los que depende la representación de una entidad
+Version = Tuple[int, ...]
 
 
 @dataclass(slots=True)
@@ -9,6 +14,8 @@ class Marca:
     nombre_marca: str
     pais: str
     id: Optional[int] = None
+    version: int = 1
+    vehiculo_count: int = 0
 
 
 @dataclass(slots=True)
@@ -17,6 +24,8 @@ class Persona:
     cedula: str
     id: Optional[int] = None
     vehiculos_ids: List[int] = field(default_factory=list)
+    version: int = 1
+    vehiculo_count: int = 0
 
 
 @dataclass(slots=True)
@@ -27,4 +36,81 @@ class Vehiculo:
     color: str
     id: Optional[int] = None
     propietarios_ids: List[int] = field(default_factory=list)
+    version: int = 1
+    propietario_count: int = 0
+
+
+@dataclass(slots=True)
+class FiltroVehiculos:
+    """Criterios del listado de vehículos; los campos en ``None`` no filtran.
+
+    ``orden`` es el nombre de un campo, con prefijo ``-`` para orden descendente.
+    ``valor_ancla`` es el valor de ese campo en la fila del cursor, que lo guarda.
+    """
 
+    marca_id: Optional[int] = None
+    color: Optional[str] = None
+    numero_puertas: Optional[int] = None
+    propietario_id: Optional[int] = None
+    orden: str = "id"
+    valor_ancla: Optional[Union[str, int]] = None
+
+
+@dataclass(slots=True)
+class VehiculoDetalle:
+    """Proyección de lectura de un vehículo con su marca y propietarios cargados."""
+
+    id: int
+    modelo: str
+    marca_id: int
+    numero_puertas: int
+    color: str
+    marca: Marca
+    propietarios: List[Persona] = field(default_factory=list)
+    version: int = 1
+    propietario_count: int = 0
+
+
+@dataclass(slots=True)
+class VehiculoExportado:
+    """Fila plana de la exportación del registro de vehículos."""
+
+    id: int
+    modelo: str
+    marca_id: int
+    nombre_marca: str
+    numero_puertas: int
+    color: str
+    propietarios_cedulas: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ErrorLote:
+    """Error de un elemento concreto dentro de una creación por lotes."""
+
+    indice: int
+    detalle: str
+
+
+@dataclass(slots=True)
+class ResultadoLote(Generic[T]):
+    """Resultado de una creación por lotes: elementos creados y errores por índice."""
+
+    creados: List[T] = field(default_factory=list)
+    errores: List[ErrorLote] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Conteo:
+    """Número de elementos que comparten ``valor`` en una agregación."""
+
+    valor: Union[str, int]
+    total: int
+
+
+@dataclass(slots=True)
+class ConteoPorMarca:
+    marca_id: int
+    nombre_marca: str
+    pais: str
+    total: int
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+
+class EntidadNoEncontrada(ValueError):
+    """La entidad sobre la que se opera no existe.
+
+    Hereda de ``ValueError`` para que el código que ya captura los errores de los
+    repositorios siga funcionando; los servicios la traducen a 404 en lugar de 400.
+    """
+
+
+class ConflictoDeVersion(ValueError):
+    """La entidad cambió desde la versión que el cliente indicó (``If-Match``)."""
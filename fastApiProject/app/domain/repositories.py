@@ -1,18 +1,39 @@
 from __future__ import annotations
 
-from typing import List, Optional, Protocol
-
-from .entities import Marca, Persona, Vehiculo
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Protocol, Set
+
+from .entities import (
+    Conteo,
+    ConteoPorMarca,
+    FiltroVehiculos,
+    Marca,
+    Persona,
+    ResultadoLote,
+    Vehiculo,
+    VehiculoDetalle,
+    VehiculoExportado,
+    Version,
+)
 
 
 class MarcaRepository(Protocol):
     def create(self, marca: Marca) -> Marca: ...
 
-    def list(self, skip: int, limit: int) -> List[Marca]: ...
+    def create_many(self, marcas: List[Marca]) -> ResultadoLote[Marca]: ...
+
+    def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Marca]: ...
 
     def get(self, marca_id: int) -> Optional[Marca]: ...
 
-    def update(self, marca_id: int, data: dict) -> Marca: ...
+    def get_many(self, marcas_ids: Iterable[int]) -> List[Marca]: ...
+
+    def exists_many(self, marcas_ids: Iterable[int]) -> Set[int]: ...
+
+    def get_version(self, marca_id: int) -> Optional[Version]: ...
+
+    def update(
+        self, marca_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Marca: ...
 
     def delete(self, marca_id: int) -> None: ...
 
@@ -20,11 +41,23 @@ class MarcaRepository(Protocol):
 class PersonaRepository(Protocol):
     def create(self, persona: Persona) -> Persona: ...
 
-    def list(self, skip: int, limit: int) -> List[Persona]: ...
+    def create_many(self, personas: List[Persona]) -> ResultadoLote[Persona]: ...
+
+    def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Persona]: ...
 
     def get(self, persona_id: int) -> Optional[Persona]: ...
 
-    def update(self, persona_id: int, data: dict) -> Persona: ...
+    def get_many(self, personas_ids: Iterable[int]) -> List[Persona]: ...
+
+    def exists_many(self, personas_ids: Iterable[int]) -> Set[int]: ...
+
+    def search(self, q: str, limit: int) -> List[Persona]: ...
+
+    def get_version(self, persona_id: int) -> Optional[Version]: ...
+
+    def update(
+        self, persona_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Persona: ...
 
     def delete(self, persona_id: int) -> None: ...
 
@@ -32,15 +65,144 @@ class PersonaRepository(Protocol):
 class VehiculoRepository(Protocol):
     def create(self, vehiculo: Vehiculo) -> Vehiculo: ...
 
-    def list(self, skip: int, limit: int) -> List[Vehiculo]: ...
+    def create_many(self, vehiculos: List[Vehiculo]) -> ResultadoLote[VehiculoDetalle]: ...
+
+    def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Vehiculo]: ...
 
     def get(self, vehiculo_id: int) -> Optional[Vehiculo]: ...
 
-    def update(self, vehiculo_id: int, data: dict) -> Vehiculo: ...
+    def get_many(self, vehiculos_ids: Iterable[int]) -> List[Vehiculo]: ...
+
+    def list_detailed(
+        self,
+        skip: int,
+        limit: int,
+        after_id: Optional[int] = None,
+        filtro: Optional[FiltroVehiculos] = None,
+    ) -> List[VehiculoDetalle]: ...
+
+    def get_detailed(self, vehiculo_id: int) -> Optional[VehiculoDetalle]: ...
+
+    def iter_export(self, batch_size: int = 1000) -> Iterator[VehiculoExportado]: ...
+
+    def get_version(self, vehiculo_id: int) -> Optional[Version]: ...
+
+    def update(
+        self,
+        vehiculo_id: int,
+        data: dict,
+        version_esperada: Optional[int] = None,
+        propietarios_ids: Optional[List[int]] = None,
+    ) -> VehiculoDetalle: ...
 
     def delete(self, vehiculo_id: int) -> None: ...
 
-    def add_propietario(self, vehiculo_id: int, persona_id: int) -> Vehiculo: ...
+    def add_propietario(self, vehiculo_id: int, persona_id: int) -> VehiculoDetalle: ...
+
+
+class AsyncMarcaRepository(Protocol):
+    async def create(self, marca: Marca) -> Marca: ...
+
+    async def create_many(self, marcas: List[Marca]) -> ResultadoLote[Marca]: ...
+
+    async def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Marca]: ...
+
+    async def get(self, marca_id: int) -> Optional[Marca]: ...
+
+    async def get_many(self, marcas_ids: Iterable[int]) -> List[Marca]: ...
+
+    async def exists_many(self, marcas_ids: Iterable[int]) -> Set[int]: ...
+
+    async def get_version(self, marca_id: int) -> Optional[Version]: ...
+
+    async def update(
+        self, marca_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Marca: ...
+
+    async def delete(self, marca_id: int) -> None: ...
+
+
+class AsyncPersonaRepository(Protocol):
+    async def create(self, persona: Persona) -> Persona: ...
+
+    async def create_many(self, personas: List[Persona]) -> ResultadoLote[Persona]: ...
+
+    async def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Persona]: ...
+
+    async def get(self, persona_id: int) -> Optional[Persona]: ...
+
+    async def get_many(self, personas_ids: Iterable[int]) -> List[Persona]: ...
+
+    async def exists_many(self, personas_ids: Iterable[int]) -> Set[int]: ...
+
+    async def search(self, q: str, limit: int) -> List[Persona]: ...
+
+    async def get_version(self, persona_id: int) -> Optional[Version]: ...
+
+    async def update(
+        self, persona_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Persona: ...
+
+    async def delete(self, persona_id: int) -> None: ...
+
+
+class AsyncVehiculoRepository(Protocol):
+    async def create(self, vehiculo: Vehiculo) -> Vehiculo: ...
+
+    async def create_many(self, vehiculos: List[Vehiculo]) -> ResultadoLote[VehiculoDetalle]: ...
+
+    async def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Vehiculo]: ...
+
+    async def get(self, vehiculo_id: int) -> Optional[Vehiculo]: ...
+
+    async def get_many(self, vehiculos_ids: Iterable[int]) -> List[Vehiculo]: ...
+
+    async def list_detailed(
+        self,
+        skip: int,
+        limit: int,
+        after_id: Optional[int] = None,
+        filtro: Optional[FiltroVehiculos] = None,
+    ) -> List[VehiculoDetalle]: ...
+
+    async def get_detailed(self, vehiculo_id: int) -> Optional[VehiculoDetalle]: ...
+
+    def iter_export(self, batch_size: int = 1000) -> AsyncIterator[VehiculoExportado]: ...
+
+    async def get_version(self, vehiculo_id: int) -> Optional[Version]: ...
+
+    async def update(
+        self,
+        vehiculo_id: int,
+        data: dict,
+        version_esperada: Optional[int] = None,
+        propietarios_ids: Optional[List[int]] = None,
+    ) -> VehiculoDetalle: ...
+
+    async def delete(self, vehiculo_id: int) -> None: ...
+
+    async def add_propietario(self, vehiculo_id: int, persona_id: int) -> VehiculoDetalle: ...
+
+
+class EstadisticasRepository(Protocol):
+    def count_by_marca(self, limit: int) -> List[ConteoPorMarca]: ...
+
+    def count_by_pais(self, limit: int) -> List[Conteo]: ...
+
+    def count_by_color(self, limit: int) -> List[Conteo]: ...
+
+    def count_by_puertas(self) -> List[Conteo]: ...
+
+    def propietarios_distribution(self) -> List[Conteo]: ...
+
+
+class AsyncEstadisticasRepository(Protocol):
+    async def count_by_marca(self, limit: int) -> List[ConteoPorMarca]: ...
+
+    async def count_by_pais(self, limit: int) -> List[Conteo]: ...
+
+    async def count_by_color(self, limit: int) -> List[Conteo]: ...
 
-    def set_propietarios(self, vehiculo_id: int, propietarios_ids: List[int]) -> Vehiculo: ...
+    async def count_by_puertas(self) -> List[Conteo]: ...
 
+    async def propietarios_distribution(self) -> List[Conteo]: ...
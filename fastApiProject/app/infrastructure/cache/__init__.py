@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from .cached_marca_repository import AsyncCachedMarcaRepository, CachedMarcaRepository
+from .cargador import (
+    AsyncCargadorPorId,
+    AsyncLoaderRepository,
+    CargadorPorId,
+    LoaderRepository,
+)
+from .ttl_cache import TTLCache, get_marca_cache
+
+__all__ = [
+    "AsyncCachedMarcaRepository",
+    "AsyncCargadorPorId",
+    "AsyncLoaderRepository",
+    "CachedMarcaRepository",
+    "CargadorPorId",
+    "LoaderRepository",
+    "TTLCache",
+    "get_marca_cache",
+]
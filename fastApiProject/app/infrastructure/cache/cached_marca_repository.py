@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from app.domain.entities import Marca, ResultadoLote, Version
+from app.domain.repositories import AsyncMarcaRepository, MarcaRepository
+
+from .ttl_cache import TTLCache
+
+
+def _catalogo(marca: Marca) -> Marca:
+    """Copia para la caché sin el contador de vehículos, que cambian otras escrituras."""
+    return replace(marca, vehiculo_count=0)
+
+
+def _buscar_en_cache(
+    cache: TTLCache[int, Marca], marcas_ids: Iterable[int]
+) -> Tuple[List[Marca], List[int]]:
+    encontradas: List[Marca] = []
+    faltantes: List[int] = []
+    for marca_id in set(marcas_ids):
+        cached = cache.get(marca_id)
+        if cached is not None:
+            encontradas.append(replace(cached))
+        else:
+            faltantes.append(marca_id)
+    return encontradas, faltantes
+
+
+class CachedMarcaRepository(MarcaRepository):
+    """Repositorio de Marca de lectura a través de caché (read-through).
+
+    La caché guarda solo los campos de catálogo (id, nombre, país y versión), que
+    únicamente cambian las escrituras de marcas: las marcas que devuelven ``get`` y
+    ``get_many`` llevan ``vehiculo_count`` a 0. Quien necesite el contador o la
+    versión actuales lee del repositorio envuelto (``GET /marcas/{id}`` lo hace).
+    Las escrituras pasan al repositorio envuelto y actualizan o invalidan la entrada.
+
+    Las lecturas solo rellenan la caché si ``puede_guardar()`` lo permite: lo leído
+    de una réplica retrasada no debe servirse después a quien acaba de escribir.
+    """
+
+    def __init__(
+        self,
+        repository: MarcaRepository,
+        cache: TTLCache[int, Marca],
+        puede_guardar: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self._repository = repository
+        self._cache = cache
+        self._puede_guardar = puede_guardar or (lambda: True)
+
+    def create(self, marca: Marca) -> Marca:
+        created = self._repository.create(marca)
+        self._cache.set(created.id, _catalogo(created))
+        return created
+
+    def create_many(self, marcas: List[Marca]) -> ResultadoLote[Marca]:
+        resultado = self._repository.create_many(marcas)
+        for created in resultado.creados:
+            self._cache.set(created.id, _catalogo(created))
+        return resultado
+
+    def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Marca]:
+        return self._repository.list(skip, limit, after_id)
+
+    def get(self, marca_id: int) -> Optional[Marca]:
+        cached = self._cache.get(marca_id)
+        if cached is not None:
+            return replace(cached)
+        marca = self._repository.get(marca_id)
+        if marca is None:
+            return None
+        if self._puede_guardar():
+            self._cache.set(marca_id, _catalogo(marca))
+        return _catalogo(marca)
+
+    def get_many(self, marcas_ids: Iterable[int]) -> List[Marca]:
+        """Sirve de la caché las marcas presentes y pide el resto en una sola consulta."""
+        encontradas, faltantes = _buscar_en_cache(self._cache, marcas_ids)
+        if faltantes:
+            guardar = self._puede_guardar()
+            for marca in self._repository.get_many(faltantes):
+                if guardar:
+                    self._cache.set(marca.id, _catalogo(marca))
+                encontradas.append(_catalogo(marca))
+        return sorted(encontradas, key=lambda marca: marca.id)
+
+    def exists_many(self, marcas_ids: Iterable[int]) -> Set[int]:
+        return {marca.id for marca in self.get_many(marcas_ids)}
+
+    def get_version(self, marca_id: int) -> Optional[Version]:
+        return self._repository.get_version(marca_id)
+
+    def update(
+        self, marca_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Marca:
+        self._cache.invalidate(marca_id)
+        updated = self._repository.update(marca_id, data, version_esperada)
+        self._cache.set(marca_id, _catalogo(updated))
+        return updated
+
+    def delete(self, marca_id: int) -> None:
+        try:
+            self._repository.delete(marca_id)
+        finally:
+            self._cache.invalidate(marca_id)
+
+
+class AsyncCachedMarcaRepository(AsyncMarcaRepository):
+    """Versión asíncrona de :class:`CachedMarcaRepository`."""
+
+    def __init__(
+        self,
+        repository: AsyncMarcaRepository,
+        cache: TTLCache[int, Marca],
+        puede_guardar: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self._repository = repository
+        self._cache = cache
+        self._puede_guardar = puede_guardar or (lambda: True)
+
+    async def create(self, marca: Marca) -> Marca:
+        created = await self._repository.create(marca)
+        self._cache.set(created.id, _catalogo(created))
+        return created
+
+    async def create_many(self, marcas: List[Marca]) -> ResultadoLote[Marca]:
+        resultado = await self._repository.create_many(marcas)
+        for created in resultado.creados:
+            self._cache.set(created.id, _catalogo(created))
+        return resultado
+
+    async def list(self, skip: int, limit: int, after_id: Optional[int] = None) -> List[Marca]:
+        return await self._repository.list(skip, limit, after_id)
+
+    async def get(self, marca_id: int) -> Optional[Marca]:
+        cached = self._cache.get(marca_id)
+        if cached is not None:
+            return replace(cached)
+        marca = await self._repository.get(marca_id)
+        if marca is None:
+            return None
+        if self._puede_guardar():
+            self._cache.set(marca_id, _catalogo(marca))
+        return _catalogo(marca)
+
+    async def get_many(self, marcas_ids: Iterable[int]) -> List[Marca]:
+        """Sirve de la caché las marcas presentes y pide el resto en una sola consulta."""
+        encontradas, faltantes = _buscar_en_cache(self._cache, marcas_ids)
+        if faltantes:
+            guardar = self._puede_guardar()
+            for marca in await self._repository.get_many(faltantes):
+                if guardar:
+                    self._cache.set(marca.id, _catalogo(marca))
+                encontradas.append(_catalogo(marca))
+        return sorted(encontradas, key=lambda marca: marca.id)
+
+    async def exists_many(self, marcas_ids: Iterable[int]) -> Set[int]:
+        return {marca.id for marca in await self.get_many(marcas_ids)}
+
+    async def get_version(self, marca_id: int) -> Optional[Version]:
+        return await self._repository.get_version(marca_id)
+
+    async def update(
+        self, marca_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Marca:
+        self._cache.invalidate(marca_id)
+        updated = await self._repository.update(marca_id, data, version_esperada)
+        self._cache.set(marca_id, _catalogo(updated))
+        return updated
+
+    async def delete(self, marca_id: int) -> None:
+        try:
+            await self._repository.delete(marca_id)
+        finally:
+            self._cache.invalidate(marca_id)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from functools import wraps
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+# Métodos de los repositorios que modifican filas: tras ellos se descarta lo memorizado
+_ESCRITURAS = frozenset({"create", "create_many", "update", "delete", "add_propietario"})
+
+
+def _copia(entidad: Optional[T]) -> Optional[T]:
+    return replace(entidad) if entidad is not None else None
+
+
+class CargadorPorId(Generic[T]):
+    """Memoriza entidades por id durante una petición (patrón *DataLoader*).
+
+    Las cargas de ids aún no vistos se resuelven con una sola llamada a
+    ``get_many`` (un ``IN``); los ids inexistentes también se recuerdan.
+    """
+
+    def __init__(self, get_many: Callable[[List[int]], List[T]]) -> None:
+        self._get_many = get_many
+        self._memoria: Dict[int, Optional[T]] = {}
+
+    def load(self, entidad_id: int) -> Optional[T]:
+        return self.load_many([entidad_id])[0]
+
+    def load_many(self, ids: Iterable[int]) -> List[Optional[T]]:
+        ids = list(ids)
+        faltantes = [i for i in dict.fromkeys(ids) if i not in self._memoria]
+        if faltantes:
+            encontradas = {entidad.id: entidad for entidad in self._get_many(faltantes)}
+            for entidad_id in faltantes:
+                self._memoria[entidad_id] = encontradas.get(entidad_id)
+        return [_copia(self._memoria[i]) for i in ids]
+
+    def known(self, ids: Iterable[int]) -> Dict[int, bool]:
+        """Existencia de los ids ya cargados, sin consultar la base de datos."""
+        return {i: self._memoria[i] is not None for i in ids if i in self._memoria}
+
+    def forget(self, ids: Optional[Iterable[int]] = None) -> None:
+        """Olvida los ids dados o, sin argumentos, todo lo memorizado."""
+        if ids is None:
+            self._memoria.clear()
+            return
+        for entidad_id in ids:
+            self._memoria.pop(entidad_id, None)
+
+
+class AsyncCargadorPorId(Generic[T]):
+    """Versión asíncrona de :class:`CargadorPorId` que además agrupa cargas concurrentes.
+
+    Las llamadas a ``load`` hechas en la misma vuelta del bucle de eventos (por
+    ejemplo desde un ``asyncio.gather``) se resuelven con un único ``get_many``.
+    Como todas usan la misma ``AsyncSession``, el resto de la petición no debe
+    lanzar consultas en paralelo con ellas.
+    """
+
+    def __init__(self, get_many: Callable[[List[int]], Awaitable[List[T]]]) -> None:
+        self._get_many = get_many
+        self._memoria: Dict[int, "asyncio.Future[Optional[T]]"] = {}
+        self._pendientes: Dict[int, "asyncio.Future[Optional[T]]"] = {}
+
+    async def load(self, entidad_id: int) -> Optional[T]:
+        return (await self.load_many([entidad_id]))[0]
+
+    async def load_many(self, ids: Iterable[int]) -> List[Optional[T]]:
+        futuros = [self._futuro(entidad_id) for entidad_id in ids]
+        return [_copia(entidad) for entidad in await asyncio.gather(*futuros)]
+
+    def known(self, ids: Iterable[int]) -> Dict[int, bool]:
+        conocidos = {}
+        for entidad_id in ids:
+            futuro = self._memoria.get(entidad_id)
+            if futuro is not None and futuro.done() and not futuro.cancelled():
+                if futuro.exception() is None:
+                    conocidos[entidad_id] = futuro.result() is not None
+        return conocidos
+
+    def forget(self, ids: Optional[Iterable[int]] = None) -> None:
+        if ids is None:
+            self._memoria.clear()
+            return
+        for entidad_id in ids:
+            self._memoria.pop(entidad_id, None)
+
+    def _futuro(self, entidad_id: int) -> "asyncio.Future[Optional[T]]":
+        futuro = self._memoria.get(entidad_id)
+        if futuro is not None and not futuro.cancelled():
+            return futuro
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self._memoria[entidad_id] = futuro
+        if not self._pendientes:
+            loop.create_task(self._despachar())
+        self._pendientes[entidad_id] = futuro
+        return futuro
+
+    async def _despachar(self) -> None:
+        # Cede una vuelta para que se registren las demás cargas de esta iteración
+        await asyncio.sleep(0)
+        pendientes, self._pendientes = self._pendientes, {}
+        try:
+            encontradas = {
+                entidad.id: entidad for entidad in await self._get_many(list(pendientes))
+            }
+        except Exception as exc:
+            for entidad_id, futuro in pendientes.items():
+                self._memoria.pop(entidad_id, None)
+                if not futuro.done():
+                    futuro.set_exception(exc)
+            return
+        for entidad_id, futuro in pendientes.items():
+            if not futuro.done():
+                futuro.set_result(encontradas.get(entidad_id))
+
+
+class LoaderRepository:
+    """Repositorio de una petición cuyas lecturas por id pasan por un :class:`CargadorPorId`.
+
+    El resto de métodos se delegan al repositorio envuelto; las escrituras vacían
+    lo memorizado para que las lecturas posteriores de la petición vean el cambio.
+    """
+
+    def __init__(self, repository: Any) -> None:
+        self._repository = repository
+        self.cargador: CargadorPorId = CargadorPorId(repository.get_many)
+
+    def get(self, entidad_id: int) -> Optional[Any]:
+        return self.cargador.load(entidad_id)
+
+    def get_many(self, ids: Iterable[int]) -> List[Any]:
+        return [entidad for entidad in self.cargador.load_many(ids) if entidad is not None]
+
+    def exists_many(self, ids: Iterable[int]) -> Set[int]:
+        """Responde con lo ya cargado y consulta solo los ids desconocidos (sin cargarlos)."""
+        ids = set(ids)
+        conocidos = self.cargador.known(ids)
+        existentes = {entidad_id for entidad_id, existe in conocidos.items() if existe}
+        desconocidos = ids - conocidos.keys()
+        if desconocidos:
+            existentes |= self._repository.exists_many(desconocidos)
+        return existentes
+
+    def __getattr__(self, nombre: str) -> Any:
+        atributo = getattr(self._repository, nombre)
+        if nombre not in _ESCRITURAS:
+            return atributo
+
+        @wraps(atributo)
+        def escribir(*args, **kwargs):
+            try:
+                return atributo(*args, **kwargs)
+            finally:
+                self.cargador.forget()
+
+        return escribir
+
+
+class AsyncLoaderRepository:
+    """Versión asíncrona de :class:`LoaderRepository`."""
+
+    def __init__(self, repository: Any) -> None:
+        self._repository = repository
+        self.cargador: AsyncCargadorPorId = AsyncCargadorPorId(repository.get_many)
+
+    async def get(self, entidad_id: int) -> Optional[Any]:
+        return await self.cargador.load(entidad_id)
+
+    async def get_many(self, ids: Iterable[int]) -> List[Any]:
+        return [entidad for entidad in await self.cargador.load_many(ids) if entidad is not None]
+
+    async def exists_many(self, ids: Iterable[int]) -> Set[int]:
+        ids = set(ids)
+        conocidos = self.cargador.known(ids)
+        existentes = {entidad_id for entidad_id, existe in conocidos.items() if existe}
+        desconocidos = ids - conocidos.keys()
+        if desconocidos:
+            existentes |= await self._repository.exists_many(desconocidos)
+        return existentes
+
+    def __getattr__(self, nombre: str) -> Any:
+        atributo = getattr(self._repository, nombre)
+        if nombre not in _ESCRITURAS:
+            return atributo
+
+        @wraps(atributo)
+        async def escribir(*args, **kwargs):
+            try:
+                return await atributo(*args, **kwargs)
+            finally:
+                self.cargador.forget()
+
+        return escribir
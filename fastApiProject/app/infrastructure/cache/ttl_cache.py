@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.core.config import get_settings
+from app.domain.entities import Marca
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Caché LRU acotada en tamaño con expiración por entrada, segura entre hilos.
+
+    Es local al proceso: cada worker tiene la suya, así que el TTL acota cuánto
+    puede tardar en verse un cambio hecho desde otro worker.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entrada = self._data.get(key)
+            if entrada is None:
+                self.misses += 1
+                return None
+            expira, valor = entrada
+            if expira < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return valor
+
+    def set(self, key: K, value: V) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+
+@lru_cache
+def get_marca_cache() -> TTLCache[int, Marca]:
+    """Caché del catálogo de marcas compartida por todas las peticiones del proceso."""
+    settings = get_settings()
+    return TTLCache(maxsize=settings.marca_cache_size, ttl=settings.marca_cache_ttl)
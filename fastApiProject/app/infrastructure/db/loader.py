@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import Connection, Engine, Table, insert, select, text
+
+from app.schemas import MarcaCreate, PersonaCreate, VehiculoImport
+
+from .models import MarcaVehiculoDB, PersonaDB, VehiculoDB, vehiculo_propietario
+from .repositories._contadores import _ajustar
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+ESQUEMAS = {"marcas": MarcaCreate, "personas": PersonaCreate, "vehiculos": VehiculoImport}
+ENTIDADES = ("marcas", "personas", "vehiculos")
+
+# Registro del archivo: número de su primera línea y la línea NDJSON o los valores CSV
+Registro = Tuple[int, Union[str, List[str]]]
+# (entidad, formato, cabecera CSV, registros)
+Tarea = Tuple[str, str, Optional[List[str]], List[Registro]]
+# Errores y filas válidas se identifican por su número de línea en el archivo
+Fila = Tuple[int, dict]
+Error = Tuple[int, str]
+ResultadoValidacion = Tuple[List[Fila], List[Error]]
+
+
+def _registros(archivo: TextIO, formato: str) -> Iterator[Registro]:
+    """Registros tras la cabecera; en CSV un campo entre comillas puede abarcar varias líneas."""
+    if formato == "ndjson":
+        yield from enumerate((linea.rstrip("\r\n") for linea in archivo), start=1)
+        return
+    lector = csv.reader(archivo)
+    while True:
+        numero = lector.line_num + 1
+        try:
+            valores = next(lector)
+        except StopIteration:
+            return
+        yield numero, valores
+
+
+def _parsear(valor: Union[str, List[str]], formato: str, cabecera: Optional[List[str]]) -> dict:
+    if formato == "ndjson":
+        return json.loads(valor)
+    # Las celdas vacías del CSV equivalen a campos ausentes
+    return {columna: celda for columna, celda in zip(cabecera, valor) if celda != ""}
+
+
+def _validar_lote(tarea: Tarea) -> ResultadoValidacion:
+    """Parsea y valida un bloque de registros; se ejecuta en los procesos del pool."""
+    entidad, formato, cabecera, registros = tarea
+    esquema = ESQUEMAS[entidad]
+    validas: List[Fila] = []
+    errores: List[Error] = []
+    for numero, valor in registros:
+        if not (valor.strip() if formato == "ndjson" else any(valor)):
+            continue
+        try:
+            modelo = esquema.model_validate(_parsear(valor, formato, cabecera))
+            validas.append((numero, modelo.model_dump()))
+        except (ValidationError, ValueError) as exc:
+            errores.append((numero, str(exc).replace("\n", " ")))
+    return validas, errores
+
+
+class _EjecutorLocal(Executor):
+    """Ejecuta las validaciones en el propio proceso (``workers=1``)."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+@dataclass
+class Checkpoint:
+    """Registros de datos ya confirmados por archivo, para poder reanudar la carga.
+
+    Se escribe tras cada commit; si el proceso muere entre ambos pasos, al reanudar
+    se repite un lote: marcas y personas se deduplican, los vehículos no.
+    """
+
+    path: Optional[Path]
+    registros: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def cargar(cls, path: Optional[Path]) -> "Checkpoint":
+        if path is not None and path.exists():
+            return cls(path=path, registros=json.loads(path.read_text()))
+        return cls(path=path)
+
+    def guardar(self, clave: str, registros: int) -> None:
+        self.registros[clave] = registros
+        if self.path is None:
+            return
+        temporal = self.path.with_suffix(self.path.suffix + ".tmp")
+        temporal.write_text(json.dumps(self.registros))
+        os.replace(temporal, self.path)
+
+
+@dataclass
+class ResumenCarga:
+    insertadas: Dict[str, int] = field(default_factory=dict)
+    rechazadas: Dict[str, int] = field(default_factory=dict)
+
+
+def _bloques(registros: Iterator[Registro], tamano: int) -> Iterator[List[Registro]]:
+    while True:
+        bloque = list(islice(registros, tamano))
+        if not bloque:
+            return
+        yield bloque
+
+
+class _Escritor:
+    """Inserción por lotes: COPY en PostgreSQL, ``executemany`` en el resto de motores."""
+
+    def __init__(self, engine: Engine) -> None:
+        self._postgres = engine.dialect.name == "postgresql"
+
+    def insertar(
+        self, conn: Connection, tabla: Table, columnas: Sequence[str], filas: List[dict]
+    ) -> None:
+        if not filas:
+            return
+        if not self._postgres:
+            conn.execute(insert(tabla), filas)
+            return
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for fila in filas:
+            writer.writerow([fila[columna] for columna in columnas])
+        buffer.seek(0)
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {tabla.name} ({', '.join(columnas)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+    def reservar_ids(self, conn: Connection, tabla: Table, cantidad: int) -> List[int]:
+        """Reserva ids para filas que luego se referencian desde otra tabla en el mismo lote."""
+        if self._postgres:
+            return list(
+                conn.scalars(
+                    text(
+                        f"SELECT nextval(pg_get_serial_sequence('{tabla.name}', 'id')) "
+                        "FROM generate_series(1, :n)"
+                    ),
+                    {"n": cantidad},
+                )
+            )
+        # Fuera de PostgreSQL se asume que el cargador es el único escritor
+        ultimo = conn.scalar(text(f"SELECT COALESCE(MAX(id), 0) FROM {tabla.name}"))
+        return list(range(ultimo + 1, ultimo + 1 + cantidad))
+
+
+class CargadorMasivo:
+    """Carga archivos CSV/NDJSON de marcas, personas y vehículos directamente en la BD."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        workers: int = os.cpu_count() or 1,
+        batch_size: int = 5_000,
+        checkpoint: Optional[Path] = None,
+    ) -> None:
+        self._engine = engine
+        self._workers = max(workers, 1)
+        self._batch_size = batch_size
+        self._checkpoint = Checkpoint.cargar(checkpoint)
+        self._escritor = _Escritor(engine)
+        self._marcas_por_nombre: Dict[str, int] = {}
+
+    def cargar(self, archivos: Dict[str, Path]) -> ResumenCarga:
+        """Carga los archivos en orden de dependencia: marcas, personas y vehículos."""
+        resumen = ResumenCarga()
+        executor: Executor = (
+            ProcessPoolExecutor(max_workers=self._workers)
+            if self._workers > 1
+            else _EjecutorLocal()
+        )
+        with executor:
+            for entidad in ENTIDADES:
+                if entidad in archivos:
+                    self._cargar_archivo(entidad, archivos[entidad], executor, resumen)
+        return resumen
+
+    def _cargar_archivo(
+        self, entidad: str, path: Path, executor: Executor, resumen: ResumenCarga
+    ) -> None:
+        formato = FORMATOS.get(path.suffix.lower())
+        if formato is None:
+            raise ValueError(f"Formato no soportado: {path.name} (use .csv, .ndjson o .jsonl)")
+        clave = f"{entidad}:{path.resolve()}"
+        ya_cargadas = self._checkpoint.registros.get(clave, 0)
+        resumen.insertadas.setdefault(entidad, 0)
+        resumen.rechazadas.setdefault(entidad, 0)
+        if entidad == "vehiculos":
+            self._cargar_catalogo_marcas()
+
+        inicio = time.monotonic()
+        with path.open(encoding="utf-8", newline="") as archivo:
+            registros = _registros(archivo, formato)
+            cabecera = next(registros)[1] if formato == "csv" else None
+            for _ in islice(registros, ya_cargadas):
+                pass
+            procesadas = ya_cargadas
+            for validas, errores, cantidad in self._validar(
+                entidad, formato, cabecera, registros, executor
+            ):
+                errores_bd: List[Error] = []
+                with self._engine.begin() as conn:
+                    insertadas = self._insertar(entidad, conn, validas, errores_bd)
+                procesadas += cantidad
+                self._checkpoint.guardar(clave, procesadas)
+
+                for numero, detalle in errores + errores_bd:
+                    logger.warning("%s línea %s rechazada: %s", path.name, numero, detalle)
+                resumen.insertadas[entidad] += insertadas
+                resumen.rechazadas[entidad] += len(errores) + len(errores_bd)
+                transcurrido = max(time.monotonic() - inicio, 1e-9)
+                logger.info(
+                    "%s: %d registros procesados, %d insertados, %d rechazados (%.0f filas/s)",
+                    entidad,
+                    procesadas,
+                    resumen.insertadas[entidad],
+                    resumen.rechazadas[entidad],
+                    (procesadas - ya_cargadas) / transcurrido,
+                )
+
+    def _validar(
+        self,
+        entidad: str,
+        formato: str,
+        cabecera: Optional[List[str]],
+        registros: Iterator[Registro],
+        executor: Executor,
+    ) -> Iterator[Tuple[List[Fila], List[Error], int]]:
+        """Reparte bloques al pool manteniendo el orden y un número acotado en vuelo."""
+        en_vuelo: Deque[Tuple[Future, int]] = deque()
+        for bloque in _bloques(registros, self._batch_size):
+            tarea: Tarea = (entidad, formato, cabecera, bloque)
+            en_vuelo.append((executor.submit(_validar_lote, tarea), len(bloque)))
+            if len(en_vuelo) >= self._workers * 2:
+                future, cantidad = en_vuelo.popleft()
+                yield (*future.result(), cantidad)
+        while en_vuelo:
+            future, cantidad = en_vuelo.popleft()
+            yield (*future.result(), cantidad)
+
+    def _insertar(
+        self, entidad: str, conn: Connection, filas: List[Fila], errores: List[Error]
+    ) -> int:
+        if entidad == "marcas":
+            columnas = ("nombre_marca", "pais")
+            return self._insertar_unicas(conn, MarcaVehiculoDB, "nombre_marca", columnas, filas)
+        if entidad == "personas":
+            return self._insertar_unicas(conn, PersonaDB, "cedula", ("nombre", "cedula"), filas)
+        return self._insertar_vehiculos(conn, filas, errores)
+
+    def _insertar_unicas(
+        self, conn: Connection, modelo, clave: str, columnas: Sequence[str], filas: List[Fila]
+    ) -> int:
+        """Inserta omitiendo claves únicas ya existentes, lo que hace idempotente el reintento."""
+        columna = getattr(modelo, clave)
+        claves = {fila[clave] for _, fila in filas}
+        existentes = set(conn.scalars(select(columna).where(columna.in_(claves))))
+        nuevas = []
+        for _, fila in filas:
+            if fila[clave] not in existentes:
+                existentes.add(fila[clave])
+                nuevas.append({c: fila[c] for c in columnas})
+        self._escritor.insertar(conn, modelo.__table__, columnas, nuevas)
+        return len(nuevas)
+
+    def _cargar_catalogo_marcas(self) -> None:
+        with self._engine.connect() as conn:
+            filas = conn.execute(select(MarcaVehiculoDB.nombre_marca, MarcaVehiculoDB.id))
+            self._marcas_por_nombre = dict(filas.tuples().all())
+
+    def _insertar_vehiculos(self, conn: Connection, filas: List[Fila], errores: List[Error]) -> int:
+        """Resuelve marcas (catálogo en memoria) y cédulas (una consulta por lote) a ids."""
+        ids_marca = set(self._marcas_por_nombre.values())
+        cedulas = {cedula for _, fila in filas for cedula in fila["propietarios_cedulas"]}
+        personas_por_cedula: Dict[str, int] = {}
+        if cedulas:
+            personas_por_cedula = dict(
+                conn.execute(
+                    select(PersonaDB.cedula, PersonaDB.id).where(PersonaDB.cedula.in_(cedulas))
+                ).tuples().all()
+            )
+
+        vehiculos: List[dict] = []
+        propietarios: List[List[int]] = []
+        for numero, fila in filas:
+            marca_id = fila["marca_id"]
+            if marca_id is None:
+                marca_id = self._marcas_por_nombre.get(fila["nombre_marca"])
+            if marca_id not in ids_marca:
+                marca = fila["nombre_marca"] or fila["marca_id"]
+                errores.append((numero, f"Marca no encontrada: {marca}"))
+                continue
+            faltantes = [c for c in fila["propietarios_cedulas"] if c not in personas_por_cedula]
+            if faltantes:
+                errores.append((numero, f"Propietarios no encontrados: {', '.join(faltantes)}"))
+                continue
+            personas = sorted({personas_por_cedula[c] for c in fila["propietarios_cedulas"]})
+            vehiculos.append(
+                {
+                    "modelo": fila["modelo"],
+                    "marca_id": marca_id,
+                    "numero_puertas": fila["numero_puertas"],
+                    "color": fila["color"],
+                    "propietario_count": len(personas),
+                }
+            )
+            propietarios.append(personas)
+
+        if not vehiculos:
+            return 0
+        ids = self._escritor.reservar_ids(conn, VehiculoDB.__table__, len(vehiculos))
+        for vehiculo_id, vehiculo in zip(ids, vehiculos):
+            vehiculo["id"] = vehiculo_id
+        columnas = ("id", "modelo", "marca_id", "numero_puertas", "color", "propietario_count")
+        self._escritor.insertar(conn, VehiculoDB.__table__, columnas, vehiculos)
+        asociaciones = [
+            {"vehiculo_id": vehiculo["id"], "persona_id": persona_id}
+            for vehiculo, personas in zip(vehiculos, propietarios)
+            for persona_id in personas
+        ]
+        self._escritor.insertar(
+            conn, vehiculo_propietario, ("vehiculo_id", "persona_id"), asociaciones
+        )
+        # Contadores en la misma transacción del lote: un UPDATE por marca y persona tocadas
+        _ajustar(conn, MarcaVehiculoDB, Counter(v["marca_id"] for v in vehiculos))
+        _ajustar(conn, PersonaDB, Counter(a["persona_id"] for a in asociaciones))
+        return len(vehiculos)
+
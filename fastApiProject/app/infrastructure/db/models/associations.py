@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, ForeignKey, Integer, Table, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Index, Table, UniqueConstraint
 
 from ..base import Base
 
@@ -10,5 +10,7 @@ vehiculo_propietario = Table(
     Column("vehiculo_id", ForeignKey("vehiculos.id"), primary_key=True),
     Column("persona_id", ForeignKey("personas.id"), primary_key=True),
     UniqueConstraint("vehiculo_id", "persona_id", name="uq_vehiculo_persona"),
+    # La PK empieza por vehiculo_id; este cubre las búsquedas por propietario
+    Index("ix_vehiculo_propietario_persona_id", "persona_id", "vehiculo_id"),
 )
 
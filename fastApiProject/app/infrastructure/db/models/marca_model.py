@@ -14,6 +14,9 @@ class MarcaVehiculoDB(Base):
     id: Mapped[int] = Column(Integer, primary_key=True, index=True)
     nombre_marca: Mapped[str] = Column(String(100), unique=True, nullable=False, index=True)
     pais: Mapped[str] = Column(String(100), nullable=False)
+    version: Mapped[int] = Column(Integer, nullable=False, default=1, server_default="1")
+    # Contador desnormalizado que mantiene el repositorio de vehículos en la misma transacción
+    vehiculo_count: Mapped[int] = Column(Integer, nullable=False, default=0, server_default="0")
 
     vehiculos: Mapped[list["VehiculoDB"]] = relationship(
         "VehiculoDB", back_populates="marca", cascade="all, delete-orphan"
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import DDL, Column, Index, Integer, String, event
 from sqlalchemy.orm import Mapped, relationship
 
 from ..base import Base
@@ -11,10 +11,28 @@ class PersonaDB(Base):
     """Modelo ORM para la entidad Persona."""
 
     __tablename__ = "personas"
+    # Índices de la búsqueda en PostgreSQL: trigramas para nombres aproximados y
+    # ``text_pattern_ops`` para prefijos de cédula con cualquier collation
+    __table_args__ = (
+        Index(
+            "ix_personas_nombre_trgm",
+            "nombre",
+            postgresql_using="gin",
+            postgresql_ops={"nombre": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_personas_cedula_prefijo",
+            "cedula",
+            postgresql_ops={"cedula": "text_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = Column(Integer, primary_key=True, index=True)
     nombre: Mapped[str] = Column(String(120), nullable=False)
     cedula: Mapped[str] = Column(String(50), unique=True, nullable=False, index=True)
+    version: Mapped[int] = Column(Integer, nullable=False, default=1, server_default="1")
+    # Vehículos de los que es propietaria; lo mantiene el repositorio de vehículos
+    vehiculo_count: Mapped[int] = Column(Integer, nullable=False, default=0, server_default="0")
 
     vehiculos: Mapped[list["VehiculoDB"]] = relationship(
         "VehiculoDB",
@@ -22,3 +40,37 @@ class PersonaDB(Base):
         back_populates="propietarios",
     )
 
+
+# En SQLite la búsqueda usa un índice FTS5 de contenido externo sobre ``personas``,
+# mantenido por triggers para que también lo alimenten las cargas masivas.
+PERSONAS_FTS = "personas_fts"
+
+_DDL_FTS_SQLITE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {PERSONAS_FTS} USING fts5("
+    "nombre, content='personas', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {PERSONAS_FTS}_ai AFTER INSERT ON personas BEGIN "
+    f"INSERT INTO {PERSONAS_FTS}(rowid, nombre) VALUES (new.id, new.nombre); END",
+    f"CREATE TRIGGER IF NOT EXISTS {PERSONAS_FTS}_ad AFTER DELETE ON personas BEGIN "
+    f"INSERT INTO {PERSONAS_FTS}({PERSONAS_FTS}, rowid, nombre) "
+    "VALUES ('delete', old.id, old.nombre); END",
+    f"CREATE TRIGGER IF NOT EXISTS {PERSONAS_FTS}_au AFTER UPDATE OF nombre ON personas BEGIN "
+    f"INSERT INTO {PERSONAS_FTS}({PERSONAS_FTS}, rowid, nombre) "
+    "VALUES ('delete', old.id, old.nombre); "
+    f"INSERT INTO {PERSONAS_FTS}(rowid, nombre) VALUES (new.id, new.nombre); END",
+)
+
+event.listen(
+    PersonaDB.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+for _sentencia in _DDL_FTS_SQLITE:
+    event.listen(
+        PersonaDB.__table__, "after_create", DDL(_sentencia).execute_if(dialect="sqlite")
+    )
+event.listen(
+    PersonaDB.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {PERSONAS_FTS}").execute_if(dialect="sqlite"),
+)
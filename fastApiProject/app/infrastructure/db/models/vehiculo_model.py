@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
 from ..base import Base
@@ -11,12 +11,22 @@ class VehiculoDB(Base):
     """Modelo ORM para la entidad Vehículo."""
 
     __tablename__ = "vehiculos"
+    # Un índice por filtro/orden del listado, con ``id`` al final para el keyset
+    __table_args__ = (
+        Index("ix_vehiculos_marca_id_id", "marca_id", "id"),
+        Index("ix_vehiculos_color_id", "color", "id"),
+        Index("ix_vehiculos_numero_puertas_id", "numero_puertas", "id"),
+        Index("ix_vehiculos_modelo_id", "modelo", "id"),
+    )
 
     id: Mapped[int] = Column(Integer, primary_key=True, index=True)
     modelo: Mapped[str] = Column(String(120), nullable=False)
     marca_id: Mapped[int] = Column(Integer, ForeignKey("marcas.id"), nullable=False)
     numero_puertas: Mapped[int] = Column(Integer, nullable=False)
     color: Mapped[str] = Column(String(80), nullable=False)
+    # Se incrementa en cada escritura; alimenta los ETag y las comprobaciones If-Match
+    version: Mapped[int] = Column(Integer, nullable=False, default=1, server_default="1")
+    propietario_count: Mapped[int] = Column(Integer, nullable=False, default=0, server_default="0")
 
     marca: Mapped["MarcaVehiculoDB"] = relationship("MarcaVehiculoDB", back_populates="vehiculos")
     propietarios: Mapped[list["PersonaDB"]] = relationship(
@@ -0,0 +1,127 @@
+"""
+Pool de conexiones configurable y medido.
+
+``opciones_pool`` traduce la configuración (``DB_POOL_*`` y ``DB_PGBOUNCER``) a los
+argumentos de ``create_engine``; los pools medidos registran cuánto se espera por
+una conexión y cuántas esperas agotan ``pool_timeout``, y ``estadisticas_pool`` lo
+resume junto con el estado actual del pool.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from typing import Any, Dict
+
+from sqlalchemy import Engine, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.core.config import Settings
+from app.infrastructure.histograma import Histograma
+
+
+class MedicionPool:
+    """Esperas por conexión y esperas agotadas de un pool."""
+
+    def __init__(self) -> None:
+        self.espera = Histograma()
+        self._timeouts = 0
+        self._lock = threading.Lock()
+
+    def registrar_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    @property
+    def timeouts(self) -> int:
+        return self._timeouts
+
+
+def _obtener_medido(pool: Any, obtener: Any) -> Any:
+    inicio = time.perf_counter()
+    try:
+        return obtener()
+    except exc.TimeoutError:
+        pool.medicion.registrar_timeout()
+        raise
+    finally:
+        pool.medicion.espera.observe(time.perf_counter() - inicio)
+
+
+class QueuePoolMedido(QueuePool):
+    """``QueuePool`` que mide el tiempo de cada ``checkout`` (espera o conexión nueva)."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.medicion = MedicionPool()
+
+    def _do_get(self):
+        return _obtener_medido(self, super()._do_get)
+
+
+class AsyncQueuePoolMedido(AsyncAdaptedQueuePool):
+    """Versión de :class:`QueuePoolMedido` para motores asíncronos."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.medicion = MedicionPool()
+
+    def _do_get(self):
+        return _obtener_medido(self, super()._do_get)
+
+
+def _nombre_sentencia_unico() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def opciones_pool(database_url: str, settings: Settings, asincrono: bool = False) -> Dict[str, Any]:
+    """Argumentos de pool para ``create_engine`` / ``create_async_engine``.
+
+    Con ``DB_PGBOUNCER`` el pool lo lleva PgBouncer: ``NullPool`` abre una conexión
+    por uso y, con asyncpg, se desactivan las sentencias preparadas con nombre, que
+    no sobreviven al modo *transaction* de PgBouncer. SQLite conserva su pool por
+    defecto (en memoria necesita una única conexión compartida).
+    """
+    if settings.db_pgbouncer:
+        opciones: Dict[str, Any] = {"poolclass": NullPool}
+        if asincrono and database_url.startswith("postgresql"):
+            opciones["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _nombre_sentencia_unico,
+            }
+        return opciones
+
+    opciones = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    if database_url.startswith("sqlite"):
+        return opciones
+    opciones.update(
+        poolclass=AsyncQueuePoolMedido if asincrono else QueuePoolMedido,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    return opciones
+
+
+def estadisticas_pool(engine: Engine) -> Dict[str, Any]:
+    """Estado actual del pool de ``engine`` y, si es un pool medido, sus esperas."""
+    pool: Pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    medicion = getattr(pool, "medicion", None)
+    if medicion is not None:
+        stats["timeouts"] = medicion.timeouts
+        stats["wait_seconds"] = medicion.espera.stats()
+    return stats
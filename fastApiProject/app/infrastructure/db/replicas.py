@@ -0,0 +1,177 @@
+"""
+Enrutado de lecturas a réplicas de la base de datos.
+
+``EnrutadorReplicas`` elige la réplica de cada petición de lectura (por turnos o
+la de menos peticiones en curso) y deja fuera durante ``DB_REPLICA_EJECT_SECONDS``
+a la que falla al conectar; sin réplicas sanas, se lee de la primaria.
+``SesionEnrutada`` envía las lecturas a la réplica elegida y cualquier escritura,
+``SELECT ... FOR UPDATE`` o ``flush`` a la primaria, tras lo cual el resto de la
+sesión también usa la primaria.
+
+Qué peticiones pueden leer de una réplica lo decide ``ReplicasMiddleware`` con la
+variable de contexto ``lectura_en_replica``: solo GET y HEAD, y no durante la
+ventana de lectura de escrituras propias que sigue a una escritura del cliente.
+"""
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from .pool import estadisticas_pool
+
+logger = logging.getLogger(__name__)
+
+E = TypeVar("E")
+
+ESTRATEGIAS = ("round_robin", "least_connections")
+
+# Activa en las peticiones que pueden leer de una réplica (ver ReplicasMiddleware)
+lectura_en_replica: ContextVar[bool] = ContextVar("lectura_en_replica", default=False)
+
+
+def _motor_sincrono(motor: Any) -> Engine:
+    return getattr(motor, "sync_engine", motor)
+
+
+class Replica(Generic[E]):
+    """Un motor de réplica, sus peticiones en curso y hasta cuándo está expulsada."""
+
+    def __init__(self, motor: E) -> None:
+        self.motor = motor
+        self.nombre = _motor_sincrono(motor).url.render_as_string(hide_password=True)
+        self.en_uso = 0
+        self.fallos = 0
+        self.expulsada_hasta = 0.0
+
+    def sana(self, ahora: float) -> bool:
+        return self.expulsada_hasta <= ahora
+
+
+class EnrutadorReplicas(Generic[E]):
+    """Reparte las lecturas entre réplicas sanas; ``motor_lectura`` da ``None`` para la primaria.
+
+    Una réplica se expulsa cuando no se puede conectar con ella o el driver
+    detecta la conexión caída, y vuelve a recibir peticiones al terminar la
+    expulsión; si sigue caída, la siguiente conexión fallida la expulsa de nuevo.
+    """
+
+    def __init__(
+        self,
+        motores: Sequence[E],
+        estrategia: str = "round_robin",
+        expulsion_segundos: float = 30.0,
+    ) -> None:
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(
+                f"Estrategia de réplicas desconocida: {estrategia} (use {' o '.join(ESTRATEGIAS)})"
+            )
+        self.replicas: List[Replica[E]] = [Replica(motor) for motor in motores]
+        self.estrategia = estrategia
+        self.expulsion_segundos = expulsion_segundos
+        self._turno = itertools.count()
+        self._lock = threading.Lock()
+        for replica in self.replicas:
+            self._vigilar(replica)
+
+    def _vigilar(self, replica: Replica[E]) -> None:
+        def al_fallar(contexto: ExceptionContext) -> None:
+            # Sin conexión: falló al conectar; is_disconnect: el servidor cerró la conexión
+            if contexto.connection is None or contexto.is_disconnect:
+                self.expulsar(replica)
+
+        event.listen(_motor_sincrono(replica.motor), "handle_error", al_fallar)
+
+    def expulsar(self, replica: Replica[E]) -> None:
+        ahora = time.monotonic()
+        with self._lock:
+            ya_expulsada = not replica.sana(ahora)
+            replica.fallos += 1
+            replica.expulsada_hasta = ahora + self.expulsion_segundos
+        if not ya_expulsada:
+            logger.warning(
+                "Réplica %s expulsada durante %.0f s", replica.nombre, self.expulsion_segundos
+            )
+
+    def elegir(self) -> Optional[Replica[E]]:
+        """Reserva una réplica sana (hay que devolverla con ``liberar``) o ``None``."""
+        ahora = time.monotonic()
+        with self._lock:
+            sanas = [replica for replica in self.replicas if replica.sana(ahora)]
+            if not sanas:
+                return None
+            turno = next(self._turno) % len(sanas)
+            if self.estrategia == "least_connections":
+                # Empezar en el turno reparte los empates en lugar de cargar siempre la primera
+                elegida = min(sanas[turno:] + sanas[:turno], key=lambda replica: replica.en_uso)
+            else:
+                elegida = sanas[turno]
+            elegida.en_uso += 1
+            return elegida
+
+    def liberar(self, replica: Replica[E]) -> None:
+        with self._lock:
+            replica.en_uso -= 1
+
+    @contextmanager
+    def motor_lectura(self) -> Iterator[Optional[E]]:
+        """Motor de réplica para la petición en curso o ``None`` si debe usar la primaria."""
+        replica = self.elegir() if self.replicas and lectura_en_replica.get() else None
+        try:
+            yield replica.motor if replica is not None else None
+        finally:
+            if replica is not None:
+                self.liberar(replica)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        ahora = time.monotonic()
+        return [
+            {
+                "replica": replica.nombre,
+                "healthy": replica.sana(ahora),
+                "in_use": replica.en_uso,
+                "failures": replica.fallos,
+                "pool": estadisticas_pool(_motor_sincrono(replica.motor)),
+            }
+            for replica in self.replicas
+        ]
+
+
+class SesionEnrutada(Session):
+    """``Session`` que lee de ``replica`` (si hay) y escribe siempre en la primaria.
+
+    Con ``AsyncSession`` se usa como ``sync_session_class`` y ``replica`` es el
+    ``sync_engine`` del motor asíncrono de la réplica.
+    """
+
+    replica: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.replica is not None and (
+            self._flushing
+            or isinstance(clause, UpdateBase)
+            or getattr(clause, "_for_update_arg", None) is not None
+        ):
+            # Lo que siga en la sesión debe ver esta escritura: ya no se vuelve a la réplica
+            self.replica = None
+        if self.replica is None:
+            return super().get_bind(mapper, clause=clause, **kw)
+        return self.replica
+
+
+def lee_de_primaria(session: Any) -> bool:
+    """Si ``session`` (o la ``sync_session`` de una ``AsyncSession``) lee ya de la primaria.
+
+    Lo leído de una réplica puede ir retrasado: no debe quedarse en cachés del proceso,
+    que lo servirían también a quien acaba de escribir.
+    """
+    return getattr(getattr(session, "sync_session", session), "replica", None) is None
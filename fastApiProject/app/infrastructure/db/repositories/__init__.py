@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+from .async_estadisticas_repository import AsyncSQLAlchemyEstadisticasRepository
+from .async_marca_repository import AsyncSQLAlchemyMarcaRepository
+from .async_persona_repository import AsyncSQLAlchemyPersonaRepository
+from .async_vehiculo_repository import AsyncSQLAlchemyVehiculoRepository
+from .estadisticas_repository import SQLAlchemyEstadisticasRepository
 from .marca_repository import SQLAlchemyMarcaRepository
 from .persona_repository import SQLAlchemyPersonaRepository
 from .vehiculo_repository import SQLAlchemyVehiculoRepository
 
 __all__ = [
+    "AsyncSQLAlchemyEstadisticasRepository",
+    "AsyncSQLAlchemyMarcaRepository",
+    "AsyncSQLAlchemyPersonaRepository",
+    "AsyncSQLAlchemyVehiculoRepository",
+    "SQLAlchemyEstadisticasRepository",
     "SQLAlchemyMarcaRepository",
     "SQLAlchemyPersonaRepository",
     "SQLAlchemyVehiculoRepository",
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Callable, Hashable, Iterable, List, Tuple, Type, TypeVar
+
+from sqlalchemy import Insert, insert
+
+from app.domain.entities import ErrorLote
+
+from ..base import Base
+
+T = TypeVar("T")
+
+
+def _split_unique(
+    items: List[T],
+    key: Callable[[T], Hashable],
+    existentes: Iterable[Hashable],
+    mensaje: str,
+) -> Tuple[List[Tuple[int, T]], List[ErrorLote]]:
+    """Separa los elementos cuya clave única ya existe (en BD o antes en el lote).
+
+    Devuelve los válidos junto a su índice original y un error por cada descartado.
+    """
+    vistos = set(existentes)
+    validos: List[Tuple[int, T]] = []
+    errores: List[ErrorLote] = []
+    for indice, item in enumerate(items):
+        clave = key(item)
+        if clave in vistos:
+            errores.append(ErrorLote(indice=indice, detalle=mensaje))
+            continue
+        vistos.add(clave)
+        validos.append((indice, item))
+    return validos, errores
+
+
+def _insert_returning(model: Type[Base], *columnas, ordenado: bool = False) -> Insert:
+    """INSERT multi-fila (``insertmanyvalues``) con ``RETURNING`` de las columnas dadas.
+
+    Con ``ordenado`` las filas devueltas siguen el orden de los parámetros; PostgreSQL
+    lo resuelve en lotes, pero SQLite obliga a insertar fila a fila. Si el lote tiene
+    una clave única conviene devolverla y emparejar por ella en lugar de ordenar.
+    """
+    return insert(model).returning(*columnas, sort_by_parameter_order=ordenado)
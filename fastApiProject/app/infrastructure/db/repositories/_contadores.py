@@ -0,0 +1,130 @@
+"""
+Contadores desnormalizados: vehículos por marca y por persona, propietarios por vehículo.
+
+Los repositorios los ajustan en la misma transacción que la escritura que los
+cambia; ``reconciliar_contadores`` repara cualquier deriva (cargas hechas por
+fuera de la API, ediciones manuales) recalculándolos por rangos de id.
+"""
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Type, Union
+
+from sqlalchemy import Connection, Engine, ScalarSelect, Update, bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..base import Base
+from ..models import MarcaVehiculoDB, PersonaDB, VehiculoDB, vehiculo_propietario
+
+logger = logging.getLogger(__name__)
+
+_CONTADORES: Dict[Type[Base], str] = {
+    MarcaVehiculoDB: "vehiculo_count",
+    PersonaDB: "vehiculo_count",
+    VehiculoDB: "propietario_count",
+}
+
+
+def _ajuste(model: Type[Base]) -> Update:
+    """``UPDATE`` de Core para ``executemany``: suma ``_delta`` al contador de la fila ``_id``.
+
+    Se construye sobre la tabla y no sobre la entidad para que la sesión no lo trate
+    como un *bulk update* del ORM.
+    """
+    tabla = model.__table__
+    columna = tabla.c[_CONTADORES[model]]
+    return (
+        update(tabla)
+        .where(tabla.c.id == bindparam("_id"))
+        .values({columna: columna + bindparam("_delta")})
+    )
+
+
+def _incrementar(model: Type[Base], fila_id: int, delta: int = 1) -> Update:
+    """Ajuste de una sola fila; con ``RETURNING`` indica además si la fila existe."""
+    tabla = model.__table__
+    columna = tabla.c[_CONTADORES[model]]
+    return update(tabla).where(tabla.c.id == fila_id).values({columna: columna + delta})
+
+
+def _deltas(incrementos: Iterable[int] = (), decrementos: Iterable[int] = ()) -> Counter:
+    deltas: Counter = Counter(incrementos)
+    deltas.subtract(decrementos)
+    return deltas
+
+
+def _parametros_ajuste(deltas: Mapping[int, int]) -> List[dict]:
+    """Un parámetro por fila que cambia, en orden de id para bloquear siempre en el mismo orden."""
+    return [{"_id": fila_id, "_delta": delta} for fila_id, delta in sorted(deltas.items()) if delta]
+
+
+def _ajustar(
+    conexion: Union[Session, Connection], model: Type[Base], deltas: Mapping[int, int]
+) -> None:
+    parametros = _parametros_ajuste(deltas)
+    if parametros:
+        conexion.execute(_ajuste(model), parametros)
+
+
+async def _ajustar_async(
+    session: AsyncSession, model: Type[Base], deltas: Mapping[int, int]
+) -> None:
+    parametros = _parametros_ajuste(deltas)
+    if parametros:
+        await session.execute(_ajuste(model), parametros)
+
+
+def _conteo_real(model: Type[Base]) -> ScalarSelect:
+    """Subconsulta correlacionada con el valor correcto del contador de ``model``."""
+    if model is MarcaVehiculoDB:
+        condicion = VehiculoDB.marca_id == MarcaVehiculoDB.id
+        origen = VehiculoDB.__table__
+    elif model is PersonaDB:
+        condicion = vehiculo_propietario.c.persona_id == PersonaDB.id
+        origen = vehiculo_propietario
+    else:
+        condicion = vehiculo_propietario.c.vehiculo_id == VehiculoDB.id
+        origen = vehiculo_propietario
+    return select(func.count()).select_from(origen).where(condicion).scalar_subquery()
+
+
+def _reparar_rango(model: Type[Base], desde: int, hasta: int) -> Update:
+    """Corrige solo las filas del rango ``[desde, hasta)`` cuyo contador difiere del real.
+
+    En vehículos también incrementa ``version``: su ETag no incluye el contador.
+    """
+    tabla = model.__table__
+    columna = tabla.c[_CONTADORES[model]]
+    real = _conteo_real(model)
+    valores = {columna: real}
+    if model is VehiculoDB:
+        valores[tabla.c.version] = tabla.c.version + 1
+    return (
+        update(tabla)
+        .where(tabla.c.id >= desde, tabla.c.id < hasta, columna != real)
+        .values(valores)
+    )
+
+
+def reconciliar_contadores(engine: Engine, lote: int = 10_000) -> Dict[str, int]:
+    """Recalcula los contadores por rangos de ``lote`` ids, cada rango en su transacción.
+
+    Los rangos cortos mantienen los bloqueos breves frente a las escrituras de la API.
+    Devuelve cuántas filas se repararon por tabla.
+    """
+    reparadas: Dict[str, int] = {}
+    for model in _CONTADORES:
+        tabla = model.__table__
+        with engine.connect() as conn:
+            minimo, maximo = conn.execute(select(func.min(tabla.c.id), func.max(tabla.c.id))).one()
+        total = 0
+        if minimo is not None:
+            for desde in range(minimo, maximo + 1, lote):
+                with engine.begin() as conn:
+                    total += conn.execute(_reparar_rango(model, desde, desde + lote)).rowcount
+        if total:
+            logger.warning("Contadores reparados en %s: %d filas", tabla.name, total)
+        reparadas[tabla.name] = total
+    return reparadas
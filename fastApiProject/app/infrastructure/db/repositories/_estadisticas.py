@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from typing import List
+
+from sqlalchemy import Engine, Row, Select, column, func, select, table, text
+
+from app.domain.entities import Conteo, ConteoPorMarca
+
+from ..models import MarcaVehiculoDB, VehiculoDB, vehiculo_propietario
+
+# Vistas materializadas (solo PostgreSQL, migración 0005) con los mismos agregados
+VISTAS_ESTADISTICAS = (
+    "mv_vehiculos_por_marca",
+    "mv_vehiculos_por_color_puertas",
+    "mv_propietarios_por_vehiculo",
+)
+
+_mv_marca = table(
+    "mv_vehiculos_por_marca",
+    column("marca_id"),
+    column("nombre_marca"),
+    column("pais"),
+    column("total"),
+)
+_mv_color_puertas = table(
+    "mv_vehiculos_por_color_puertas", column("color"), column("numero_puertas"), column("total")
+)
+_mv_propietarios = table("mv_propietarios_por_vehiculo", column("propietarios"), column("total"))
+
+
+def _por_marca(limit: int, vistas: bool) -> Select:
+    if vistas:
+        return (
+            select(_mv_marca)
+            .order_by(_mv_marca.c.total.desc(), _mv_marca.c.marca_id)
+            .limit(limit)
+        )
+    total = func.count(VehiculoDB.id)
+    return (
+        select(
+            MarcaVehiculoDB.id.label("marca_id"),
+            MarcaVehiculoDB.nombre_marca,
+            MarcaVehiculoDB.pais,
+            total.label("total"),
+        )
+        .outerjoin(VehiculoDB, VehiculoDB.marca_id == MarcaVehiculoDB.id)
+        .group_by(MarcaVehiculoDB.id, MarcaVehiculoDB.nombre_marca, MarcaVehiculoDB.pais)
+        .order_by(total.desc(), MarcaVehiculoDB.id)
+        .limit(limit)
+    )
+
+
+def _por_pais(limit: int, vistas: bool) -> Select:
+    if vistas:
+        valor, total = _mv_marca.c.pais, func.sum(_mv_marca.c.total)
+    else:
+        valor, total = MarcaVehiculoDB.pais, func.count(VehiculoDB.id)
+    stmt = select(valor.label("valor"), total.label("total"))
+    if not vistas:
+        stmt = stmt.outerjoin(VehiculoDB, VehiculoDB.marca_id == MarcaVehiculoDB.id)
+    return stmt.group_by(valor).order_by(total.desc(), valor).limit(limit)
+
+
+def _por_columna(nombre: str, vistas: bool) -> Select:
+    """Vehículos por ``color`` o ``numero_puertas``; sin vistas, recorre solo su índice."""
+    if vistas:
+        valor, total = _mv_color_puertas.c[nombre], func.sum(_mv_color_puertas.c.total)
+    else:
+        valor, total = getattr(VehiculoDB, nombre), func.count()
+    return select(valor.label("valor"), total.label("total")).group_by(valor)
+
+
+def _por_color(limit: int, vistas: bool) -> Select:
+    stmt = _por_columna("color", vistas)
+    return stmt.order_by(stmt.selected_columns.total.desc(), "valor").limit(limit)
+
+
+def _por_puertas(vistas: bool) -> Select:
+    return _por_columna("numero_puertas", vistas).order_by("valor")
+
+
+def _propietarios_por_vehiculo(vistas: bool) -> Select:
+    """Cuántos vehículos tienen 0, 1, 2… propietarios."""
+    if vistas:
+        return select(
+            _mv_propietarios.c.propietarios.label("valor"), _mv_propietarios.c.total
+        ).order_by(_mv_propietarios.c.propietarios)
+    por_vehiculo = (
+        select(func.count(vehiculo_propietario.c.persona_id).label("propietarios"))
+        .select_from(VehiculoDB)
+        .outerjoin(vehiculo_propietario, vehiculo_propietario.c.vehiculo_id == VehiculoDB.id)
+        .group_by(VehiculoDB.id)
+        .subquery()
+    )
+    return (
+        select(por_vehiculo.c.propietarios.label("valor"), func.count().label("total"))
+        .group_by(por_vehiculo.c.propietarios)
+        .order_by(por_vehiculo.c.propietarios)
+    )
+
+
+def _to_domain_conteo(fila: Row) -> Conteo:
+    # ``sum`` sobre las vistas devuelve ``Decimal`` en PostgreSQL
+    return Conteo(valor=fila.valor, total=int(fila.total))
+
+
+def _to_domain_conteos(filas) -> List[Conteo]:
+    return [_to_domain_conteo(fila) for fila in filas]
+
+
+def _to_domain_conteo_marca(fila: Row) -> ConteoPorMarca:
+    return ConteoPorMarca(
+        marca_id=fila.marca_id,
+        nombre_marca=fila.nombre_marca,
+        pais=fila.pais,
+        total=int(fila.total),
+    )
+
+
+def refrescar_vistas(engine: Engine) -> None:
+    """Recalcula las vistas sin bloquear las lecturas (``CONCURRENTLY``, fuera de transacción)."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for vista in VISTAS_ESTADISTICAS:
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {vista}"))
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import Any, Optional, TypeVar, Union
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Query
+
+_Q = TypeVar("_Q", bound=Union[Query, Select])
+
+
+def _paginate(query: _Q, key: InstrumentedAttribute, skip: int, after_id: Optional[int]) -> _Q:
+    """Ordena por ``key`` y aplica paginación por cursor (keyset) u OFFSET.
+
+    Acepta tanto ``Query`` (sesión síncrona) como ``Select`` (sesión asíncrona).
+    Con ``after_id`` se filtra ``key > after_id`` y se ignora ``skip``, de modo que
+    cualquier página cuesta lo mismo que la primera al recorrer el índice de la clave.
+    """
+    query = query.order_by(key)
+    if after_id is not None:
+        return query.filter(key > after_id)
+    return query.offset(skip)
+
+
+def _paginate_sorted(
+    query: _Q,
+    key: InstrumentedAttribute,
+    id_key: InstrumentedAttribute,
+    descending: bool,
+    skip: int,
+    after_id: Optional[int],
+    after_valor: Any = None,
+) -> _Q:
+    """Como :func:`_paginate`, pero ordenando por ``key`` con ``id_key`` como desempate.
+
+    ``after_valor`` es el valor de ``key`` en la fila ``after_id``, que guarda el
+    cursor: así la página no depende de que esa fila siga existiendo. El keyset se
+    expresa como una comparación de tuplas ``(key, id) > (after_valor, after_id)``,
+    que los índices compuestos ``(key, id)`` resuelven como un rango.
+    """
+    if key is id_key:
+        query = query.order_by(id_key.desc() if descending else id_key)
+        if after_id is None:
+            return query.offset(skip)
+        return query.filter(id_key < after_id if descending else id_key > after_id)
+    query = query.order_by(*((key.desc(), id_key.desc()) if descending else (key, id_key)))
+    if after_id is None:
+        return query.offset(skip)
+    if after_valor is None:
+        raise ValueError("El cursor de un listado ordenado necesita el valor de su fila ancla.")
+    ancla = tuple_(after_valor, after_id)
+    actual = tuple_(key, id_key)
+    return query.filter(actual < ancla if descending else actual > ancla)
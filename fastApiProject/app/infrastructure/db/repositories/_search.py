@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+from typing import List, Optional
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    column,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    union_all,
+)
+
+from app.domain.entities import Persona
+
+from ..models import PersonaDB
+from ..models.persona_model import PERSONAS_FTS
+
+# Un prefijo de cédula siempre se ordena antes que cualquier coincidencia por nombre
+_PUNTAJE_CEDULA = 1e9
+
+_personas_fts = table(PERSONAS_FTS, column("rowid"), column("rank"))
+
+# Lo que muestran los listados de personas: sin la relación con sus vehículos
+_COLUMNAS_PERSONA = (
+    PersonaDB.id,
+    PersonaDB.nombre,
+    PersonaDB.cedula,
+    PersonaDB.version,
+    PersonaDB.vehiculo_count,
+)
+
+
+def _escapar_like(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _escapar_glob(texto: str) -> str:
+    return re.sub(r"([*?\[])", r"[\1]", texto)
+
+
+def _consulta_fts(q: str) -> Optional[str]:
+    """Traduce el texto libre a una consulta FTS5: cada palabra como prefijo, todas requeridas."""
+    palabras = re.findall(r"\w+", q)
+    if not palabras:
+        return None
+    return " ".join(f'"{palabra}"*' for palabra in palabras)
+
+
+def _candidatos_postgresql(q: str, limit: int) -> List[Select]:
+    puntaje = func.similarity(PersonaDB.nombre, q)
+    return [
+        select(PersonaDB.id, literal(_PUNTAJE_CEDULA).label("puntaje"))
+        .where(PersonaDB.cedula.like(f"{_escapar_like(q)}%", escape="\\"))
+        .order_by(PersonaDB.cedula)
+        .limit(limit),
+        # ``%`` (similitud de trigramas) e ``ILIKE`` se resuelven con el índice GIN
+        select(PersonaDB.id, puntaje.label("puntaje"))
+        .where(
+            or_(
+                PersonaDB.nombre.bool_op("%")(q),
+                PersonaDB.nombre.ilike(f"%{_escapar_like(q)}%", escape="\\"),
+            )
+        )
+        .order_by(puntaje.desc())
+        .limit(limit),
+    ]
+
+
+def _candidatos_sqlite(q: str, limit: int) -> List[Select]:
+    candidatos = [
+        select(PersonaDB.id, literal(_PUNTAJE_CEDULA).label("puntaje"))
+        .where(PersonaDB.cedula.op("GLOB")(f"{_escapar_glob(q)}*"))
+        .order_by(PersonaDB.cedula)
+        .limit(limit)
+    ]
+    consulta = _consulta_fts(q)
+    if consulta is not None:
+        # ``rank`` es bm25: más negativo es más relevante
+        candidatos.append(
+            select(_personas_fts.c.rowid.label("id"), (-_personas_fts.c.rank).label("puntaje"))
+            .where(literal_column(PERSONAS_FTS).op("MATCH")(consulta))
+            .order_by(_personas_fts.c.rank)
+            .limit(limit)
+        )
+    return candidatos
+
+
+def _busqueda_personas(q: str, limit: int, dialecto: str) -> Select:
+    """Búsqueda de personas por prefijo de cédula o nombre aproximado, ordenada por relevancia.
+
+    Cada rama obtiene como mucho ``limit`` candidatos usando su propio índice (trigramas
+    en PostgreSQL, FTS5 en SQLite) y solo esos candidatos se unen con ``personas``,
+    así el coste depende de ``limit`` y no del tamaño de la tabla.
+    """
+    if dialecto == "postgresql":
+        ramas = _candidatos_postgresql(q, limit)
+    else:
+        ramas = _candidatos_sqlite(q, limit)
+    subconsultas = [rama.subquery() for rama in ramas]
+    candidatos = union_all(*(select(sub.c.id, sub.c.puntaje) for sub in subconsultas)).subquery()
+    puntaje: ColumnElement = func.max(candidatos.c.puntaje)
+    return (
+        select(*_COLUMNAS_PERSONA)
+        .join(candidatos, candidatos.c.id == PersonaDB.id)
+        .group_by(*_COLUMNAS_PERSONA)
+        .order_by(puntaje.desc(), PersonaDB.id)
+        .limit(limit)
+    )
+
+
+def _to_domain_resultado(fila) -> Persona:
+    """Fila de ``_COLUMNAS_PERSONA`` sin ``vehiculos_ids``: las respuestas no los exponen."""
+    return Persona(
+        id=fila.id,
+        nombre=fila.nombre,
+        cedula=fila.cedula,
+        version=fila.version,
+        vehiculo_count=fila.vehiculo_count,
+    )
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Optional, Type
+
+from sqlalchemy import Update, update
+
+from app.domain.exceptions import ConflictoDeVersion, EntidadNoEncontrada
+
+from ..base import Base
+
+
+def _update_versionado(
+    model: Type[Base], entidad_id: int, data: dict, version_esperada: Optional[int] = None
+) -> Update:
+    """``UPDATE`` que incrementa ``version``; con ``version_esperada`` solo aplica si no cambió."""
+    stmt = update(model).where(model.id == entidad_id).values(**data, version=model.version + 1)
+    if version_esperada is not None:
+        stmt = stmt.where(model.version == version_esperada)
+    return stmt
+
+
+def _sin_fila(mensaje: str, version_esperada: Optional[int]) -> ValueError:
+    """Error para un ``UPDATE`` que no tocó filas: no existe o la versión cambió."""
+    if version_esperada is not None:
+        return ConflictoDeVersion("El recurso fue modificado por otra petición.")
+    return EntidadNoEncontrada(mensaje)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import Conteo, ConteoPorMarca
+from app.domain.repositories import AsyncEstadisticasRepository
+
+from ._estadisticas import (
+    _por_color,
+    _por_marca,
+    _por_pais,
+    _por_puertas,
+    _propietarios_por_vehiculo,
+    _to_domain_conteo_marca,
+    _to_domain_conteos,
+)
+
+
+class AsyncSQLAlchemyEstadisticasRepository(AsyncEstadisticasRepository):
+    """Implementación asíncrona de los agregados de vehículos."""
+
+    def __init__(self, session: AsyncSession, materializado: bool = False) -> None:
+        self._session = session
+        self._vistas = materializado and session.get_bind().dialect.name == "postgresql"
+
+    async def count_by_marca(self, limit: int) -> List[ConteoPorMarca]:
+        filas = await self._session.execute(_por_marca(limit, self._vistas))
+        return [_to_domain_conteo_marca(fila) for fila in filas]
+
+    async def count_by_pais(self, limit: int) -> List[Conteo]:
+        return _to_domain_conteos(await self._session.execute(_por_pais(limit, self._vistas)))
+
+    async def count_by_color(self, limit: int) -> List[Conteo]:
+        return _to_domain_conteos(await self._session.execute(_por_color(limit, self._vistas)))
+
+    async def count_by_puertas(self) -> List[Conteo]:
+        return _to_domain_conteos(await self._session.execute(_por_puertas(self._vistas)))
+
+    async def propietarios_distribution(self) -> List[Conteo]:
+        return _to_domain_conteos(
+            await self._session.execute(_propietarios_por_vehiculo(self._vistas))
+        )
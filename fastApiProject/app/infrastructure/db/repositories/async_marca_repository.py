@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import Marca, ResultadoLote, Version
+from app.domain.exceptions import EntidadNoEncontrada
+from app.domain.repositories import AsyncMarcaRepository
+
+from ._bulk import _insert_returning, _split_unique
+from ._contadores import _ajustar_async, _deltas
+from ._pagination import _paginate
+from ._versioning import _sin_fila, _update_versionado
+from .marca_repository import _to_domain_marca
+from ..models import MarcaVehiculoDB, PersonaDB, VehiculoDB, vehiculo_propietario
+
+
+class AsyncSQLAlchemyMarcaRepository(AsyncMarcaRepository):
+    """Implementación asíncrona del repositorio de Marca usando AsyncSession."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def create(self, marca: Marca) -> Marca:
+        stmt = (
+            insert(MarcaVehiculoDB)
+            .values(nombre_marca=marca.nombre_marca, pais=marca.pais)
+            .returning(MarcaVehiculoDB.id)
+        )
+        try:
+            marca_id = await self._session.scalar(stmt)
+            await self._session.commit()
+        except IntegrityError as exc:
+            await self._session.rollback()
+            raise ValueError("Ya existe una marca con ese nombre.") from exc
+        return Marca(id=marca_id, nombre_marca=marca.nombre_marca, pais=marca.pais)
+
+    async def create_many(self, marcas: List[Marca]) -> ResultadoLote[Marca]:
+        existentes = await self._session.scalars(
+            select(MarcaVehiculoDB.nombre_marca).where(
+                MarcaVehiculoDB.nombre_marca.in_({m.nombre_marca for m in marcas})
+            )
+        )
+        validas, errores = _split_unique(
+            marcas, lambda m: m.nombre_marca, existentes.all(), "Ya existe una marca con ese nombre."
+        )
+        if not validas:
+            return ResultadoLote(errores=errores)
+        valores = [{"nombre_marca": m.nombre_marca, "pais": m.pais} for _, m in validas]
+        try:
+            filas = await self._session.execute(
+                _insert_returning(
+                    MarcaVehiculoDB, MarcaVehiculoDB.nombre_marca, MarcaVehiculoDB.id
+                ),
+                valores,
+            )
+            ids = dict(filas.tuples().all())
+            await self._session.commit()
+        except IntegrityError as exc:
+            await self._session.rollback()
+            raise ValueError("Ya existe una marca con ese nombre.") from exc
+        creadas = [
+            Marca(id=ids[m.nombre_marca], nombre_marca=m.nombre_marca, pais=m.pais)
+            for _, m in validas
+        ]
+        return ResultadoLote(creados=creadas, errores=errores)
+
+    async def list(
+        self, skip: int, limit: int, after_id: Optional[int] = None
+    ) -> List[Marca]:
+        stmt = _paginate(select(MarcaVehiculoDB), MarcaVehiculoDB.id, skip, after_id)
+        marcas = await self._session.scalars(stmt.limit(limit))
+        return [_to_domain_marca(marca) for marca in marcas]
+
+    async def get(self, marca_id: int) -> Optional[Marca]:
+        marca = await self._session.get(MarcaVehiculoDB, marca_id)
+        return _to_domain_marca(marca) if marca else None
+
+    async def get_many(self, marcas_ids: Iterable[int]) -> List[Marca]:
+        marcas = await self._session.scalars(
+            select(MarcaVehiculoDB)
+            .where(MarcaVehiculoDB.id.in_(set(marcas_ids)))
+            .order_by(MarcaVehiculoDB.id)
+        )
+        return [_to_domain_marca(marca) for marca in marcas]
+
+    async def exists_many(self, marcas_ids: Iterable[int]) -> Set[int]:
+        return set(
+            await self._session.scalars(
+                select(MarcaVehiculoDB.id).where(MarcaVehiculoDB.id.in_(set(marcas_ids)))
+            )
+        )
+
+    async def get_version(self, marca_id: int) -> Optional[Version]:
+        fila = (
+            await self._session.execute(
+                select(MarcaVehiculoDB.version, MarcaVehiculoDB.vehiculo_count).where(
+                    MarcaVehiculoDB.id == marca_id
+                )
+            )
+        ).first()
+        return tuple(fila) if fila is not None else None
+
+    async def update(
+        self, marca_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Marca:
+        if not data:
+            marca = await self.get(marca_id)
+            if not marca:
+                raise EntidadNoEncontrada("Marca no encontrada.")
+            return marca
+        stmt = _update_versionado(MarcaVehiculoDB, marca_id, data, version_esperada).returning(
+            MarcaVehiculoDB.id,
+            MarcaVehiculoDB.nombre_marca,
+            MarcaVehiculoDB.pais,
+            MarcaVehiculoDB.version,
+            MarcaVehiculoDB.vehiculo_count,
+        )
+        try:
+            fila = (await self._session.execute(stmt)).one_or_none()
+            await self._session.commit()
+        except IntegrityError as exc:
+            await self._session.rollback()
+            raise ValueError("Ya existe una marca con ese nombre.") from exc
+        if fila is None:
+            raise _sin_fila("Marca no encontrada.", version_esperada)
+        return _to_domain_marca(fila)
+
+    async def delete(self, marca_id: int) -> None:
+        # Cascada explícita en SQL: no carga en memoria los vehículos de la marca
+        vehiculos = select(VehiculoDB.id).where(VehiculoDB.marca_id == marca_id)
+        propietarios = (
+            await self._session.scalars(
+                delete(vehiculo_propietario)
+                .where(vehiculo_propietario.c.vehiculo_id.in_(vehiculos))
+                .returning(vehiculo_propietario.c.persona_id)
+            )
+        ).all()
+        await self._session.execute(delete(VehiculoDB).where(VehiculoDB.marca_id == marca_id))
+        borrada = (
+            await self._session.execute(
+                delete(MarcaVehiculoDB)
+                .where(MarcaVehiculoDB.id == marca_id)
+                .returning(MarcaVehiculoDB.id)
+            )
+        ).first()
+        if borrada is None:
+            await self._session.rollback()
+            raise EntidadNoEncontrada("Marca no encontrada.")
+        await _ajustar_async(self._session, PersonaDB, _deltas(decrementos=propietarios))
+        await self._session.commit()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import Persona, ResultadoLote, Version
+from app.domain.exceptions import EntidadNoEncontrada
+from app.domain.repositories import AsyncPersonaRepository
+
+from ._bulk import _insert_returning, _split_unique
+from ._contadores import _ajustar_async, _deltas
+from ._pagination import _paginate
+from ._search import _COLUMNAS_PERSONA, _busqueda_personas, _to_domain_resultado
+from ._versioning import _sin_fila, _update_versionado
+from ..models import PersonaDB, VehiculoDB, vehiculo_propietario
+
+
+class AsyncSQLAlchemyPersonaRepository(AsyncPersonaRepository):
+    """Implementación asíncrona del repositorio de Persona usando AsyncSession."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def create(self, persona: Persona) -> Persona:
+        stmt = (
+            insert(PersonaDB)
+            .values(nombre=persona.nombre, cedula=persona.cedula)
+            .returning(PersonaDB.id)
+        )
+        try:
+            persona_id = await self._session.scalar(stmt)
+            await self._session.commit()
+        except IntegrityError as exc:
+            await self._session.rollback()
+            raise ValueError("Ya existe una persona con esa cédula.") from exc
+        return Persona(id=persona_id, nombre=persona.nombre, cedula=persona.cedula)
+
+    async def create_many(self, personas: List[Persona]) -> ResultadoLote[Persona]:
+        existentes = await self._session.scalars(
+            select(PersonaDB.cedula).where(PersonaDB.cedula.in_({p.cedula for p in personas}))
+        )
+        validas, errores = _split_unique(
+            personas, lambda p: p.cedula, existentes.all(), "Ya existe una persona con esa cédula."
+        )
+        if not validas:
+            return ResultadoLote(errores=errores)
+        valores = [{"nombre": p.nombre, "cedula": p.cedula} for _, p in validas]
+        try:
+            filas = await self._session.execute(
+                _insert_returning(PersonaDB, PersonaDB.cedula, PersonaDB.id), valores
+            )
+            ids = dict(filas.tuples().all())
+            await self._session.commit()
+        except IntegrityError as exc:
+            await self._session.rollback()
+            raise ValueError("Ya existe una persona con esa cédula.") from exc
+        creadas = [
+            Persona(id=ids[p.cedula], nombre=p.nombre, cedula=p.cedula)
+            for _, p in validas
+        ]
+        return ResultadoLote(creados=creadas, errores=errores)
+
+    async def list(
+        self, skip: int, limit: int, after_id: Optional[int] = None
+    ) -> List[Persona]:
+        stmt = _paginate(select(*_COLUMNAS_PERSONA), PersonaDB.id, skip, after_id)
+        filas = await self._session.execute(stmt.limit(limit))
+        return [_to_domain_resultado(fila) for fila in filas]
+
+    async def get(self, persona_id: int) -> Optional[Persona]:
+        fila = (
+            await self._session.execute(
+                select(*_COLUMNAS_PERSONA).where(PersonaDB.id == persona_id)
+            )
+        ).first()
+        return _to_domain_resultado(fila) if fila is not None else None
+
+    async def get_many(self, personas_ids: Iterable[int]) -> List[Persona]:
+        filas = await self._session.execute(
+            select(*_COLUMNAS_PERSONA)
+            .where(PersonaDB.id.in_(set(personas_ids)))
+            .order_by(PersonaDB.id)
+        )
+        return [_to_domain_resultado(fila) for fila in filas]
+
+    async def exists_many(self, personas_ids: Iterable[int]) -> Set[int]:
+        return set(
+            await self._session.scalars(
+                select(PersonaDB.id).where(PersonaDB.id.in_(set(personas_ids)))
+            )
+        )
+
+    async def search(self, q: str, limit: int) -> List[Persona]:
+        dialecto = self._session.get_bind().dialect.name
+        filas = await self._session.execute(_busqueda_personas(q, limit, dialecto))
+        return [_to_domain_resultado(fila) for fila in filas]
+
+    async def get_version(self, persona_id: int) -> Optional[Version]:
+        fila = (
+            await self._session.execute(
+                select(PersonaDB.version, PersonaDB.vehiculo_count).where(
+                    PersonaDB.id == persona_id
+                )
+            )
+        ).first()
+        return tuple(fila) if fila is not None else None
+
+    async def update(
+        self, persona_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Persona:
+        if not data:
+            persona = await self.get(persona_id)
+            if not persona:
+                raise EntidadNoEncontrada("Persona no encontrada.")
+            return persona
+        stmt = _update_versionado(PersonaDB, persona_id, data, version_esperada).returning(
+            PersonaDB.id,
+            PersonaDB.nombre,
+            PersonaDB.cedula,
+            PersonaDB.version,
+            PersonaDB.vehiculo_count,
+        )
+        try:
+            fila = (await self._session.execute(stmt)).one_or_none()
+            await self._session.commit()
+        except IntegrityError as exc:
+            await self._session.rollback()
+            raise ValueError("Ya existe una persona con esa cédula.") from exc
+        if fila is None:
+            raise _sin_fila("Persona no encontrada.", version_esperada)
+        vehiculos_ids = await self._session.scalars(
+            select(vehiculo_propietario.c.vehiculo_id)
+            .where(vehiculo_propietario.c.persona_id == persona_id)
+            .order_by(vehiculo_propietario.c.vehiculo_id)
+        )
+        return Persona(
+            id=fila.id,
+            nombre=fila.nombre,
+            cedula=fila.cedula,
+            vehiculos_ids=list(vehiculos_ids),
+            version=fila.version,
+            vehiculo_count=fila.vehiculo_count,
+        )
+
+    async def delete(self, persona_id: int) -> None:
+        vehiculos = (
+            await self._session.scalars(
+                delete(vehiculo_propietario)
+                .where(vehiculo_propietario.c.persona_id == persona_id)
+                .returning(vehiculo_propietario.c.vehiculo_id)
+            )
+        ).all()
+        borrada = (
+            await self._session.execute(
+                delete(PersonaDB).where(PersonaDB.id == persona_id).returning(PersonaDB.id)
+            )
+        ).first()
+        if borrada is None:
+            await self._session.rollback()
+            raise EntidadNoEncontrada("Persona no encontrada.")
+        await _ajustar_async(self._session, VehiculoDB, _deltas(decrementos=vehiculos))
+        await self._session.commit()
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import AsyncIterator, Callable, Iterable, List, Optional
+
+from sqlalchemy import Select, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.domain.entities import (
+    FiltroVehiculos,
+    Persona,
+    ResultadoLote,
+    Vehiculo,
+    VehiculoDetalle,
+    VehiculoExportado,
+    Version,
+)
+from app.domain.exceptions import EntidadNoEncontrada
+from app.domain.repositories import AsyncVehiculoRepository
+
+from ._bulk import _insert_returning
+from ._contadores import _ajustar_async, _deltas, _incrementar
+from ._pagination import _paginate
+from ._versioning import _sin_fila, _update_versionado
+from .marca_repository import _to_domain_marca
+from .vehiculo_repository import (
+    _detalles_creados,
+    _export_select,
+    _nuevo_exportado,
+    _paginate_filtrado,
+    _split_por_marca,
+    _to_domain_vehiculo,
+    _to_domain_vehiculo_detalle,
+    _valores_vehiculo,
+    _version_select,
+)
+from ..models import MarcaVehiculoDB, PersonaDB, VehiculoDB, vehiculo_propietario
+
+
+class AsyncSQLAlchemyVehiculoRepository(AsyncVehiculoRepository):
+    """Implementación asíncrona del repositorio de Vehículo usando AsyncSession.
+
+    Mantiene los contadores igual que :class:`SQLAlchemyVehiculoRepository`.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        al_cambiar_marcas: Optional[Callable[[Iterable[int]], None]] = None,
+    ) -> None:
+        self._session = session
+        self._al_cambiar_marcas = al_cambiar_marcas
+
+    async def create(self, vehiculo: Vehiculo) -> Vehiculo:
+        marca = await self._session.scalar(
+            _incrementar(MarcaVehiculoDB, vehiculo.marca_id).returning(MarcaVehiculoDB.id)
+        )
+        if marca is None:
+            await self._session.rollback()
+            raise EntidadNoEncontrada("Marca no encontrada.")
+        vehiculo_id = await self._session.scalar(
+            insert(VehiculoDB).values(**_valores_vehiculo(vehiculo)).returning(VehiculoDB.id)
+        )
+        await self._session.commit()
+        self._marcas_cambiadas([vehiculo.marca_id])
+        return Vehiculo(id=vehiculo_id, **_valores_vehiculo(vehiculo))
+
+    async def create_many(self, vehiculos: List[Vehiculo]) -> ResultadoLote[VehiculoDetalle]:
+        marcas = {
+            marca.id: _to_domain_marca(marca)
+            for marca in await self._session.scalars(
+                select(MarcaVehiculoDB).where(
+                    MarcaVehiculoDB.id.in_({v.marca_id for v in vehiculos})
+                )
+            )
+        }
+        validos, errores = _split_por_marca(vehiculos, marcas)
+        if not validos:
+            return ResultadoLote(errores=errores)
+        ids = (
+            await self._session.scalars(
+                _insert_returning(VehiculoDB, VehiculoDB.id, ordenado=True),
+                [_valores_vehiculo(v) for _, v in validos],
+            )
+        ).all()
+        por_marca = Counter(v.marca_id for _, v in validos)
+        await _ajustar_async(self._session, MarcaVehiculoDB, por_marca)
+        await self._session.commit()
+        self._marcas_cambiadas(por_marca)
+        return ResultadoLote(creados=_detalles_creados(ids, validos, marcas), errores=errores)
+
+    async def list(
+        self, skip: int, limit: int, after_id: Optional[int] = None
+    ) -> List[Vehiculo]:
+        stmt = _paginate(
+            select(VehiculoDB).options(selectinload(VehiculoDB.propietarios)),
+            VehiculoDB.id,
+            skip,
+            after_id,
+        )
+        vehiculos = await self._session.scalars(stmt.limit(limit))
+        return [_to_domain_vehiculo(vehiculo) for vehiculo in vehiculos]
+
+    async def get(self, vehiculo_id: int) -> Optional[Vehiculo]:
+        vehiculo = await self._session.get(
+            VehiculoDB, vehiculo_id, options=[selectinload(VehiculoDB.propietarios)]
+        )
+        return _to_domain_vehiculo(vehiculo) if vehiculo else None
+
+    async def get_many(self, vehiculos_ids: Iterable[int]) -> List[Vehiculo]:
+        vehiculos = await self._session.scalars(
+            select(VehiculoDB)
+            .options(selectinload(VehiculoDB.propietarios))
+            .where(VehiculoDB.id.in_(set(vehiculos_ids)))
+            .order_by(VehiculoDB.id)
+        )
+        return [_to_domain_vehiculo(vehiculo) for vehiculo in vehiculos]
+
+    async def list_detailed(
+        self,
+        skip: int,
+        limit: int,
+        after_id: Optional[int] = None,
+        filtro: Optional[FiltroVehiculos] = None,
+    ) -> List[VehiculoDetalle]:
+        stmt = _paginate_filtrado(self._detailed_select(), filtro, skip, after_id)
+        vehiculos = await self._session.scalars(stmt.limit(limit))
+        return [_to_domain_vehiculo_detalle(vehiculo) for vehiculo in vehiculos]
+
+    async def get_detailed(self, vehiculo_id: int) -> Optional[VehiculoDetalle]:
+        """Carga un vehículo con marca y propietarios en una única sentencia (dos JOIN)."""
+        stmt = (
+            select(VehiculoDB)
+            .options(joinedload(VehiculoDB.marca), joinedload(VehiculoDB.propietarios))
+            .where(VehiculoDB.id == vehiculo_id)
+            .execution_options(populate_existing=True)
+        )
+        vehiculo = (await self._session.scalars(stmt)).unique().one_or_none()
+        return _to_domain_vehiculo_detalle(vehiculo) if vehiculo else None
+
+    async def iter_export(self, batch_size: int = 1000) -> AsyncIterator[VehiculoExportado]:
+        """Recorre todo el registro con un cursor del lado del servidor en su propia conexión.
+
+        El motor sale de ``get_bind()`` de la sesión, así que respeta el enrutado a réplicas.
+        """
+        async with AsyncEngine(self._session.sync_session.get_bind()).connect() as conn:
+            filas = await conn.stream(
+                _export_select().execution_options(yield_per=batch_size)
+            )
+            actual: Optional[VehiculoExportado] = None
+            async for fila in filas:
+                if actual is not None and fila.id == actual.id:
+                    actual.propietarios_cedulas.append(fila.cedula)
+                    continue
+                if actual is not None:
+                    yield actual
+                actual = _nuevo_exportado(fila)
+            if actual is not None:
+                yield actual
+
+    async def get_version(self, vehiculo_id: int) -> Optional[Version]:
+        fila = (await self._session.execute(_version_select(vehiculo_id))).first()
+        return tuple(fila) if fila is not None else None
+
+    async def update(
+        self,
+        vehiculo_id: int,
+        data: dict,
+        version_esperada: Optional[int] = None,
+        propietarios_ids: Optional[List[int]] = None,
+    ) -> VehiculoDetalle:
+        if propietarios_ids is not None:
+            propietarios_ids = list(dict.fromkeys(propietarios_ids))
+            data = {**data, "propietario_count": len(propietarios_ids)}
+        if data:
+            marca_anterior = None
+            if "marca_id" in data:
+                marca_anterior = await self._session.scalar(
+                    select(VehiculoDB.marca_id)
+                    .where(VehiculoDB.id == vehiculo_id)
+                    .with_for_update()
+                )
+            actualizado = await self._session.scalar(
+                _update_versionado(VehiculoDB, vehiculo_id, data, version_esperada).returning(
+                    VehiculoDB.id
+                )
+            )
+            if actualizado is None:
+                await self._session.rollback()
+                raise _sin_fila("Vehículo no encontrado.", version_esperada)
+            marcas = []
+            if marca_anterior is not None and marca_anterior != data["marca_id"]:
+                marcas = [marca_anterior, data["marca_id"]]
+                await _ajustar_async(
+                    self._session, MarcaVehiculoDB, {marcas[0]: -1, marcas[1]: 1}
+                )
+            if propietarios_ids is not None:
+                await self._reemplazar_propietarios(vehiculo_id, propietarios_ids)
+            await self._session.commit()
+            self._marcas_cambiadas(marcas)
+        vehiculo = await self.get_detailed(vehiculo_id)
+        if not vehiculo:
+            raise EntidadNoEncontrada("Vehículo no encontrado.")
+        return vehiculo
+
+    async def delete(self, vehiculo_id: int) -> None:
+        propietarios = (
+            await self._session.scalars(
+                delete(vehiculo_propietario)
+                .where(vehiculo_propietario.c.vehiculo_id == vehiculo_id)
+                .returning(vehiculo_propietario.c.persona_id)
+            )
+        ).all()
+        marca_id = await self._session.scalar(
+            delete(VehiculoDB).where(VehiculoDB.id == vehiculo_id).returning(VehiculoDB.marca_id)
+        )
+        if marca_id is None:
+            await self._session.rollback()
+            raise EntidadNoEncontrada("Vehículo no encontrado.")
+        await _ajustar_async(self._session, MarcaVehiculoDB, {marca_id: -1})
+        await _ajustar_async(self._session, PersonaDB, _deltas(decrementos=propietarios))
+        await self._session.commit()
+        self._marcas_cambiadas([marca_id])
+
+    async def add_propietario(self, vehiculo_id: int, persona_id: int) -> VehiculoDetalle:
+        vehiculo = await self.get_detailed(vehiculo_id)
+        if not vehiculo:
+            raise EntidadNoEncontrada("Vehículo no encontrado.")
+        if any(persona.id == persona_id for persona in vehiculo.propietarios):
+            raise ValueError("El propietario ya está asociado al vehículo.")
+        persona = (
+            await self._session.execute(
+                _incrementar(PersonaDB, persona_id).returning(
+                    PersonaDB.id, PersonaDB.nombre, PersonaDB.cedula, PersonaDB.version
+                )
+            )
+        ).one_or_none()
+        if persona is None:
+            await self._session.rollback()
+            raise EntidadNoEncontrada("Persona no encontrada.")
+        await self._session.execute(
+            insert(vehiculo_propietario).values(vehiculo_id=vehiculo_id, persona_id=persona_id)
+        )
+        await self._session.execute(
+            _update_versionado(
+                VehiculoDB,
+                vehiculo_id,
+                {"propietario_count": VehiculoDB.propietario_count + 1},
+            )
+        )
+        await self._session.commit()
+        vehiculo.propietarios.append(
+            Persona(
+                id=persona.id, nombre=persona.nombre, cedula=persona.cedula, version=persona.version
+            )
+        )
+        vehiculo.version += 1
+        vehiculo.propietario_count += 1
+        return vehiculo
+
+    async def _reemplazar_propietarios(
+        self, vehiculo_id: int, propietarios_ids: List[int]
+    ) -> None:
+        anteriores = (
+            await self._session.scalars(
+                delete(vehiculo_propietario)
+                .where(vehiculo_propietario.c.vehiculo_id == vehiculo_id)
+                .returning(vehiculo_propietario.c.persona_id)
+            )
+        ).all()
+        if propietarios_ids:
+            await self._session.execute(
+                insert(vehiculo_propietario),
+                [{"vehiculo_id": vehiculo_id, "persona_id": p} for p in propietarios_ids],
+            )
+        await _ajustar_async(self._session, PersonaDB, _deltas(propietarios_ids, anteriores))
+
+    def _marcas_cambiadas(self, marcas_ids: Iterable[int]) -> None:
+        if self._al_cambiar_marcas is not None:
+            self._al_cambiar_marcas(marcas_ids)
+
+    def _detailed_select(self) -> Select:
+        """Select base que carga la marca por JOIN y los propietarios con SELECT ... IN.
+
+        Como la sesión no expira objetos al hacer commit, se fuerza ``populate_existing``
+        para que las relaciones reflejen las escrituras previas de la misma petición.
+        """
+        return (
+            select(VehiculoDB)
+            .options(
+                joinedload(VehiculoDB.marca),
+                selectinload(VehiculoDB.propietarios),
+            )
+            .execution_options(populate_existing=True)
+        )
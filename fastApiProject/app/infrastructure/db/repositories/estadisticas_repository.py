@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.domain.entities import Conteo, ConteoPorMarca
+from app.domain.repositories import EstadisticasRepository
+
+from ._estadisticas import (
+    _por_color,
+    _por_marca,
+    _por_pais,
+    _por_puertas,
+    _propietarios_por_vehiculo,
+    _to_domain_conteo_marca,
+    _to_domain_conteos,
+)
+
+
+class SQLAlchemyEstadisticasRepository(EstadisticasRepository):
+    """Agregados de vehículos calculados con ``GROUP BY`` en la base de datos.
+
+    Con ``materializado`` y PostgreSQL se leen de las vistas materializadas, que
+    ``refrescar_estadisticas.py`` recalcula periódicamente.
+    """
+
+    def __init__(self, session: Session, materializado: bool = False) -> None:
+        self._session = session
+        self._vistas = materializado and session.get_bind().dialect.name == "postgresql"
+
+    def count_by_marca(self, limit: int) -> List[ConteoPorMarca]:
+        filas = self._session.execute(_por_marca(limit, self._vistas))
+        return [_to_domain_conteo_marca(fila) for fila in filas]
+
+    def count_by_pais(self, limit: int) -> List[Conteo]:
+        return _to_domain_conteos(self._session.execute(_por_pais(limit, self._vistas)))
+
+    def count_by_color(self, limit: int) -> List[Conteo]:
+        return _to_domain_conteos(self._session.execute(_por_color(limit, self._vistas)))
+
+    def count_by_puertas(self) -> List[Conteo]:
+        return _to_domain_conteos(self._session.execute(_por_puertas(self._vistas)))
+
+    def propietarios_distribution(self) -> List[Conteo]:
+        return _to_domain_conteos(
+            self._session.execute(_propietarios_por_vehiculo(self._vistas))
+        )
@@ -1,22 +1,30 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 
+from sqlalchemy import delete, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.domain.entities import Marca
+from app.domain.entities import Marca, ResultadoLote, Version
+from app.domain.exceptions import EntidadNoEncontrada
 from app.domain.repositories import MarcaRepository
 
-from ..models import MarcaVehiculoDB
+from ._bulk import _insert_returning, _split_unique
+from ._contadores import _ajustar, _deltas
+from ._pagination import _paginate
+from ._versioning import _sin_fila, _update_versionado
+from ..models import MarcaVehiculoDB, PersonaDB, VehiculoDB, vehiculo_propietario
 
 
 def _to_domain_marca(model: MarcaVehiculoDB) -> Marca:
-    """Convierte un modelo ORM de Marca a una entidad de dominio."""
+    """Convierte un modelo ORM (o una fila con las mismas columnas) a una entidad de dominio."""
     return Marca(
         id=model.id,
         nombre_marca=model.nombre_marca,
         pais=model.pais,
+        version=model.version,
+        vehiculo_count=model.vehiculo_count,
     )
 
 
@@ -28,24 +36,56 @@ class SQLAlchemyMarcaRepository(MarcaRepository):
 
     """ Función crear """
     def create(self, marca: Marca) -> Marca:
-        model = MarcaVehiculoDB(nombre_marca=marca.nombre_marca, pais=marca.pais)
-        self._session.add(model)
+        stmt = (
+            insert(MarcaVehiculoDB)
+            .values(nombre_marca=marca.nombre_marca, pais=marca.pais)
+            .returning(MarcaVehiculoDB.id)
+        )
         try:
+            marca_id = self._session.scalar(stmt)
             self._session.commit()
         except IntegrityError as exc:
             self._session.rollback()
             raise ValueError("Ya existe una marca con ese nombre.") from exc
-        self._session.refresh(model)
-        return _to_domain_marca(model)
+        return Marca(id=marca_id, nombre_marca=marca.nombre_marca, pais=marca.pais)
 
-    """ Función listar MarcaRepository """
-    def list(self, skip: int, limit: int) -> List[Marca]:
-        marcas = (
-            self._session.query(MarcaVehiculoDB)
-            .offset(skip)
-            .limit(limit)
-            .all()
+    """ Función crear por lotes """
+    def create_many(self, marcas: List[Marca]) -> ResultadoLote[Marca]:
+        existentes = self._session.scalars(
+            select(MarcaVehiculoDB.nombre_marca).where(
+                MarcaVehiculoDB.nombre_marca.in_({m.nombre_marca for m in marcas})
+            )
+        ).all()
+        validas, errores = _split_unique(
+            marcas, lambda m: m.nombre_marca, existentes, "Ya existe una marca con ese nombre."
         )
+        if not validas:
+            return ResultadoLote(errores=errores)
+        valores = [{"nombre_marca": m.nombre_marca, "pais": m.pais} for _, m in validas]
+        try:
+            filas = self._session.execute(
+                _insert_returning(
+                    MarcaVehiculoDB, MarcaVehiculoDB.nombre_marca, MarcaVehiculoDB.id
+                ),
+                valores,
+            )
+            ids = dict(filas.tuples().all())
+            self._session.commit()
+        except IntegrityError as exc:
+            self._session.rollback()
+            raise ValueError("Ya existe una marca con ese nombre.") from exc
+        creadas = [
+            Marca(id=ids[m.nombre_marca], nombre_marca=m.nombre_marca, pais=m.pais)
+            for _, m in validas
+        ]
+        return ResultadoLote(creados=creadas, errores=errores)
+
+    """ Función listar MarcaRepository """
+    def list(
+        self, skip: int, limit: int, after_id: Optional[int] = None
+    ) -> List[Marca]:
+        query = _paginate(self._session.query(MarcaVehiculoDB), MarcaVehiculoDB.id, skip, after_id)
+        marcas = query.limit(limit).all()
         return [_to_domain_marca(marca) for marca in marcas]
 
     """ Función obtener por id """
@@ -53,26 +93,74 @@ class SQLAlchemyMarcaRepository(MarcaRepository):
         marca = self._session.get(MarcaVehiculoDB, marca_id)
         return _to_domain_marca(marca) if marca else None
 
+    """ Función obtener varias por id """
+    def get_many(self, marcas_ids: Iterable[int]) -> List[Marca]:
+        marcas = self._session.scalars(
+            select(MarcaVehiculoDB)
+            .where(MarcaVehiculoDB.id.in_(set(marcas_ids)))
+            .order_by(MarcaVehiculoDB.id)
+        )
+        return [_to_domain_marca(marca) for marca in marcas]
+
+    """ Función comprobar existencia """
+    def exists_many(self, marcas_ids: Iterable[int]) -> Set[int]:
+        return set(
+            self._session.scalars(
+                select(MarcaVehiculoDB.id).where(MarcaVehiculoDB.id.in_(set(marcas_ids)))
+            )
+        )
+
+    """ Función obtener versión """
+    def get_version(self, marca_id: int) -> Optional[Version]:
+        fila = self._session.execute(
+            select(MarcaVehiculoDB.version, MarcaVehiculoDB.vehiculo_count).where(
+                MarcaVehiculoDB.id == marca_id
+            )
+        ).first()
+        return tuple(fila) if fila is not None else None
+
     """ Función actualizar"""
-    def update(self, marca_id: int, data: dict) -> Marca:
-        marca = self._session.get(MarcaVehiculoDB, marca_id)
-        if not marca:
-            raise ValueError("Marca no encontrada.")
-        for campo, valor in data.items():
-            setattr(marca, campo, valor)
+    def update(
+        self, marca_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Marca:
+        if not data:
+            marca = self.get(marca_id)
+            if not marca:
+                raise EntidadNoEncontrada("Marca no encontrada.")
+            return marca
+        stmt = _update_versionado(MarcaVehiculoDB, marca_id, data, version_esperada).returning(
+            MarcaVehiculoDB.id,
+            MarcaVehiculoDB.nombre_marca,
+            MarcaVehiculoDB.pais,
+            MarcaVehiculoDB.version,
+            MarcaVehiculoDB.vehiculo_count,
+        )
         try:
+            fila = self._session.execute(stmt).one_or_none()
             self._session.commit()
         except IntegrityError as exc:
             self._session.rollback()
             raise ValueError("Ya existe una marca con ese nombre.") from exc
-        self._session.refresh(marca)
-        return _to_domain_marca(marca)
+        if fila is None:
+            raise _sin_fila("Marca no encontrada.", version_esperada)
+        return _to_domain_marca(fila)
 
     """Metodo Borrar"""
     def delete(self, marca_id: int) -> None:
-        marca = self._session.get(MarcaVehiculoDB, marca_id)
-        if not marca:
-            raise ValueError("Marca no encontrada.")
-        self._session.delete(marca)
+        # Cascada explícita en SQL: no carga en memoria los vehículos de la marca
+        vehiculos = select(VehiculoDB.id).where(VehiculoDB.marca_id == marca_id)
+        propietarios = self._session.scalars(
+            delete(vehiculo_propietario)
+            .where(vehiculo_propietario.c.vehiculo_id.in_(vehiculos))
+            .returning(vehiculo_propietario.c.persona_id)
+        ).all()
+        self._session.execute(delete(VehiculoDB).where(VehiculoDB.marca_id == marca_id))
+        borrada = self._session.execute(
+            delete(MarcaVehiculoDB).where(MarcaVehiculoDB.id == marca_id).returning(MarcaVehiculoDB.id)
+        ).first()
+        if borrada is None:
+            self._session.rollback()
+            raise EntidadNoEncontrada("Marca no encontrada.")
+        _ajustar(self._session, PersonaDB, _deltas(decrementos=propietarios))
         self._session.commit()
 
@@ -1,24 +1,21 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 
+from sqlalchemy import delete, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.domain.entities import Persona
+from app.domain.entities import Persona, ResultadoLote, Version
+from app.domain.exceptions import EntidadNoEncontrada
 from app.domain.repositories import PersonaRepository
 
-from ..models import PersonaDB
-
-
-def _to_domain_persona(model: PersonaDB) -> Persona:
-    """Convierte un modelo ORM de Persona a una entidad de dominio."""
-    return Persona(
-        id=model.id,
-        nombre=model.nombre,
-        cedula=model.cedula,
-        vehiculos_ids=[vehiculo.id for vehiculo in model.vehiculos],
-    )
+from ._bulk import _insert_returning, _split_unique
+from ._contadores import _ajustar, _deltas
+from ._pagination import _paginate
+from ._search import _COLUMNAS_PERSONA, _busqueda_personas, _to_domain_resultado
+from ._versioning import _sin_fila, _update_versionado
+from ..models import PersonaDB, VehiculoDB, vehiculo_propietario
 
 
 class SQLAlchemyPersonaRepository(PersonaRepository):
@@ -28,47 +25,134 @@ class SQLAlchemyPersonaRepository(PersonaRepository):
         self._session = session
 
     def create(self, persona: Persona) -> Persona:
-        model = PersonaDB(nombre=persona.nombre, cedula=persona.cedula)
-        self._session.add(model)
+        stmt = (
+            insert(PersonaDB)
+            .values(nombre=persona.nombre, cedula=persona.cedula)
+            .returning(PersonaDB.id)
+        )
         try:
+            persona_id = self._session.scalar(stmt)
             self._session.commit()
         except IntegrityError as exc:
             self._session.rollback()
             raise ValueError("Ya existe una persona con esa cédula.") from exc
-        self._session.refresh(model)
-        return _to_domain_persona(model)
-
-    def list(self, skip: int, limit: int) -> List[Persona]:
-        personas = (
-            self._session.query(PersonaDB)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return Persona(id=persona_id, nombre=persona.nombre, cedula=persona.cedula)
+
+    def create_many(self, personas: List[Persona]) -> ResultadoLote[Persona]:
+        existentes = self._session.scalars(
+            select(PersonaDB.cedula).where(PersonaDB.cedula.in_({p.cedula for p in personas}))
+        ).all()
+        validas, errores = _split_unique(
+            personas, lambda p: p.cedula, existentes, "Ya existe una persona con esa cédula."
         )
-        return [_to_domain_persona(persona) for persona in personas]
+        if not validas:
+            return ResultadoLote(errores=errores)
+        valores = [{"nombre": p.nombre, "cedula": p.cedula} for _, p in validas]
+        try:
+            filas = self._session.execute(
+                _insert_returning(PersonaDB, PersonaDB.cedula, PersonaDB.id), valores
+            )
+            ids = dict(filas.tuples().all())
+            self._session.commit()
+        except IntegrityError as exc:
+            self._session.rollback()
+            raise ValueError("Ya existe una persona con esa cédula.") from exc
+        creadas = [
+            Persona(id=ids[p.cedula], nombre=p.nombre, cedula=p.cedula)
+            for _, p in validas
+        ]
+        return ResultadoLote(creados=creadas, errores=errores)
+
+    def list(
+        self, skip: int, limit: int, after_id: Optional[int] = None
+    ) -> List[Persona]:
+        stmt = _paginate(select(*_COLUMNAS_PERSONA), PersonaDB.id, skip, after_id)
+        filas = self._session.execute(stmt.limit(limit))
+        return [_to_domain_resultado(fila) for fila in filas]
 
     def get(self, persona_id: int) -> Optional[Persona]:
-        persona = self._session.get(PersonaDB, persona_id)
-        return _to_domain_persona(persona) if persona else None
-
-    def update(self, persona_id: int, data: dict) -> Persona:
-        persona = self._session.get(PersonaDB, persona_id)
-        if not persona:
-            raise ValueError("Persona no encontrada.")
-        for campo, valor in data.items():
-            setattr(persona, campo, valor)
+        fila = self._session.execute(
+            select(*_COLUMNAS_PERSONA).where(PersonaDB.id == persona_id)
+        ).first()
+        return _to_domain_resultado(fila) if fila is not None else None
+
+    def get_many(self, personas_ids: Iterable[int]) -> List[Persona]:
+        """Carga varias personas con un único ``IN`` por id, sin leer sus vehículos."""
+        filas = self._session.execute(
+            select(*_COLUMNAS_PERSONA)
+            .where(PersonaDB.id.in_(set(personas_ids)))
+            .order_by(PersonaDB.id)
+        )
+        return [_to_domain_resultado(fila) for fila in filas]
+
+    def exists_many(self, personas_ids: Iterable[int]) -> Set[int]:
+        """Ids que existen de entre los dados, en una sola consulta sobre la clave primaria."""
+        return set(
+            self._session.scalars(
+                select(PersonaDB.id).where(PersonaDB.id.in_(set(personas_ids)))
+            )
+        )
+
+    def search(self, q: str, limit: int) -> List[Persona]:
+        dialecto = self._session.get_bind().dialect.name
+        filas = self._session.execute(_busqueda_personas(q, limit, dialecto))
+        return [_to_domain_resultado(fila) for fila in filas]
+
+    def get_version(self, persona_id: int) -> Optional[Version]:
+        fila = self._session.execute(
+            select(PersonaDB.version, PersonaDB.vehiculo_count).where(PersonaDB.id == persona_id)
+        ).first()
+        return tuple(fila) if fila is not None else None
+
+    def update(
+        self, persona_id: int, data: dict, version_esperada: Optional[int] = None
+    ) -> Persona:
+        if not data:
+            persona = self.get(persona_id)
+            if not persona:
+                raise EntidadNoEncontrada("Persona no encontrada.")
+            return persona
+        stmt = _update_versionado(PersonaDB, persona_id, data, version_esperada).returning(
+            PersonaDB.id,
+            PersonaDB.nombre,
+            PersonaDB.cedula,
+            PersonaDB.version,
+            PersonaDB.vehiculo_count,
+        )
         try:
+            fila = self._session.execute(stmt).one_or_none()
             self._session.commit()
         except IntegrityError as exc:
             self._session.rollback()
             raise ValueError("Ya existe una persona con esa cédula.") from exc
-        self._session.refresh(persona)
-        return _to_domain_persona(persona)
+        if fila is None:
+            raise _sin_fila("Persona no encontrada.", version_esperada)
+        vehiculos_ids = self._session.scalars(
+            select(vehiculo_propietario.c.vehiculo_id)
+            .where(vehiculo_propietario.c.persona_id == persona_id)
+            .order_by(vehiculo_propietario.c.vehiculo_id)
+        ).all()
+        return Persona(
+            id=fila.id,
+            nombre=fila.nombre,
+            cedula=fila.cedula,
+            vehiculos_ids=list(vehiculos_ids),
+            version=fila.version,
+            vehiculo_count=fila.vehiculo_count,
+        )
 
     def delete(self, persona_id: int) -> None:
-        persona = self._session.get(PersonaDB, persona_id)
-        if not persona:
-            raise ValueError("Persona no encontrada.")
-        self._session.delete(persona)
+        vehiculos = self._session.scalars(
+            delete(vehiculo_propietario)
+            .where(vehiculo_propietario.c.persona_id == persona_id)
+            .returning(vehiculo_propietario.c.vehiculo_id)
+        ).all()
+        borrada = self._session.execute(
+            delete(PersonaDB).where(PersonaDB.id == persona_id).returning(PersonaDB.id)
+        ).first()
+        if borrada is None:
+            self._session.rollback()
+            raise EntidadNoEncontrada("Persona no encontrada.")
+        _ajustar(self._session, VehiculoDB, _deltas(decrementos=vehiculos))
         self._session.commit()
 
@@ -1,13 +1,31 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, delete, func, insert, select
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
 
-from app.domain.entities import Vehiculo
+from app.domain.entities import (
+    ErrorLote,
+    FiltroVehiculos,
+    Marca,
+    Persona,
+    ResultadoLote,
+    Vehiculo,
+    VehiculoDetalle,
+    VehiculoExportado,
+    Version,
+)
+from app.domain.exceptions import EntidadNoEncontrada
 from app.domain.repositories import VehiculoRepository
 
-from ..models import PersonaDB, VehiculoDB
+from ._bulk import _insert_returning
+from ._contadores import _ajustar, _deltas, _incrementar
+from ._pagination import _Q, _paginate, _paginate_sorted
+from ._versioning import _sin_fila, _update_versionado
+from .marca_repository import _to_domain_marca
+from ..models import MarcaVehiculoDB, PersonaDB, VehiculoDB, vehiculo_propietario
 
 
 def _to_domain_vehiculo(model: VehiculoDB) -> Vehiculo:
@@ -19,83 +37,417 @@ def _to_domain_vehiculo(model: VehiculoDB) -> Vehiculo:
         numero_puertas=model.numero_puertas,
         color=model.color,
         propietarios_ids=[persona.id for persona in model.propietarios],
+        version=model.version,
+        propietario_count=model.propietario_count,
     )
 
 
+def _to_domain_vehiculo_detalle(model: VehiculoDB) -> VehiculoDetalle:
+    """Convierte un modelo ORM con relaciones ya cargadas a la proyección de lectura.
+
+    Los propietarios se construyen sin ``vehiculos_ids`` para no disparar una
+    carga perezosa por persona.
+    """
+    marca = model.marca
+    return VehiculoDetalle(
+        id=model.id,
+        modelo=model.modelo,
+        marca_id=model.marca_id,
+        numero_puertas=model.numero_puertas,
+        color=model.color,
+        marca=_to_domain_marca(marca),
+        propietarios=[
+            Persona(
+                id=persona.id,
+                nombre=persona.nombre,
+                cedula=persona.cedula,
+                version=persona.version,
+            )
+            for persona in model.propietarios
+        ],
+        version=model.version,
+        propietario_count=model.propietario_count,
+    )
+
+
+def _version_select(vehiculo_id: int) -> Select:
+    """Versión de un vehículo sin cargar relaciones: la suya, la de su marca y las de sus dueños.
+
+    Un cambio de propietarios incrementa la versión del vehículo; el número y la suma de
+    versiones de los propietarios reflejan además las ediciones de esas personas.
+    """
+    return (
+        select(
+            VehiculoDB.version,
+            MarcaVehiculoDB.version,
+            func.count(PersonaDB.id),
+            func.coalesce(func.sum(PersonaDB.version), 0),
+        )
+        .join(MarcaVehiculoDB, MarcaVehiculoDB.id == VehiculoDB.marca_id)
+        .outerjoin(vehiculo_propietario, vehiculo_propietario.c.vehiculo_id == VehiculoDB.id)
+        .outerjoin(PersonaDB, PersonaDB.id == vehiculo_propietario.c.persona_id)
+        .where(VehiculoDB.id == vehiculo_id)
+        .group_by(VehiculoDB.id, VehiculoDB.version, MarcaVehiculoDB.version)
+    )
+
+
+_COLUMNAS_ORDEN = {
+    "id": VehiculoDB.id,
+    "modelo": VehiculoDB.modelo,
+    "color": VehiculoDB.color,
+    "numero_puertas": VehiculoDB.numero_puertas,
+}
+
+
+def _filtrar(query: _Q, filtro: FiltroVehiculos) -> _Q:
+    """Aplica los filtros del listado sobre una ``Query`` o un ``Select`` de vehículos."""
+    if filtro.marca_id is not None:
+        query = query.filter(VehiculoDB.marca_id == filtro.marca_id)
+    if filtro.color is not None:
+        query = query.filter(VehiculoDB.color == filtro.color)
+    if filtro.numero_puertas is not None:
+        query = query.filter(VehiculoDB.numero_puertas == filtro.numero_puertas)
+    if filtro.propietario_id is not None:
+        query = query.join(
+            vehiculo_propietario, vehiculo_propietario.c.vehiculo_id == VehiculoDB.id
+        ).filter(vehiculo_propietario.c.persona_id == filtro.propietario_id)
+    return query
+
+
+def _paginate_filtrado(
+    query: _Q, filtro: Optional[FiltroVehiculos], skip: int, after_id: Optional[int]
+) -> _Q:
+    """Filtra, ordena y pagina el listado (cursor = último id y su valor de orden)."""
+    filtro = filtro or FiltroVehiculos()
+    columna = _COLUMNAS_ORDEN[filtro.orden.lstrip("-")]
+    return _paginate_sorted(
+        _filtrar(query, filtro),
+        columna,
+        VehiculoDB.id,
+        filtro.orden.startswith("-"),
+        skip,
+        after_id,
+        filtro.valor_ancla,
+    )
+
+
+def _split_por_marca(
+    vehiculos: List[Vehiculo], marcas: Dict[int, Marca]
+) -> Tuple[List[Tuple[int, Vehiculo]], List[ErrorLote]]:
+    """Separa los vehículos cuya marca no existe, conservando el índice original."""
+    validos: List[Tuple[int, Vehiculo]] = []
+    errores: List[ErrorLote] = []
+    for indice, vehiculo in enumerate(vehiculos):
+        if vehiculo.marca_id in marcas:
+            validos.append((indice, vehiculo))
+        else:
+            errores.append(ErrorLote(indice=indice, detalle="Marca no encontrada."))
+    return validos, errores
+
+
+def _valores_vehiculo(vehiculo: Vehiculo) -> dict:
+    return {
+        "modelo": vehiculo.modelo,
+        "marca_id": vehiculo.marca_id,
+        "numero_puertas": vehiculo.numero_puertas,
+        "color": vehiculo.color,
+    }
+
+
+def _detalles_creados(
+    ids: List[int], validos: List[Tuple[int, Vehiculo]], marcas: Dict[int, Marca]
+) -> List[VehiculoDetalle]:
+    """Arma la proyección de lectura de vehículos recién insertados (sin propietarios)."""
+    return [
+        VehiculoDetalle(
+            id=vehiculo_id,
+            modelo=v.modelo,
+            marca_id=v.marca_id,
+            numero_puertas=v.numero_puertas,
+            color=v.color,
+            marca=marcas[v.marca_id],
+        )
+        for vehiculo_id, (_, v) in zip(ids, validos)
+    ]
+
+
+def _export_select() -> Select:
+    """Filas planas vehículo × propietario, ordenadas por vehículo para agruparlas al vuelo."""
+    return (
+        select(
+            VehiculoDB.id,
+            VehiculoDB.modelo,
+            VehiculoDB.marca_id,
+            MarcaVehiculoDB.nombre_marca,
+            VehiculoDB.numero_puertas,
+            VehiculoDB.color,
+            PersonaDB.cedula,
+        )
+        .join(MarcaVehiculoDB, MarcaVehiculoDB.id == VehiculoDB.marca_id)
+        .outerjoin(vehiculo_propietario, vehiculo_propietario.c.vehiculo_id == VehiculoDB.id)
+        .outerjoin(PersonaDB, PersonaDB.id == vehiculo_propietario.c.persona_id)
+        .order_by(VehiculoDB.id)
+    )
+
+
+def _nuevo_exportado(fila: Row) -> VehiculoExportado:
+    return VehiculoExportado(
+        id=fila.id,
+        modelo=fila.modelo,
+        marca_id=fila.marca_id,
+        nombre_marca=fila.nombre_marca,
+        numero_puertas=fila.numero_puertas,
+        color=fila.color,
+        propietarios_cedulas=[fila.cedula] if fila.cedula is not None else [],
+    )
+
+
+def _agrupar_exportacion(filas: Iterable[Row]) -> Iterator[VehiculoExportado]:
+    """Agrupa filas consecutivas del mismo vehículo; solo retiene un vehículo en memoria."""
+    actual: Optional[VehiculoExportado] = None
+    for fila in filas:
+        if actual is not None and fila.id == actual.id:
+            actual.propietarios_cedulas.append(fila.cedula)
+            continue
+        if actual is not None:
+            yield actual
+        actual = _nuevo_exportado(fila)
+    if actual is not None:
+        yield actual
+
+
 class SQLAlchemyVehiculoRepository(VehiculoRepository):
-    """Implementación del repositorio de Vehículo usando SQLAlchemy."""
+    """Implementación del repositorio de Vehículo usando SQLAlchemy.
 
-    def __init__(self, session: Session) -> None:
+    Mantiene en la misma transacción los contadores de vehículos de marcas y personas
+    y el de propietarios de cada vehículo. ``al_cambiar_marcas`` recibe, tras el
+    commit, los ids de las marcas cuyo contador cambió (p. ej. para invalidar una caché).
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        al_cambiar_marcas: Optional[Callable[[Iterable[int]], None]] = None,
+    ) -> None:
         self._session = session
+        self._al_cambiar_marcas = al_cambiar_marcas
 
     def create(self, vehiculo: Vehiculo) -> Vehiculo:
-        model = VehiculoDB(
-            modelo=vehiculo.modelo,
-            marca_id=vehiculo.marca_id,
-            numero_puertas=vehiculo.numero_puertas,
-            color=vehiculo.color,
+        # El incremento bloquea la fila de la marca y comprueba de paso que existe
+        marca = self._session.scalar(
+            _incrementar(MarcaVehiculoDB, vehiculo.marca_id).returning(MarcaVehiculoDB.id)
+        )
+        if marca is None:
+            self._session.rollback()
+            raise EntidadNoEncontrada("Marca no encontrada.")
+        vehiculo_id = self._session.scalar(
+            insert(VehiculoDB).values(**_valores_vehiculo(vehiculo)).returning(VehiculoDB.id)
         )
-        self._session.add(model)
         self._session.commit()
-        self._session.refresh(model)
-        return _to_domain_vehiculo(model)
+        self._marcas_cambiadas([vehiculo.marca_id])
+        return Vehiculo(id=vehiculo_id, **_valores_vehiculo(vehiculo))
 
-    def list(self, skip: int, limit: int) -> List[Vehiculo]:
-        vehiculos = (
-            self._session.query(VehiculoDB)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    def create_many(self, vehiculos: List[Vehiculo]) -> ResultadoLote[VehiculoDetalle]:
+        """Inserta un lote validando todas las marcas referenciadas en una sola consulta."""
+        marcas = {
+            marca.id: _to_domain_marca(marca)
+            for marca in self._session.scalars(
+                select(MarcaVehiculoDB).where(
+                    MarcaVehiculoDB.id.in_({v.marca_id for v in vehiculos})
+                )
+            )
+        }
+        validos, errores = _split_por_marca(vehiculos, marcas)
+        if not validos:
+            return ResultadoLote(errores=errores)
+        ids = self._session.scalars(
+            _insert_returning(VehiculoDB, VehiculoDB.id, ordenado=True),
+            [_valores_vehiculo(v) for _, v in validos],
+        ).all()
+        por_marca = Counter(v.marca_id for _, v in validos)
+        _ajustar(self._session, MarcaVehiculoDB, por_marca)
+        self._session.commit()
+        self._marcas_cambiadas(por_marca)
+        return ResultadoLote(creados=_detalles_creados(ids, validos, marcas), errores=errores)
+
+    def list(
+        self, skip: int, limit: int, after_id: Optional[int] = None
+    ) -> List[Vehiculo]:
+        query = _paginate(self._session.query(VehiculoDB), VehiculoDB.id, skip, after_id)
+        vehiculos = query.limit(limit).all()
         return [_to_domain_vehiculo(vehiculo) for vehiculo in vehiculos]
 
     def get(self, vehiculo_id: int) -> Optional[Vehiculo]:
         vehiculo = self._session.get(VehiculoDB, vehiculo_id)
         return _to_domain_vehiculo(vehiculo) if vehiculo else None
 
-    def update(self, vehiculo_id: int, data: dict) -> Vehiculo:
-        vehiculo = self._get_model(vehiculo_id)
-        for campo, valor in data.items():
-            setattr(vehiculo, campo, valor)
-        self._session.commit()
-        self._session.refresh(vehiculo)
-        return _to_domain_vehiculo(vehiculo)
+    def get_many(self, vehiculos_ids: Iterable[int]) -> List[Vehiculo]:
+        vehiculos = self._session.scalars(
+            select(VehiculoDB)
+            .options(selectinload(VehiculoDB.propietarios))
+            .where(VehiculoDB.id.in_(set(vehiculos_ids)))
+            .order_by(VehiculoDB.id)
+        )
+        return [_to_domain_vehiculo(vehiculo) for vehiculo in vehiculos]
+
+    def list_detailed(
+        self,
+        skip: int,
+        limit: int,
+        after_id: Optional[int] = None,
+        filtro: Optional[FiltroVehiculos] = None,
+    ) -> List[VehiculoDetalle]:
+        """Lista vehículos con marca y propietarios en un número fijo de consultas."""
+        query = _paginate_filtrado(self._detailed_query(), filtro, skip, after_id)
+        vehiculos = query.limit(limit).all()
+        return [_to_domain_vehiculo_detalle(vehiculo) for vehiculo in vehiculos]
+
+    def get_detailed(self, vehiculo_id: int) -> Optional[VehiculoDetalle]:
+        """Carga un vehículo con marca y propietarios en una única sentencia (dos JOIN)."""
+        vehiculo = (
+            self._session.query(VehiculoDB)
+            .options(joinedload(VehiculoDB.marca), joinedload(VehiculoDB.propietarios))
+            .filter(VehiculoDB.id == vehiculo_id)
+            .one_or_none()
+        )
+        return _to_domain_vehiculo_detalle(vehiculo) if vehiculo else None
+
+    def iter_export(self, batch_size: int = 1000) -> Iterator[VehiculoExportado]:
+        """Recorre todo el registro con un cursor del lado del servidor.
+
+        Abre su propia conexión al iterar, de modo que el flujo puede consumirse
+        después de que la sesión de la petición se haya cerrado.
+        """
+        with self._session.get_bind().connect() as conn:
+            filas = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+                _export_select()
+            )
+            yield from _agrupar_exportacion(filas)
+
+    def get_version(self, vehiculo_id: int) -> Optional[Version]:
+        fila = self._session.execute(_version_select(vehiculo_id)).first()
+        return tuple(fila) if fila is not None else None
+
+    def update(
+        self,
+        vehiculo_id: int,
+        data: dict,
+        version_esperada: Optional[int] = None,
+        propietarios_ids: Optional[List[int]] = None,
+    ) -> VehiculoDetalle:
+        """Actualiza con ``UPDATE ... RETURNING`` y devuelve la proyección de lectura.
+
+        Campos y propietarios (si se envían, reemplazan a los actuales) se escriben en
+        una sola transacción con un único ``UPDATE`` versionado. Sin nada que cambiar
+        solo se ejecuta la lectura final. Un cambio de marca bloquea antes la fila del
+        vehículo para mover el contador de una marca a otra. No comprueba que las
+        personas existan: el servicio las valida antes con
+        ``PersonaRepository.exists_many`` y la clave foránea cubre las carreras.
+        """
+        if propietarios_ids is not None:
+            propietarios_ids = list(dict.fromkeys(propietarios_ids))
+            data = {**data, "propietario_count": len(propietarios_ids)}
+        if data:
+            marca_anterior = None
+            if "marca_id" in data:
+                marca_anterior = self._session.scalar(
+                    select(VehiculoDB.marca_id)
+                    .where(VehiculoDB.id == vehiculo_id)
+                    .with_for_update()
+                )
+            actualizado = self._session.scalar(
+                _update_versionado(VehiculoDB, vehiculo_id, data, version_esperada).returning(
+                    VehiculoDB.id
+                )
+            )
+            if actualizado is None:
+                self._session.rollback()
+                raise _sin_fila("Vehículo no encontrado.", version_esperada)
+            marcas = []
+            if marca_anterior is not None and marca_anterior != data["marca_id"]:
+                marcas = [marca_anterior, data["marca_id"]]
+                _ajustar(self._session, MarcaVehiculoDB, {marcas[0]: -1, marcas[1]: 1})
+            if propietarios_ids is not None:
+                self._reemplazar_propietarios(vehiculo_id, propietarios_ids)
+            self._session.commit()
+            self._marcas_cambiadas(marcas)
+        vehiculo = self.get_detailed(vehiculo_id)
+        if not vehiculo:
+            raise EntidadNoEncontrada("Vehículo no encontrado.")
+        return vehiculo
 
     def delete(self, vehiculo_id: int) -> None:
-        vehiculo = self._get_model(vehiculo_id)
-        self._session.delete(vehiculo)
+        propietarios = self._session.scalars(
+            delete(vehiculo_propietario)
+            .where(vehiculo_propietario.c.vehiculo_id == vehiculo_id)
+            .returning(vehiculo_propietario.c.persona_id)
+        ).all()
+        marca_id = self._session.scalar(
+            delete(VehiculoDB).where(VehiculoDB.id == vehiculo_id).returning(VehiculoDB.marca_id)
+        )
+        if marca_id is None:
+            self._session.rollback()
+            raise EntidadNoEncontrada("Vehículo no encontrado.")
+        _ajustar(self._session, MarcaVehiculoDB, {marca_id: -1})
+        _ajustar(self._session, PersonaDB, _deltas(decrementos=propietarios))
         self._session.commit()
+        self._marcas_cambiadas([marca_id])
 
-    def add_propietario(self, vehiculo_id: int, persona_id: int) -> Vehiculo:
-        vehiculo = self._get_model(vehiculo_id)
-        persona = self._session.get(PersonaDB, persona_id)
-        if not persona:
-            raise ValueError("Persona no encontrada.")
-        if persona in vehiculo.propietarios:
+    def add_propietario(self, vehiculo_id: int, persona_id: int) -> VehiculoDetalle:
+        vehiculo = self.get_detailed(vehiculo_id)
+        if not vehiculo:
+            raise EntidadNoEncontrada("Vehículo no encontrado.")
+        if any(persona.id == persona_id for persona in vehiculo.propietarios):
             raise ValueError("El propietario ya está asociado al vehículo.")
-        vehiculo.propietarios.append(persona)
-        self._session.commit()
-        self._session.refresh(vehiculo)
-        return _to_domain_vehiculo(vehiculo)
-
-    def set_propietarios(self, vehiculo_id: int, propietarios_ids: List[int]) -> Vehiculo:
-        vehiculo = self._get_model(vehiculo_id)
-        propietarios = (
-            self._session.query(PersonaDB)
-            .filter(PersonaDB.id.in_(propietarios_ids))
-            .all()
+        persona = self._session.execute(
+            _incrementar(PersonaDB, persona_id).returning(
+                PersonaDB.id, PersonaDB.nombre, PersonaDB.cedula, PersonaDB.version
+            )
+        ).one_or_none()
+        if persona is None:
+            self._session.rollback()
+            raise EntidadNoEncontrada("Persona no encontrada.")
+        self._session.execute(
+            insert(vehiculo_propietario).values(vehiculo_id=vehiculo_id, persona_id=persona_id)
+        )
+        self._session.execute(
+            _update_versionado(
+                VehiculoDB,
+                vehiculo_id,
+                {"propietario_count": VehiculoDB.propietario_count + 1},
+            )
         )
-        if len(propietarios) != len(propietarios_ids):
-            raise ValueError("Alguno de los propietarios no existe.")
-        vehiculo.propietarios = propietarios
         self._session.commit()
-        self._session.refresh(vehiculo)
-        return _to_domain_vehiculo(vehiculo)
-
-    def _get_model(self, vehiculo_id: int) -> VehiculoDB:
-        """Obtiene un modelo VehiculoDB o lanza una excepción si no existe."""
-        vehiculo = self._session.get(VehiculoDB, vehiculo_id)
-        if not vehiculo:
-            raise ValueError("Vehículo no encontrado.")
+        vehiculo.propietarios.append(
+            Persona(
+                id=persona.id, nombre=persona.nombre, cedula=persona.cedula, version=persona.version
+            )
+        )
+        vehiculo.version += 1
+        vehiculo.propietario_count += 1
         return vehiculo
 
+    def _reemplazar_propietarios(self, vehiculo_id: int, propietarios_ids: List[int]) -> None:
+        """Reescribe la tabla de asociación y los contadores; confirma quien llama."""
+        anteriores = self._session.scalars(
+            delete(vehiculo_propietario)
+            .where(vehiculo_propietario.c.vehiculo_id == vehiculo_id)
+            .returning(vehiculo_propietario.c.persona_id)
+        ).all()
+        if propietarios_ids:
+            self._session.execute(
+                insert(vehiculo_propietario),
+                [{"vehiculo_id": vehiculo_id, "persona_id": p} for p in propietarios_ids],
+            )
+        _ajustar(self._session, PersonaDB, _deltas(propietarios_ids, anteriores))
+
+    def _marcas_cambiadas(self, marcas_ids: Iterable[int]) -> None:
+        if self._al_cambiar_marcas is not None:
+            self._al_cambiar_marcas(marcas_ids)
+
+    def _detailed_query(self) -> Query:
+        """Consulta base que carga la marca por JOIN y los propietarios con SELECT ... IN."""
+        return self._session.query(VehiculoDB).options(
+            joinedload(VehiculoDB.marca),
+            selectinload(VehiculoDB.propietarios),
+        )
@@ -0,0 +1,181 @@
+"""
+Estado de la base de datos para la sonda de disponibilidad (``/readyz``).
+
+``MonitorSalud`` comprueba la conexión en segundo plano cada
+``HEALTH_CHECK_INTERVAL`` segundos y guarda el resultado en memoria: las sondas
+leen ese resultado sin abrir conexiones, así que su frecuencia no afecta al pool.
+La saturación del pool se calcula en cada comprobación; con el pool saturado no
+se pide una conexión (esperaría ``pool_timeout``) y el proceso se declara no
+disponible hasta que se libere.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .pool import estadisticas_pool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EstadoSalud:
+    """Resultado de la última comprobación; ``comprobado`` es ``time.monotonic()``."""
+
+    conectada: bool = False
+    latencia_ms: Optional[float] = None
+    error: Optional[str] = "Sin comprobar todavía"
+    comprobado: Optional[float] = None
+    pool: Dict[str, Any] = field(default_factory=dict)
+    saturado: bool = False
+
+
+class MonitorSalud:
+    """Refresca periódicamente ``estado`` con ``SELECT 1`` y la ocupación del pool."""
+
+    def __init__(
+        self,
+        engine: Union[Engine, AsyncEngine],
+        intervalo: float = 5.0,
+        timeout: float = 2.0,
+        umbral_saturacion: float = 1.0,
+    ) -> None:
+        self.engine = engine
+        self.intervalo = intervalo
+        self.timeout = timeout
+        self.umbral_saturacion = umbral_saturacion
+        self.estado = EstadoSalud()
+        self._timeouts_previos: Optional[int] = None
+        self._tarea: Optional[asyncio.Task] = None
+
+    @property
+    def _motor_sincrono(self) -> Engine:
+        return getattr(self.engine, "sync_engine", self.engine)
+
+    def _ocupacion_pool(self) -> Dict[str, Any]:
+        stats = estadisticas_pool(self._motor_sincrono)
+        pool: Dict[str, Any] = {"pool": stats["pool"]}
+        if "size" in stats:
+            capacidad = stats["size"] + max(stats["max_overflow"], 0)
+            pool.update(
+                in_use=stats["checked_out"],
+                capacity=capacidad,
+                saturation=round(stats["checked_out"] / capacidad, 3) if capacidad else 0.0,
+            )
+        if "timeouts" in stats:
+            # Esperas agotadas desde la comprobación anterior: hubo peticiones sin conexión
+            previos = self._timeouts_previos
+            self._timeouts_previos = stats["timeouts"]
+            pool["recent_timeouts"] = stats["timeouts"] - previos if previos is not None else 0
+        return pool
+
+    def _saturado(self, pool: Dict[str, Any]) -> bool:
+        return (
+            pool.get("saturation", 0.0) >= self.umbral_saturacion
+            or pool.get("recent_timeouts", 0) > 0
+        )
+
+    async def _select_1(self) -> None:
+        if isinstance(self.engine, AsyncEngine):
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return
+
+        def select_1() -> None:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        await asyncio.to_thread(select_1)
+
+    async def refrescar(self) -> EstadoSalud:
+        """Una comprobación; nunca lanza, el error queda en el estado."""
+        pool = self._ocupacion_pool()
+        saturado = self._saturado(pool)
+        anterior = self.estado
+        if saturado:
+            # Pedir otra conexión solo añadiría una espera: se conserva el último resultado
+            estado = EstadoSalud(
+                conectada=anterior.conectada,
+                latencia_ms=anterior.latencia_ms,
+                error=anterior.error,
+                comprobado=anterior.comprobado,
+            )
+        else:
+            inicio = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._select_1(), self.timeout)
+            except Exception as e:
+                # La respuesta solo lleva el tipo: el mensaje del driver incluye host y usuario
+                estado = EstadoSalud(error=type(e).__name__)
+                if anterior.conectada or anterior.comprobado is None:
+                    logger.warning(
+                        "Base de datos no disponible: %s",
+                        str(e) or f"sin respuesta en {self.timeout:g} s",
+                    )
+            else:
+                estado = EstadoSalud(
+                    conectada=True,
+                    latencia_ms=round((time.perf_counter() - inicio) * 1000, 2),
+                    error=None,
+                )
+            estado.comprobado = time.monotonic()
+        estado.pool, estado.saturado = pool, saturado
+        self.estado = estado
+        return estado
+
+    def motivos(self) -> List[str]:
+        """Por qué el proceso no debe recibir tráfico; vacío si está disponible."""
+        estado = self.estado
+        motivos = []
+        if estado.comprobado is None:
+            motivos.append("La base de datos no se ha comprobado todavía")
+        elif time.monotonic() - estado.comprobado > 3 * self.intervalo:
+            motivos.append("La última comprobación de la base de datos es demasiado antigua")
+        if not estado.conectada and estado.comprobado is not None:
+            motivos.append(f"Sin conexión con la base de datos: {estado.error}")
+        if estado.saturado:
+            motivos.append("Pool de conexiones saturado")
+        return motivos
+
+    def informe(self) -> Dict[str, Any]:
+        estado = self.estado
+        motivos = self.motivos()
+        return {
+            "status": "not_ready" if motivos else "ready",
+            "reasons": motivos,
+            "database": {
+                "connected": estado.conectada,
+                "latency_ms": estado.latencia_ms,
+                "error": estado.error,
+                "checked_seconds_ago": (
+                    round(time.monotonic() - estado.comprobado, 3)
+                    if estado.comprobado is not None
+                    else None
+                ),
+            },
+            "pool": {**estado.pool, "saturated": estado.saturado},
+        }
+
+    async def _bucle(self) -> None:
+        while True:
+            await self.refrescar()
+            await asyncio.sleep(self.intervalo)
+
+    def iniciar(self) -> None:
+        """Lanza la comprobación periódica en el bucle de eventos en curso."""
+        if self._tarea is None or self._tarea.done():
+            self._tarea = asyncio.get_running_loop().create_task(self._bucle())
+
+    async def detener(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._tarea
+            self._tarea = None
@@ -0,0 +1,89 @@
+"""
+Migraciones del esquema con Alembic.
+
+El esquema se crea y evoluciona con las revisiones de ``migrations/versions``
+(``alembic upgrade head`` / ``alembic downgrade -1``); la aplicación solo comprueba
+al arrancar que la base de datos esté en la última revisión.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from alembic import command, op
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Connection
+
+RAIZ_PROYECTO = Path(__file__).resolve().parents[3]
+
+# Tablas que no declaran los modelos: el índice FTS5 de personas y sus tablas internas
+_TABLAS_EXTERNAS = ("personas_fts",)
+
+
+def alembic_config(database_url: Optional[str] = None) -> Config:
+    """Configuración de Alembic del proyecto, independiente del directorio actual."""
+    config = Config(str(RAIZ_PROYECTO / "alembic.ini"))
+    config.set_main_option("script_location", str(RAIZ_PROYECTO / "migrations"))
+    # Desde código se respeta el logging de la aplicación en lugar del de alembic.ini
+    config.attributes["configure_logger"] = False
+    if database_url is not None:
+        config.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+    return config
+
+
+def upgrade(database_url: Optional[str] = None, revision: str = "head") -> None:
+    command.upgrade(alembic_config(database_url), revision)
+
+
+def downgrade(database_url: Optional[str], revision: str) -> None:
+    command.downgrade(alembic_config(database_url), revision)
+
+
+def esquema_actualizado(connection: Connection) -> bool:
+    """Indica si la base de datos está en la última revisión (una sola consulta)."""
+    actuales = set(MigrationContext.configure(connection).get_current_heads())
+    return actuales == set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+
+def filtro_autogenerate(dialecto: str) -> Callable[..., bool]:
+    """``include_object`` para comparar la base de datos con los modelos.
+
+    Excluye las tablas creadas con SQL directo y los índices que los modelos solo
+    declaran para otro motor (``Index.ddl_if``).
+    """
+
+    def incluir(objeto, nombre: Optional[str], tipo: str, reflejado: bool, comparado) -> bool:
+        if tipo == "table" and nombre is not None:
+            return not nombre.startswith(_TABLAS_EXTERNAS)
+        if tipo == "index" and not reflejado:
+            condicion = getattr(objeto, "_ddl_if", None)
+            return condicion is None or condicion.dialect in (None, dialecto)
+        return True
+
+    return incluir
+
+
+def crear_indice(nombre: str, tabla: str, columnas: Sequence[str], **kwargs) -> None:
+    """``CREATE INDEX`` idempotente; en PostgreSQL, ``CONCURRENTLY`` para no bloquear escrituras.
+
+    ``CONCURRENTLY`` no puede ejecutarse dentro de una transacción, por lo que se
+    abre un bloque en autocommit. Si una creación concurrente falla deja un índice
+    ``INVALID`` que hay que eliminar antes de reintentar.
+    """
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                nombre, tabla, columnas, if_not_exists=True, postgresql_concurrently=True, **kwargs
+            )
+    else:
+        op.create_index(nombre, tabla, columnas, if_not_exists=True, **kwargs)
+
+
+def eliminar_indice(nombre: str, tabla: str) -> None:
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(nombre, table_name=tabla, if_exists=True, postgresql_concurrently=True)
+    else:
+        op.drop_index(nombre, table_name=tabla, if_exists=True)
@@ -2,16 +2,26 @@ from __future__ import annotations
 
 import logging
 from contextlib import contextmanager
-from typing import Dict, Generator, Iterator
+from functools import lru_cache
+from typing import AsyncGenerator, Dict, Generator, Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import get_settings
+from app.infrastructure.metricas import instrumentar_motor
+
+from .pool import opciones_pool
+from .replicas import EnrutadorReplicas, SesionEnrutada
+from .salud import MonitorSalud
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
+
+# Los motores se crean en el primer uso (get_engine, get_async_engine): importar este
+# módulo no carga el driver ni lee la configuración, y un proceso que no toca la base
+# de datos no paga su coste de arranque.
 
 
 def _build_engine(database_url: str):
@@ -27,27 +37,111 @@ def _build_engine(database_url: str):
         # Ya está correctamente configurado con psycopg2
         pass
     
-    return create_engine(
-        database_url,
-        connect_args=connect_args,
-        future=True,
-        echo=False,
-        pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10,
+    opciones = opciones_pool(database_url, get_settings())
+    connect_args.update(opciones.pop("connect_args", {}))
+    return instrumentar_motor(
+        create_engine(
+            database_url,
+            connect_args=connect_args,
+            future=True,
+            echo=False,
+            **opciones,
+        )
+    )
+
+
+def _build_async_engine(database_url: str) -> AsyncEngine:
+    """Construye el motor asíncrono usando asyncpg (PostgreSQL) o aiosqlite (SQLite)."""
+    if database_url.startswith("sqlite") and "+aiosqlite" not in database_url:
+        database_url = database_url.replace("sqlite", "sqlite+aiosqlite", 1)
+    elif database_url.startswith("postgresql") and "+asyncpg" not in database_url:
+        _, rest = database_url.split("://", 1)
+        database_url = f"postgresql+asyncpg://{rest}"
+
+    async_engine = create_async_engine(
+        database_url, echo=False, **opciones_pool(database_url, get_settings(), asincrono=True)
     )
+    instrumentar_motor(async_engine.sync_engine)
+    return async_engine
 
 
-engine = _build_engine(settings.database_url)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+@lru_cache
+def get_engine() -> Engine:
+    """Motor de la base de datos principal, creado en el primer uso."""
+    return _build_engine(get_settings().database_url)
+
+
+@lru_cache
+def get_sessionmaker() -> sessionmaker[Session]:
+    return sessionmaker(
+        bind=get_engine(), class_=SesionEnrutada, autocommit=False, autoflush=False, future=True
+    )
+
+
+@lru_cache
+def get_enrutador() -> EnrutadorReplicas[Engine]:
+    """Réplicas de lectura de ``DB_REPLICA_URLS`` (ninguna: todo va a la primaria)."""
+    settings = get_settings()
+    return EnrutadorReplicas(
+        [_build_engine(url) for url in settings.db_replica_urls],
+        settings.db_replica_strategy,
+        settings.db_replica_eject_seconds,
+    )
 
 
 def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    with get_enrutador().motor_lectura() as replica:
+        db = get_sessionmaker()()
+        db.replica = replica
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """Crea bajo demanda el motor asíncrono; solo se usa con ``DB_ASYNC`` activo."""
+    return _build_async_engine(get_settings().async_database_url)
+
+
+@lru_cache
+def get_async_enrutador() -> EnrutadorReplicas[AsyncEngine]:
+    settings = get_settings()
+    return EnrutadorReplicas(
+        [_build_async_engine(url) for url in settings.db_replica_urls],
+        settings.db_replica_strategy,
+        settings.db_replica_eject_seconds,
+    )
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        sync_session_class=SesionEnrutada,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    with get_async_enrutador().motor_lectura() as replica:
+        async with get_async_sessionmaker()() as db:
+            db.sync_session.replica = replica.sync_engine if replica is not None else None
+            yield db
+
+
+@lru_cache
+def get_monitor_salud() -> MonitorSalud:
+    """Monitor de la base de datos de ``/readyz`` sobre el motor de la pila activa."""
+    settings = get_settings()
+    return MonitorSalud(
+        get_async_engine() if settings.db_async else get_engine(),
+        intervalo=settings.health_check_interval,
+        timeout=settings.health_check_timeout,
+        umbral_saturacion=settings.health_pool_saturation,
+    )
 
 
 @contextmanager
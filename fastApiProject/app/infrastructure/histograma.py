@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Sequence, Tuple
+
+# Límites (segundos) para latencias de peticiones, consultas y esperas del pool
+LIMITES_LATENCIA: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histograma:
+    """Histograma de intervalos fijos, seguro entre hilos.
+
+    Los contadores se reservan al crearlo: observar un valor solo incrementa uno de
+    ellos, sin asignar memoria.
+    """
+
+    def __init__(self, limites: Sequence[float] = LIMITES_LATENCIA) -> None:
+        self.limites: Tuple[float, ...] = tuple(sorted(limites))
+        self._conteos = [0] * (len(self.limites) + 1)
+        self._suma = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, valor: float) -> None:
+        indice = bisect_left(self.limites, valor)
+        with self._lock:
+            self._conteos[indice] += 1
+            self._suma += valor
+
+    def snapshot(self) -> Tuple[Tuple[int, ...], int, float]:
+        """Conteos acumulados por límite (el último es ``+Inf``), total y suma."""
+        with self._lock:
+            conteos, suma = list(self._conteos), self._suma
+        acumulados = []
+        total = 0
+        for conteo in conteos:
+            total += conteo
+            acumulados.append(total)
+        return tuple(acumulados), total, suma
+
+    def stats(self) -> Dict[str, object]:
+        acumulados, total, suma = self.snapshot()
+        buckets = {str(limite): n for limite, n in zip(self.limites, acumulados)}
+        buckets["+Inf"] = total
+        return {"buckets": buckets, "count": total, "sum": round(suma, 6)}
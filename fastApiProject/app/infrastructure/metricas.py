@@ -0,0 +1,158 @@
+"""
+Métricas del proceso en formato de texto de Prometheus (``GET /metrics``).
+
+Peticiones por ruta (plantilla, no la URL concreta), peticiones en curso y
+sentencias SQL por tipo, medidas con los eventos ``before_cursor_execute`` /
+``after_cursor_execute`` del motor, que también acumulan el consumo de la petición
+en curso (``consumo_bd``). Los histogramas tienen intervalos fijos y se
+crean una vez por serie; medir una petición o una sentencia solo incrementa
+contadores.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Engine, event
+
+from app.infrastructure.histograma import Histograma
+
+TIPOS_SENTENCIA: Tuple[str, ...] = ("select", "insert", "update", "delete", "other")
+_TIPOS_POR_PREFIJO = {tipo.upper(): tipo for tipo in TIPOS_SENTENCIA[:-1]}
+
+_INICIO_SENTENCIA = "_metricas_inicio"
+_SENTENCIA_CONTADA = "_metricas_contada"
+
+
+class RegistroMetricas:
+    """Contadores e histogramas de un proceso, seguros entre hilos."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._peticiones: Dict[Tuple[str, str, int], int] = {}
+        self._latencias: Dict[Tuple[str, str], Histograma] = {}
+        self._en_curso = 0
+        self._sentencias: Dict[str, Histograma] = {tipo: Histograma() for tipo in TIPOS_SENTENCIA}
+
+    def inicio_peticion(self) -> None:
+        with self._lock:
+            self._en_curso += 1
+
+    def fin_peticion(self, metodo: str, ruta: str, estado: int, duracion: float) -> None:
+        serie = (metodo, ruta)
+        with self._lock:
+            self._en_curso -= 1
+            clave = (metodo, ruta, estado)
+            self._peticiones[clave] = self._peticiones.get(clave, 0) + 1
+            histograma = self._latencias.get(serie)
+            if histograma is None:
+                histograma = self._latencias[serie] = Histograma()
+        histograma.observe(duracion)
+
+    def sentencia(self, tipo: str, duracion: float) -> None:
+        self._sentencias[tipo].observe(duracion)
+
+    def render(self) -> str:
+        """Exposición en el formato de texto 0.0.4 de Prometheus."""
+        with self._lock:
+            peticiones = sorted(self._peticiones.items())
+            latencias = sorted(self._latencias.items())
+            en_curso = self._en_curso
+
+        lineas: List[str] = [
+            "# HELP http_requests_total Peticiones HTTP atendidas.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (metodo, ruta, estado), total in peticiones:
+            etiquetas = f'method="{metodo}",route="{_escapar(ruta)}",status="{estado}"'
+            lineas.append(f"http_requests_total{{{etiquetas}}} {total}")
+
+        lineas += [
+            "# HELP http_request_duration_seconds Duración de las peticiones HTTP.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (metodo, ruta), histograma in latencias:
+            etiquetas = f'method="{metodo}",route="{_escapar(ruta)}"'
+            _render_histograma(lineas, "http_request_duration_seconds", etiquetas, histograma)
+
+        lineas += [
+            "# HELP http_requests_in_progress Peticiones HTTP en curso.",
+            "# TYPE http_requests_in_progress gauge",
+            f"http_requests_in_progress {en_curso}",
+            "# HELP db_statement_duration_seconds Duración de las sentencias SQL por tipo.",
+            "# TYPE db_statement_duration_seconds histogram",
+        ]
+        for tipo, histograma in self._sentencias.items():
+            _render_histograma(lineas, "db_statement_duration_seconds", f'type="{tipo}"', histograma)
+        return "\n".join(lineas) + "\n"
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _render_histograma(
+    lineas: List[str], nombre: str, etiquetas: str, histograma: Histograma
+) -> None:
+    acumulados, total, suma = histograma.snapshot()
+    for limite, conteo in zip(histograma.limites, acumulados):
+        lineas.append(f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {conteo}')
+    lineas.append(f'{nombre}_bucket{{{etiquetas},le="+Inf"}} {total}')
+    lineas.append(f"{nombre}_sum{{{etiquetas}}} {suma}")
+    lineas.append(f"{nombre}_count{{{etiquetas}}} {total}")
+
+
+@lru_cache
+def get_metricas() -> RegistroMetricas:
+    """Registro de métricas compartido por todas las peticiones del proceso."""
+    return RegistroMetricas()
+
+
+def tipo_sentencia(statement: str) -> str:
+    return _TIPOS_POR_PREFIJO.get(statement[:6].upper(), "other")
+
+
+class ConsumoBD:
+    """Sentencias y tiempo de base de datos acumulados por una petición."""
+
+    __slots__ = ("consultas", "segundos")
+
+    def __init__(self) -> None:
+        self.consultas = 0
+        self.segundos = 0.0
+
+
+# Consumo de la petición en curso; las rutas síncronas lo heredan en el hilo que las ejecuta
+consumo_bd: ContextVar[Optional[ConsumoBD]] = ContextVar("consumo_bd", default=None)
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany) -> None:
+    # El inicio se guarda en el contexto de ejecución, que se descarta con la sentencia
+    if context is not None:
+        setattr(context, _INICIO_SENTENCIA, time.perf_counter())
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany) -> None:
+    inicio = getattr(context, _INICIO_SENTENCIA, None)
+    if inicio is None:
+        return
+    duracion = time.perf_counter() - inicio
+    get_metricas().sentencia(tipo_sentencia(statement), duracion)
+    consumo = consumo_bd.get()
+    if consumo is not None:
+        consumo.segundos += duracion
+        # Un executemany que el driver parte en varios lotes cuenta como una sentencia
+        if not getattr(context, _SENTENCIA_CONTADA, False):
+            setattr(context, _SENTENCIA_CONTADA, True)
+            consumo.consultas += 1
+
+
+def instrumentar_motor(engine: Engine) -> Engine:
+    """Registra en ``engine`` (o ``AsyncEngine.sync_engine``) la medición de sentencias."""
+    if not event.contains(engine, "before_cursor_execute", _antes_de_ejecutar):
+        event.listen(engine, "before_cursor_execute", _antes_de_ejecutar)
+        event.listen(engine, "after_cursor_execute", _despues_de_ejecutar)
+    return engine
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 try:  # pragma: no cover - compatibility with Pydantic v1/v2
     from pydantic import ConfigDict
@@ -18,6 +18,13 @@ class ORMBaseModel(BaseModel):
             orm_mode = True
 
 
+MAX_LOTE = 10_000
+
+OrdenVehiculos = Literal[
+    "id", "-id", "modelo", "-modelo", "color", "-color", "numero_puertas", "-numero_puertas"
+]
+
+
 class MarcaBase(ORMBaseModel):
     nombre_marca: str = Field(..., min_length=1, max_length=100)
     pais: str = Field(..., min_length=1, max_length=100)
@@ -32,10 +39,16 @@ class MarcaUpdate(ORMBaseModel):
     pais: Optional[str] = Field(None, min_length=1, max_length=100)
 
 
-class MarcaRead(MarcaBase):
+class MarcaResumenRead(MarcaBase):
+    """Marca anidada en otras representaciones, sin sus contadores."""
+
     id: int
 
 
+class MarcaRead(MarcaResumenRead):
+    vehiculo_count: int = 0
+
+
 class PersonaBase(ORMBaseModel):
     nombre: str = Field(..., min_length=1, max_length=120)
     cedula: str = Field(..., min_length=5, max_length=50)
@@ -50,10 +63,16 @@ class PersonaUpdate(ORMBaseModel):
     cedula: Optional[str] = Field(None, min_length=5, max_length=50)
 
 
-class PersonaRead(PersonaBase):
+class PersonaResumenRead(PersonaBase):
+    """Persona anidada como propietaria de un vehículo, sin sus contadores."""
+
     id: int
 
 
+class PersonaRead(PersonaResumenRead):
+    vehiculo_count: int = 0
+
+
 class VehiculoBase(ORMBaseModel):
     modelo: str = Field(..., min_length=1, max_length=120)
     marca_id: int
@@ -65,6 +84,28 @@ class VehiculoCreate(VehiculoBase):
     pass
 
 
+class VehiculoImport(VehiculoBase):
+    """Vehículo de un archivo de carga masiva: la marca puede venir por nombre."""
+
+    marca_id: Optional[int] = None
+    nombre_marca: Optional[str] = Field(None, min_length=1, max_length=100)
+    propietarios_cedulas: List[str] = Field(default_factory=list)
+
+    @field_validator("propietarios_cedulas", mode="before")
+    @classmethod
+    def _separar_cedulas(cls, valor):
+        # En CSV las cédulas llegan en una sola columna separadas por ";"
+        if isinstance(valor, str):
+            return [cedula.strip() for cedula in valor.split(";") if cedula.strip()]
+        return valor
+
+    @model_validator(mode="after")
+    def _requiere_marca(self) -> "VehiculoImport":
+        if self.marca_id is None and self.nombre_marca is None:
+            raise ValueError("Se requiere marca_id o nombre_marca.")
+        return self
+
+
 class VehiculoUpdate(ORMBaseModel):
     modelo: Optional[str] = Field(None, min_length=1, max_length=120)
     marca_id: Optional[int] = None
@@ -75,8 +116,9 @@ class VehiculoUpdate(ORMBaseModel):
 
 class VehiculoRead(VehiculoBase):
     id: int
-    marca: MarcaRead
-    propietarios: List[PersonaRead] = Field(default_factory=list)
+    marca: MarcaResumenRead
+    propietarios: List[PersonaResumenRead] = Field(default_factory=list)
+    propietario_count: int = 0
 
 
 class PersonaWithVehiculos(PersonaRead):
@@ -90,3 +132,34 @@ class VehiculoWithPropietarios(VehiculoRead):
 class PropietarioAsignacion(ORMBaseModel):
     persona_id: int
 
+
+class ErrorLoteRead(ORMBaseModel):
+    indice: int
+    detalle: str
+
+
+class MarcaLoteRead(ORMBaseModel):
+    creados: List[MarcaRead] = Field(default_factory=list)
+    errores: List[ErrorLoteRead] = Field(default_factory=list)
+
+
+class PersonaLoteRead(ORMBaseModel):
+    creados: List[PersonaRead] = Field(default_factory=list)
+    errores: List[ErrorLoteRead] = Field(default_factory=list)
+
+
+class VehiculoLoteRead(ORMBaseModel):
+    creados: List[VehiculoRead] = Field(default_factory=list)
+    errores: List[ErrorLoteRead] = Field(default_factory=list)
+
+
+class ConteoRead(ORMBaseModel):
+    valor: Union[str, int]
+    total: int
+
+
+class ConteoPorMarcaRead(ORMBaseModel):
+    marca_id: int
+    nombre_marca: str
+    pais: str
+    total: int
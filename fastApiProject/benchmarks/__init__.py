@@ -0,0 +1 @@
+"""Micro-benchmarks de la API; se ejecutan como módulos (``python -m benchmarks.<nombre>``)."""
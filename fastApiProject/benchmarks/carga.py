@@ -0,0 +1,311 @@
+"""Prueba de carga reproducible de los endpoints de lectura y escritura.
+
+Uso (desde ``fastApiProject/``)::
+
+    # En proceso (ASGI, sin red) sobre un SQLite generado al vuelo
+    python -m benchmarks.carga --vehiculos 50000 --concurrencia 8 --peticiones 400
+
+    # Por HTTP contra un servidor ya levantado y poblado con benchmarks.datos
+    python -m benchmarks.carga --url http://localhost:8000 --concurrencia 32
+
+    # Guardar la línea base y compararla en ejecuciones posteriores
+    python -m benchmarks.carga --guardar-base benchmarks/base.json
+    python -m benchmarks.carga --base benchmarks/base.json --tolerancia 0.25
+
+Cada escenario se ejecuta con ``--concurrencia`` clientes simultáneos y reporta
+p50/p95/p99 de latencia, peticiones por segundo y sentencias SQL por petición
+(cabecera ``X-DB-Queries``). Las URLs se generan con ``--semilla``, así que dos
+ejecuciones con los mismos argumentos piden exactamente lo mismo. Con ``--base``
+el proceso termina con código 1 si algún escenario empeora más que la tolerancia.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from sqlalchemy import Engine, func, inspect, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import get_settings
+from app.infrastructure.db.models import MarcaVehiculoDB, PersonaDB, VehiculoDB
+from app.infrastructure.db.session import _build_async_engine, _build_engine, get_async_db, get_db
+from app.infrastructure.metricas import instrumentar_motor
+
+from .datos import REPARTO_REALISTA, contar_vehiculos, parse_reparto, poblar
+
+# (nombre, método, generador de la ruta y el cuerpo a partir de los máximos ids)
+Escenario = Tuple[str, str, Callable[[random.Random, Dict[str, int]], Tuple[str, Optional[dict]]]]
+
+ESCENARIOS: List[Escenario] = [
+    ("marcas", "GET", lambda r, n: ("/api/marcas/?limit=50", None)),
+    ("marca", "GET", lambda r, n: (f"/api/marcas/{r.randint(1, n['marcas'])}", None)),
+    ("personas", "GET", lambda r, n: ("/api/personas/?limit=50", None)),
+    ("persona", "GET", lambda r, n: (f"/api/personas/{r.randint(1, n['personas'])}", None)),
+    (
+        "vehiculos de persona",
+        "GET",
+        lambda r, n: (f"/api/personas/{r.randint(1, n['personas'])}/vehiculos/?limit=20", None),
+    ),
+    ("vehiculos", "GET", lambda r, n: ("/api/vehiculos/?limit=50", None)),
+    (
+        "vehiculos filtrados",
+        "GET",
+        lambda r, n: (
+            f"/api/vehiculos/?marca_id={r.randint(1, n['marcas'])}&color=Verde&limit=50",
+            None,
+        ),
+    ),
+    ("vehiculo", "GET", lambda r, n: (f"/api/vehiculos/{r.randint(1, n['vehiculos'])}", None)),
+    ("stats por marca", "GET", lambda r, n: ("/api/stats/vehiculos/por-marca", None)),
+    (
+        "crear vehiculo",
+        "POST",
+        lambda r, n: (
+            "/api/vehiculos/",
+            {
+                "modelo": f"Carga {r.randrange(10**6)}",
+                "marca_id": r.randint(1, n["marcas"]),
+                "numero_puertas": 4,
+                "color": "Rojo",
+            },
+        ),
+    ),
+]
+
+
+@dataclass
+class Resultado:
+    peticiones: int
+    errores: int
+    req_s: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    consultas_por_peticion: float
+
+
+def _percentiles(latencias: List[float]) -> Tuple[float, float, float]:
+    if len(latencias) < 2:
+        valor = latencias[0] if latencias else 0.0
+        return valor, valor, valor
+    cortes = statistics.quantiles(latencias, n=100, method="inclusive")
+    return cortes[49], cortes[94], cortes[98]
+
+
+async def _ejecutar(
+    cliente: httpx.AsyncClient,
+    peticiones: List[Tuple[str, str, Optional[dict]]],
+    concurrencia: int,
+) -> Resultado:
+    pendientes = iter(peticiones)
+    latencias: List[float] = []
+    consultas: List[int] = []
+    errores = 0
+
+    async def trabajador() -> None:
+        nonlocal errores
+        for metodo, ruta, cuerpo in pendientes:
+            inicio = time.perf_counter()
+            response = await cliente.request(metodo, ruta, json=cuerpo)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if response.status_code >= 400:
+                errores += 1
+            if "X-DB-Queries" in response.headers:
+                consultas.append(int(response.headers["X-DB-Queries"]))
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+    duracion = time.perf_counter() - inicio
+    p50, p95, p99 = _percentiles(latencias)
+    return Resultado(
+        peticiones=len(latencias),
+        errores=errores,
+        req_s=len(latencias) / duracion if duracion else 0.0,
+        p50_ms=p50,
+        p95_ms=p95,
+        p99_ms=p99,
+        consultas_por_peticion=statistics.fmean(consultas) if consultas else 0.0,
+    )
+
+
+async def medir(
+    cliente: httpx.AsyncClient,
+    maximos: Dict[str, int],
+    peticiones: int,
+    concurrencia: int,
+    semilla: int = 0,
+    calentamiento: int = 10,
+) -> Dict[str, Resultado]:
+    """Ejecuta cada escenario por separado, tras unas peticiones de calentamiento."""
+    resultados = {}
+    for nombre, metodo, generar in ESCENARIOS:
+        rnd = random.Random(f"{semilla}:{nombre}")
+        lote = [(metodo, *generar(rnd, maximos)) for _ in range(calentamiento + peticiones)]
+        await _ejecutar(cliente, lote[:calentamiento], concurrencia)
+        resultados[nombre] = await _ejecutar(cliente, lote[calentamiento:], concurrencia)
+    return resultados
+
+
+def maximos_ids(engine: Engine) -> Dict[str, int]:
+    with engine.connect() as conn:
+        return {
+            clave: conn.scalar(select(func.max(model.id))) or 1
+            for clave, model in (
+                ("marcas", MarcaVehiculoDB),
+                ("personas", PersonaDB),
+                ("vehiculos", VehiculoDB),
+            )
+        }
+
+
+def cliente_en_proceso(
+    engine: Engine, database_url: str
+) -> Tuple[httpx.AsyncClient, Callable[[], None]]:
+    """Cliente ASGI sobre la aplicación de ``main`` usando ``engine``; devuelve cómo restaurarla.
+
+    Con ``DB_ASYNC`` activo la aplicación monta las rutas asíncronas, que usan un
+    ``AsyncEngine`` sobre la misma URL.
+    """
+    from main import app
+
+    instrumentar_motor(engine)
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+
+    def get_db_benchmark():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    anteriores = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = get_db_benchmark
+    if get_settings().db_async:
+        AsyncSessionLocal = async_sessionmaker(
+            bind=_build_async_engine(database_url), autoflush=False, expire_on_commit=False
+        )
+
+        async def get_async_db_benchmark():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = get_async_db_benchmark
+
+    def restaurar() -> None:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(anteriores)
+
+    transporte = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transporte, base_url="http://benchmark"), restaurar
+
+
+def comparar(
+    resultados: Dict[str, Resultado], base: Dict[str, dict], tolerancia: float
+) -> List[str]:
+    """Regresiones frente a la línea base: latencia p95, rendimiento o más consultas."""
+    regresiones = []
+    for nombre, actual in resultados.items():
+        anterior = base.get(nombre)
+        if anterior is None:
+            continue
+        if actual.p95_ms > anterior["p95_ms"] * (1 + tolerancia):
+            regresiones.append(f"{nombre}: p95 {anterior['p95_ms']:.1f} -> {actual.p95_ms:.1f} ms")
+        if actual.req_s < anterior["req_s"] * (1 - tolerancia):
+            regresiones.append(f"{nombre}: {anterior['req_s']:.0f} -> {actual.req_s:.0f} req/s")
+        if actual.consultas_por_peticion > anterior["consultas_por_peticion"]:
+            regresiones.append(
+                f"{nombre}: {anterior['consultas_por_peticion']:.1f} -> "
+                f"{actual.consultas_por_peticion:.1f} consultas/petición"
+            )
+    return regresiones
+
+
+def imprimir(resultados: Dict[str, Resultado]) -> None:
+    print(
+        f"{'escenario':<22} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        f" {'SQL/pet':>8} {'errores':>8}"
+    )
+    for nombre, r in resultados.items():
+        print(
+            f"{nombre:<22} {r.req_s:>8.0f} {r.p50_ms:>8.2f} {r.p95_ms:>8.2f} {r.p99_ms:>8.2f}"
+            f" {r.consultas_por_peticion:>8.1f} {r.errores:>8}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite:///benchmark_vehiculos.db")
+    parser.add_argument("--url", default=None, help="Servidor HTTP a medir (por defecto, en proceso)")
+    parser.add_argument("--marcas", type=int, default=1_000)
+    parser.add_argument("--personas", type=int, default=25_000)
+    parser.add_argument("--vehiculos", type=int, default=50_000)
+    parser.add_argument("--reparto", type=parse_reparto, default=list(REPARTO_REALISTA))
+    parser.add_argument("--peticiones", type=int, default=400, help="Por escenario")
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--base", type=Path, default=None, help="Línea base JSON a comparar")
+    parser.add_argument("--guardar-base", type=Path, default=None)
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    engine = _build_engine(args.database_url)
+    if not inspect(engine).has_table(VehiculoDB.__tablename__) or not contar_vehiculos(engine):
+        print(f"Generando {args.vehiculos} vehículos, {args.personas} personas...")
+        poblar(
+            engine,
+            args.vehiculos,
+            marcas=args.marcas,
+            personas=args.personas,
+            semilla=args.semilla,
+            reparto=args.reparto,
+        )
+    maximos = maximos_ids(engine)
+
+    async def ejecutar() -> Dict[str, Resultado]:
+        if args.url:
+            cliente, restaurar = httpx.AsyncClient(base_url=args.url, timeout=30), lambda: None
+        else:
+            cliente, restaurar = cliente_en_proceso(engine, args.database_url)
+        try:
+            async with cliente:
+                return await medir(
+                    cliente, maximos, args.peticiones, args.concurrencia, args.semilla
+                )
+        finally:
+            restaurar()
+
+    resultados = asyncio.run(ejecutar())
+    engine.dispose()
+    modo = args.url or "en proceso"
+    print(f"{modo}: {args.peticiones} peticiones por escenario, concurrencia {args.concurrencia}")
+    imprimir(resultados)
+
+    if args.guardar_base:
+        args.guardar_base.write_text(
+            json.dumps({n: asdict(r) for n, r in resultados.items()}, indent=2), encoding="utf-8"
+        )
+        print(f"Línea base guardada en {args.guardar_base}")
+    if args.base:
+        regresiones = comparar(
+            resultados, json.loads(args.base.read_text(encoding="utf-8")), args.tolerancia
+        )
+        for regresion in regresiones:
+            print(f"REGRESIÓN {regresion}")
+        if regresiones:
+            return 1
+        print(f"Sin regresiones frente a {args.base} (tolerancia {args.tolerancia:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Generador de datos sintéticos para los benchmarks.
+
+Uso (desde ``fastApiProject/``)::
+
+    python -m benchmarks.datos --marcas 1000 --personas 1000000 --vehiculos 5000000 \\
+        --reparto 0.1,0.6,0.2,0.1 --database-url postgresql+psycopg2://...
+
+Inserta marcas, personas y vehículos por lotes (``COPY`` en PostgreSQL,
+``executemany`` en el resto de motores) con un número de propietarios por vehículo
+tomado de ``reparto`` y al final recalcula los contadores de marcas y personas; es
+determinista para una misma ``semilla``. Se puede ejecutar varias veces sobre la
+misma base: cada ejecución añade filas nuevas.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Iterator, List, Optional, Sequence
+
+from sqlalchemy import Connection, Engine, Table, create_engine, func, select, text
+
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.loader import _Escritor
+from app.infrastructure.db.models import MarcaVehiculoDB, PersonaDB, VehiculoDB, vehiculo_propietario
+from app.infrastructure.db.repositories._contadores import reconciliar_contadores
+
+COLORES = ["Rojo", "Azul", "Verde", "Negro", "Blanco", "Gris", "Plata", "Amarillo"]
+
+# Probabilidad de que un vehículo tenga 0, 1, 2, ... propietarios
+REPARTO_UNO = (0.0, 1.0)
+REPARTO_REALISTA = (0.1, 0.6, 0.2, 0.1)
+
+
+def _lotes(total: int, tamano: int) -> Iterator[range]:
+    for inicio in range(0, total, tamano):
+        yield range(inicio, min(inicio + tamano, total))
+
+
+def _maximo_id(conn: Connection, tabla: Table) -> int:
+    return conn.scalar(select(func.coalesce(func.max(tabla.c.id), 0)))
+
+
+def _sincronizar_secuencia(conn: Connection, tabla: Table) -> None:
+    """Tras insertar ids explícitos, la secuencia de PostgreSQL debe continuar tras el mayor."""
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{tabla.name}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 1) FROM {tabla.name}))"
+            )
+        )
+
+
+def contar_vehiculos(engine: Engine) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(VehiculoDB)) or 0
+
+
+def poblar(
+    engine: Engine,
+    vehiculos: int,
+    marcas: int = 50,
+    personas: int = 0,
+    semilla: int = 0,
+    lote: int = 50_000,
+    reparto: Sequence[float] = REPARTO_UNO,
+) -> None:
+    """Crea las tablas y las llena; ``personas=0`` usa una persona cada 2 vehículos.
+
+    ``reparto[n]`` es la probabilidad de que un vehículo tenga ``n`` propietarios
+    distintos; el valor por defecto da exactamente uno a cada vehículo.
+    """
+    rnd = random.Random(semilla)
+    personas = personas or max(1, vehiculos // 2)
+    cantidades = list(range(len(reparto)))
+    escritor = _Escritor(engine)
+    marcas_t, personas_t, vehiculos_t = (
+        MarcaVehiculoDB.__table__,
+        PersonaDB.__table__,
+        VehiculoDB.__table__,
+    )
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        marca_base = _maximo_id(conn, marcas_t)
+        escritor.insertar(
+            conn,
+            marcas_t,
+            ("id", "nombre_marca", "pais"),
+            [
+                {"id": i, "nombre_marca": f"Marca {i}", "pais": f"País {i % 40}"}
+                for i in range(marca_base + 1, marca_base + marcas + 1)
+            ],
+        )
+        persona_base = _maximo_id(conn, personas_t)
+        for filas in _lotes(personas, lote):
+            escritor.insertar(
+                conn,
+                personas_t,
+                ("id", "nombre", "cedula"),
+                [
+                    {"id": i, "nombre": f"Persona {i}", "cedula": f"{i:010d}"}
+                    for i in (persona_base + f + 1 for f in filas)
+                ],
+            )
+        marca_ids: List[int] = list(range(marca_base + 1, marca_base + marcas + 1))
+        vehiculo_base = _maximo_id(conn, vehiculos_t)
+        for filas in _lotes(vehiculos, lote):
+            nuevos, duenos = [], []
+            for i in filas:
+                vehiculo_id = vehiculo_base + i + 1
+                propietarios = rnd.sample(
+                    range(persona_base + 1, persona_base + personas + 1),
+                    min(rnd.choices(cantidades, reparto)[0], personas),
+                )
+                nuevos.append(
+                    {
+                        "id": vehiculo_id,
+                        "modelo": f"Modelo {rnd.randrange(500)}",
+                        "marca_id": rnd.choice(marca_ids),
+                        "numero_puertas": rnd.randint(2, 5),
+                        "color": rnd.choice(COLORES),
+                        "version": 1,
+                        "propietario_count": len(propietarios),
+                    }
+                )
+                duenos.extend(
+                    {"vehiculo_id": vehiculo_id, "persona_id": persona_id}
+                    for persona_id in propietarios
+                )
+            escritor.insertar(
+                conn,
+                vehiculos_t,
+                (
+                    "id", "modelo", "marca_id", "numero_puertas", "color", "version",
+                    "propietario_count",
+                ),
+                nuevos,
+            )
+            escritor.insertar(conn, vehiculo_propietario, ("vehiculo_id", "persona_id"), duenos)
+        for tabla in (marcas_t, personas_t, vehiculos_t):
+            _sincronizar_secuencia(conn, tabla)
+    reconciliar_contadores(engine, lote=lote)
+
+
+def parse_reparto(valor: str) -> List[float]:
+    """``"0.1,0.6,0.2,0.1"`` -> probabilidades de 0, 1, 2 y 3 propietarios."""
+    reparto = [float(p) for p in valor.split(",")]
+    if not reparto or any(p < 0 for p in reparto) or sum(reparto) <= 0:
+        raise argparse.ArgumentTypeError(f"Reparto inválido: {valor}")
+    return reparto
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite:///benchmark_vehiculos.db")
+    parser.add_argument("--marcas", type=int, default=1_000)
+    parser.add_argument("--personas", type=int, default=100_000)
+    parser.add_argument("--vehiculos", type=int, default=500_000)
+    parser.add_argument(
+        "--reparto",
+        type=parse_reparto,
+        default=list(REPARTO_REALISTA),
+        help="Probabilidades de 0, 1, 2... propietarios por vehículo",
+    )
+    parser.add_argument("--lote", type=int, default=50_000)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    inicio = time.perf_counter()
+    poblar(
+        engine,
+        args.vehiculos,
+        marcas=args.marcas,
+        personas=args.personas,
+        semilla=args.semilla,
+        lote=args.lote,
+        reparto=args.reparto,
+    )
+    duracion = time.perf_counter() - inicio
+    total = args.marcas + args.personas + args.vehiculos
+    print(f"{total} filas principales en {duracion:.1f} s ({total / duracion:,.0f} filas/s)")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Plan de ejecución y latencia de los listados filtrados de vehículos.
+
+Uso (desde ``fastApiProject/``)::
+
+    python -m benchmarks.filtros_vehiculos --filas 200000
+    python -m benchmarks.filtros_vehiculos --database-url postgresql+psycopg2://... --filas 5000000
+
+Genera datos sintéticos si la tabla tiene menos filas de las pedidas, ejecuta
+``ANALYZE`` y, para cada combinación de filtros, muestra el plan de la sentencia
+que emite ``list_detailed`` (y de su variante que solo lee ids, que un índice
+compuesto responde sin tocar la tabla) junto con la mediana de tiempo de una página.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from dataclasses import replace
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Engine, Select, create_engine, inspect, select, text
+
+from app.domain.entities import FiltroVehiculos
+from app.infrastructure.db.models import VehiculoDB
+from app.infrastructure.db.repositories.vehiculo_repository import (
+    _COLUMNAS_ORDEN,
+    _paginate_filtrado,
+)
+
+from .datos import contar_vehiculos, poblar
+
+CASOS = {
+    "marca": FiltroVehiculos(marca_id=7),
+    "color": FiltroVehiculos(color="Verde"),
+    "puertas": FiltroVehiculos(numero_puertas=3),
+    "propietario": FiltroVehiculos(propietario_id=42),
+    "orden -modelo": FiltroVehiculos(orden="-modelo"),
+    "marca+color": FiltroVehiculos(marca_id=7, color="Verde"),
+}
+
+
+def _con_ancla(engine: Engine, filtro: FiltroVehiculos, ancla_id: int) -> FiltroVehiculos:
+    """El filtro con el valor de orden de la fila ancla, como lo guardaría el cursor."""
+    columna = _COLUMNAS_ORDEN[filtro.orden.lstrip("-")]
+    with engine.connect() as conn:
+        valor = conn.scalar(select(columna).where(VehiculoDB.id == ancla_id))
+    return replace(filtro, valor_ancla=valor)
+
+
+def _sql(engine: Engine, stmt: Select) -> str:
+    return str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _plan(engine: Engine, stmt: Select) -> List[str]:
+    sql = _sql(engine, stmt)
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            return [fila[-1] for fila in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+        return [fila[0] for fila in conn.exec_driver_sql(f"EXPLAIN {sql}")]
+
+
+def _resumen(plan: List[str]) -> str:
+    """Índices usados y si hubo recorrido completo u ordenación en memoria."""
+    texto = " | ".join(plan)
+    indices = sorted({p for p in texto.replace("|", " ").split() if p.startswith("ix_")})
+    avisos = []
+    if "Seq Scan" in texto or any(
+        linea.strip().startswith("SCAN vehiculos") and "INDEX" not in linea for linea in plan
+    ):
+        avisos.append("SCAN COMPLETO")
+    if "TEMP B-TREE" in texto or "Sort" in texto:
+        avisos.append("ORDENA EN MEMORIA")
+    if "Index Only Scan" in texto or "COVERING INDEX" in texto:
+        avisos.append("solo índice")
+    return f"{','.join(indices) or '-'} {' '.join(avisos)}".strip()
+
+
+def _medir(engine: Engine, stmt: Select, repeticiones: int) -> float:
+    tiempos = []
+    with engine.connect() as conn:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            conn.execute(stmt).all()
+            tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite:///benchmark_vehiculos.db")
+    parser.add_argument("--filas", type=int, default=200_000)
+    parser.add_argument("--limite", type=int, default=100)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    existentes = (
+        contar_vehiculos(engine) if inspect(engine).has_table(VehiculoDB.__tablename__) else 0
+    )
+    if existentes < args.filas:
+        print(f"Generando {args.filas - existentes} vehículos...")
+        poblar(engine, args.filas - existentes, semilla=existentes)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    print(
+        f"{max(existentes, args.filas)} vehículos, página de {args.limite},"
+        f" mediana de {args.repeticiones}"
+    )
+    for nombre, filtro in CASOS.items():
+        pagina = _paginate_filtrado(select(VehiculoDB), filtro, 0, None).limit(args.limite)
+        ids = _paginate_filtrado(select(VehiculoDB.id), filtro, 0, None).limit(args.limite)
+        siguiente = _paginate_filtrado(
+            select(VehiculoDB), _con_ancla(engine, filtro, 1000), 0, 1000
+        ).limit(args.limite)
+        print(
+            f"{nombre:<15} página {_medir(engine, pagina, args.repeticiones):7.2f} ms"
+            f" | con cursor {_medir(engine, siguiente, args.repeticiones):7.2f} ms"
+        )
+        print(f"{'':<15} plan filas: {_resumen(_plan(engine, pagina))}")
+        print(f"{'':<15} plan ids:   {_resumen(_plan(engine, ids))}")
+
+
+if __name__ == "__main__":
+    main()
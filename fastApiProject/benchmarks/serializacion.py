@@ -0,0 +1,122 @@
+"""Compara la serialización de listados vía ``response_model`` con la ruta rápida.
+
+Uso (desde ``fastApiProject/``)::
+
+    python -m benchmarks.serializacion --filas 1000 --repeticiones 50
+
+La ruta estándar replica lo que hacen las rutas de listado: ``model_validate`` por
+fila y después la validación/serialización de FastAPI contra ``response_model``
+(``serialize_response`` + ``JSONResponse``). La ruta rápida usa los serializadores
+precompilados y ``dumps`` (orjson si está instalado). No toca la base de datos.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.api.routes import marcas, personas, vehiculos
+from app.api.serialization import (
+    dumps,
+    orjson,
+    serializar_marca,
+    serializar_persona,
+    serializar_vehiculo,
+)
+from app.domain.entities import Marca, Persona, VehiculoDetalle
+from app.schemas import MarcaRead, PersonaRead, VehiculoRead
+
+
+def _marcas(filas: int) -> List[Marca]:
+    return [Marca(id=i, nombre_marca=f"Marca {i}", pais="Japón") for i in range(1, filas + 1)]
+
+
+def _personas(filas: int) -> List[Persona]:
+    return [
+        Persona(id=i, nombre=f"Persona {i}", cedula=f"{i:010d}") for i in range(1, filas + 1)
+    ]
+
+
+def _vehiculos(filas: int) -> List[VehiculoDetalle]:
+    marca = Marca(id=1, nombre_marca="Toyota", pais="Japón")
+    duenos = _personas(2)
+    return [
+        VehiculoDetalle(
+            id=i,
+            modelo=f"Modelo {i}",
+            marca_id=1,
+            numero_puertas=4,
+            color="Rojo",
+            marca=marca,
+            propietarios=duenos,
+        )
+        for i in range(1, filas + 1)
+    ]
+
+
+def _ruta_listado(router) -> APIRoute:
+    return next(
+        r
+        for r in router.routes
+        if isinstance(r, APIRoute) and r.path == f"{router.prefix}/" and "GET" in r.methods
+    )
+
+
+def _medir(funcion: Callable[[], Any], repeticiones: int) -> float:
+    """Mejor tiempo (ms) de ``repeticiones`` ejecuciones."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000
+
+
+def _ruta_estandar(route: APIRoute, modelo, items: Sequence) -> Callable[[], bytes]:
+    loop = asyncio.new_event_loop()
+
+    def ejecutar() -> bytes:
+        contenido = [modelo.model_validate(item) for item in items]
+        datos = loop.run_until_complete(
+            serialize_response(field=route.response_field, response_content=contenido)
+        )
+        return JSONResponse(datos).body
+
+    return ejecutar
+
+
+def _ruta_rapida(serializador, items: Sequence) -> Callable[[], bytes]:
+    return lambda: dumps([serializador(item) for item in items])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, float]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, default=1000)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    casos = [
+        ("marcas", marcas.router, MarcaRead, serializar_marca, _marcas(args.filas)),
+        ("personas", personas.router, PersonaRead, serializar_persona, _personas(args.filas)),
+        ("vehiculos", vehiculos.router, VehiculoRead, serializar_vehiculo, _vehiculos(args.filas)),
+    ]
+    print(f"{args.filas} filas, mejor de {args.repeticiones} (orjson: {'sí' if orjson else 'no'})")
+    print(f"{'listado':<10} {'estándar ms':>12} {'rápido ms':>10} {'aceleración':>12}")
+    resultados = {}
+    for nombre, router, modelo, serializador, items in casos:
+        estandar = _ruta_estandar(_ruta_listado(router), modelo, items)
+        rapida = _ruta_rapida(serializador, items)
+        assert estandar() == rapida(), f"Las salidas de {nombre} difieren"
+        t_estandar = _medir(estandar, args.repeticiones)
+        t_rapido = _medir(rapida, args.repeticiones)
+        resultados[nombre] = {"estandar_ms": t_estandar, "rapido_ms": t_rapido}
+        print(f"{nombre:<10} {t_estandar:>12.2f} {t_rapido:>10.2f} {t_estandar / t_rapido:>11.1f}x")
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
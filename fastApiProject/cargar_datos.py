@@ -0,0 +1,86 @@
+"""
+Carga masiva fuera de línea de marcas, personas y vehículos desde archivos CSV/NDJSON.
+
+Ejemplo::
+
+    python cargar_datos.py --marcas marcas.csv --personas personas.ndjson \\
+        --vehiculos vehiculos.csv --checkpoint carga.json
+
+Los vehículos pueden referenciar la marca por ``marca_id`` o ``nombre_marca`` y sus
+propietarios por ``propietarios_cedulas`` (lista en NDJSON, separadas por ";" en CSV),
+el mismo formato que produce ``GET /api/vehiculos/export``.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import get_settings
+from app.infrastructure.db.loader import CargadorMasivo
+from app.infrastructure.db.schema import upgrade
+from app.infrastructure.db.session import _build_engine
+
+logger = logging.getLogger("cargar_datos")
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--marcas", type=Path, help="Archivo de marcas (nombre_marca, pais)")
+    parser.add_argument("--personas", type=Path, help="Archivo de personas (nombre, cedula)")
+    parser.add_argument("--vehiculos", type=Path, help="Archivo de vehículos")
+    parser.add_argument(
+        "--database-url", default=None, help="URL de la BD (por defecto la de la configuración)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Procesos de validación"
+    )
+    parser.add_argument("--batch-size", type=int, default=5_000, help="Filas por transacción")
+    parser.add_argument(
+        "--checkpoint", type=Path, default=None, help="Archivo para reanudar una carga interrumpida"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = _parse_args(argv)
+    archivos = {
+        entidad: ruta
+        for entidad, ruta in (
+            ("marcas", args.marcas),
+            ("personas", args.personas),
+            ("vehiculos", args.vehiculos),
+        )
+        if ruta is not None
+    }
+    if not archivos:
+        logger.error("Indique al menos uno de --marcas, --personas o --vehiculos")
+        return 2
+
+    database_url = args.database_url or get_settings().database_url
+    upgrade(database_url)
+    engine = _build_engine(database_url)
+    try:
+        cargador = CargadorMasivo(
+            engine, workers=args.workers, batch_size=args.batch_size, checkpoint=args.checkpoint
+        )
+        resumen = cargador.cargar(archivos)
+    finally:
+        engine.dispose()
+
+    for entidad, insertadas in resumen.insertadas.items():
+        logger.info(
+            "✅ %s: %d insertadas, %d rechazadas",
+            entidad,
+            insertadas,
+            resumen.rechazadas.get(entidad, 0),
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,20 @@
+import asyncio
 import logging
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app.api.middleware import ConsumoBDMiddleware, MetricasMiddleware, ReplicasMiddleware
 from app.core.config import get_settings
-from app.infrastructure.db.base import Base
-from app.infrastructure.db.session import engine
-from app.api.routes import marcas, personas, vehiculos
+from app.infrastructure.cache import get_marca_cache
+from app.infrastructure.db.pool import estadisticas_pool
+from app.infrastructure.db.session import (
+    get_async_enrutador,
+    get_async_engine,
+    get_engine,
+    get_enrutador,
+    get_monitor_salud,
+)
+from app.infrastructure.metricas import get_metricas
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -31,6 +41,10 @@ tags_metadata = [
         "name": "Vehículos",
         "description": "Operaciones CRUD para vehículos y asignación de propietarios.",
     },
+    {
+        "name": "Estadísticas",
+        "description": "Agregados de vehículos calculados en la base de datos.",
+    },
 ]
 
 app = FastAPI(
@@ -39,11 +53,21 @@ app = FastAPI(
     version=API_VERSION,
     openapi_tags=tags_metadata,
 )
+app.add_middleware(ConsumoBDMiddleware)
+if get_settings().db_replica_urls:
+    app.add_middleware(ReplicasMiddleware)
+app.add_middleware(MetricasMiddleware)
 
 
-@app.on_event("startup")
-def on_startup() -> None:
-    """Inicializa la base de datos al arrancar la aplicación."""
+def verificar_base_de_datos() -> None:
+    """Verifica la conexión y que el esquema esté migrado; no modifica la base de datos.
+
+    El esquema se gestiona fuera del proceso que atiende peticiones con
+    ``alembic upgrade head`` (ver ``migrations/``).
+    """
+    # Alembic solo hace falta aquí: importarlo al cargar el módulo retrasa cada worker
+    from app.infrastructure.db.schema import esquema_actualizado
+
     settings = get_settings()
     
     # Mostrar información de conexión (sin contraseña completa)
@@ -54,9 +78,14 @@ def on_startup() -> None:
     )
     
     try:
-        # Intentar crear las tablas
-        Base.metadata.create_all(bind=engine)
-        logger.info("✅ Tablas creadas/verificadas exitosamente")
+        with get_engine().connect() as conn:
+            actualizado = esquema_actualizado(conn)
+        if actualizado:
+            logger.info("✅ Esquema de base de datos en la última migración")
+        else:
+            logger.warning(
+                "⚠️ La base de datos tiene migraciones pendientes: ejecute `alembic upgrade head`"
+            )
     except Exception as e:
         error_msg = str(e)
         error_type = type(e).__name__
@@ -94,7 +123,16 @@ def on_startup() -> None:
             f"\n💡 La aplicación continuará, pero las operaciones de BD fallarán hasta que se resuelva."
         )
         # No lanzar la excepción para que la app pueda iniciar
-        # Las tablas se crearán cuando se haga la primera conexión exitosa
+
+
+@app.on_event("startup")
+async def on_startup() -> None:
+    """Lanza ``verificar_base_de_datos`` en un hilo sin esperarla.
+
+    El worker empieza a aceptar peticiones de inmediato; ``/readyz`` no responde 200
+    hasta que el monitor de salud haya comprobado la conexión.
+    """
+    app.state.verificacion_bd = asyncio.create_task(asyncio.to_thread(verificar_base_de_datos))
 
 
 @app.get("/", tags=["Marcas"])
@@ -102,41 +140,74 @@ async def root():
     return {"message": "Bienvenido a la API de gestión de vehículos"}
 
 
-@app.get("/health", tags=["Sistema"])
-async def health_check():
-    """Endpoint para verificar el estado de la aplicación y la conexión a la base de datos."""
-    from sqlalchemy import text
-    from app.infrastructure.db.session import SessionLocal
-    
+@app.on_event("startup")
+async def iniciar_monitor_salud() -> None:
+    get_monitor_salud().iniciar()
+
+
+@app.on_event("shutdown")
+async def detener_monitor_salud() -> None:
+    await get_monitor_salud().detener()
+
+
+@app.get("/livez", tags=["Sistema"])
+async def liveness():
+    """Sonda de vida: el proceso responde. No consulta la base de datos ni otros servicios."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz", tags=["Sistema"])
+async def readiness() -> JSONResponse:
+    """Sonda de disponibilidad: 503 si la base de datos no responde o el pool está saturado.
+
+    Devuelve el resultado de la última comprobación en segundo plano
+    (``HEALTH_CHECK_INTERVAL``), sin abrir conexiones.
+    """
+    informe = get_monitor_salud().informe()
+    return JSONResponse(informe, status_code=503 if informe["reasons"] else 200)
+
+
+@app.get("/cache/marcas", tags=["Sistema"])
+async def marca_cache_stats():
+    """Estadísticas de la caché en memoria del catálogo de marcas de este proceso."""
+    return get_marca_cache().stats()
+
+
+@app.get("/db/pool", tags=["Sistema"])
+async def db_pool_stats():
+    """Estado del pool de conexiones de este proceso y esperas acumuladas por conexión."""
     settings = get_settings()
-    status = {
-        "status": "ok",
-        "database": {
-            "host": settings.postgres_host,
-            "port": settings.postgres_port,
-            "database": settings.postgres_db,
-            "user": settings.postgres_user,
-            "connected": False,
-        }
-    }
-    
-    try:
-        db = SessionLocal()
-        try:
-            db.execute(text("SELECT 1"))
-            status["database"]["connected"] = True
-            status["message"] = "Aplicación y base de datos funcionando correctamente"
-        finally:
-            db.close()
-    except Exception as e:
-        status["status"] = "error"
-        status["database"]["connected"] = False
-        status["error"] = str(e)
-        status["message"] = "Error al conectar con la base de datos"
-    
-    return status
+    # Solo el motor de la pila activa: consultar el otro lo crearía sin necesidad
+    if settings.db_async:
+        stats = {"async": estadisticas_pool(get_async_engine().sync_engine)}
+    else:
+        stats = {"sync": estadisticas_pool(get_engine())}
+    if settings.db_replica_urls:
+        enrutador = get_async_enrutador() if settings.db_async else get_enrutador()
+        stats["replicas"] = enrutador.stats()
+    return stats
+
+
+@app.get("/metrics", tags=["Sistema"], response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Métricas de este proceso en el formato de texto de Prometheus."""
+    return PlainTextResponse(
+        get_metricas().render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+if get_settings().db_async:
+    # Pila asíncrona: AsyncSession + rutas ``async def`` sin pasar por el pool de hilos
+    from app.api.routes import async_estadisticas, async_marcas, async_personas, async_vehiculos
 
+    app.include_router(async_marcas.router)
+    app.include_router(async_personas.router)
+    app.include_router(async_vehiculos.router)
+    app.include_router(async_estadisticas.router)
+else:
+    from app.api.routes import estadisticas, marcas, personas, vehiculos
 
-app.include_router(marcas.router)
-app.include_router(personas.router)
-app.include_router(vehiculos.router)
+    app.include_router(marcas.router)
+    app.include_router(personas.router)
+    app.include_router(vehiculos.router)
+    app.include_router(estadisticas.router)
@@ -0,0 +1,65 @@
+"""Esquema inicial: marcas, personas, vehículos y propietarios
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Corresponde al esquema que creaba ``Base.metadata.create_all`` antes de las
+migraciones. Una base de datos existente se incorpora con ``alembic stamp 0001``
+seguido de ``alembic upgrade head``: las revisiones posteriores omiten lo que ya exista.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "marcas",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("nombre_marca", sa.String(length=100), nullable=False),
+        sa.Column("pais", sa.String(length=100), nullable=False),
+    )
+    op.create_index("ix_marcas_id", "marcas", ["id"])
+    op.create_index("ix_marcas_nombre_marca", "marcas", ["nombre_marca"], unique=True)
+
+    op.create_table(
+        "personas",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("nombre", sa.String(length=120), nullable=False),
+        sa.Column("cedula", sa.String(length=50), nullable=False),
+    )
+    op.create_index("ix_personas_id", "personas", ["id"])
+    op.create_index("ix_personas_cedula", "personas", ["cedula"], unique=True)
+
+    op.create_table(
+        "vehiculos",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("modelo", sa.String(length=120), nullable=False),
+        sa.Column("marca_id", sa.Integer(), sa.ForeignKey("marcas.id"), nullable=False),
+        sa.Column("numero_puertas", sa.Integer(), nullable=False),
+        sa.Column("color", sa.String(length=80), nullable=False),
+    )
+    op.create_index("ix_vehiculos_id", "vehiculos", ["id"])
+
+    op.create_table(
+        "vehiculo_propietario",
+        sa.Column("vehiculo_id", sa.Integer(), sa.ForeignKey("vehiculos.id"), primary_key=True),
+        sa.Column("persona_id", sa.Integer(), sa.ForeignKey("personas.id"), primary_key=True),
+        sa.UniqueConstraint("vehiculo_id", "persona_id", name="uq_vehiculo_persona"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("vehiculo_propietario")
+    op.drop_table("vehiculos")
+    op.drop_table("personas")
+    op.drop_table("marcas")
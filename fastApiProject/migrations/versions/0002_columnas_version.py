@@ -0,0 +1,38 @@
+"""Columna version en marcas, personas y vehículos
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Contador de escrituras que alimenta los ETag y las comprobaciones ``If-Match``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLAS = ("marcas", "personas", "vehiculos")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind()) if not op.get_context().as_sql else None
+    for tabla in TABLAS:
+        if inspector is not None and "version" in {
+            columna["name"] for columna in inspector.get_columns(tabla)
+        }:
+            continue
+        op.add_column(
+            tabla, sa.Column("version", sa.Integer(), nullable=False, server_default="1")
+        )
+
+
+def downgrade() -> None:
+    for tabla in TABLAS:
+        op.drop_column(tabla, "version")
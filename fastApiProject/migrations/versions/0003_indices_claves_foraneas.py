@@ -0,0 +1,39 @@
+"""Índices compuestos de los filtros de vehículos y de las claves foráneas
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+``vehiculos.marca_id`` y ``vehiculo_propietario.persona_id`` no tenían índice, así
+que los vehículos de una persona y el borrado en cascada de una marca recorrían la
+tabla completa. Cada índice termina en ``id`` para servir también al cursor de
+paginación. En PostgreSQL se crean con ``CONCURRENTLY``.
+"""
+from typing import Sequence, Union
+
+from app.infrastructure.db.schema import crear_indice, eliminar_indice
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDICES = (
+    ("ix_vehiculos_marca_id_id", "vehiculos", ["marca_id", "id"]),
+    ("ix_vehiculos_color_id", "vehiculos", ["color", "id"]),
+    ("ix_vehiculos_numero_puertas_id", "vehiculos", ["numero_puertas", "id"]),
+    ("ix_vehiculos_modelo_id", "vehiculos", ["modelo", "id"]),
+    ("ix_vehiculo_propietario_persona_id", "vehiculo_propietario", ["persona_id", "vehiculo_id"]),
+)
+
+
+def upgrade() -> None:
+    for nombre, tabla, columnas in INDICES:
+        crear_indice(nombre, tabla, columnas)
+
+
+def downgrade() -> None:
+    for nombre, tabla, _ in reversed(INDICES):
+        eliminar_indice(nombre, tabla)
@@ -0,0 +1,68 @@
+"""Índices de búsqueda de personas (pg_trgm en PostgreSQL, FTS5 en SQLite)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.infrastructure.db.schema import crear_indice, eliminar_indice
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FTS_SQLITE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS personas_fts USING fts5("
+    "nombre, content='personas', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS personas_fts_ai AFTER INSERT ON personas BEGIN "
+    "INSERT INTO personas_fts(rowid, nombre) VALUES (new.id, new.nombre); END",
+    "CREATE TRIGGER IF NOT EXISTS personas_fts_ad AFTER DELETE ON personas BEGIN "
+    "INSERT INTO personas_fts(personas_fts, rowid, nombre) "
+    "VALUES ('delete', old.id, old.nombre); END",
+    "CREATE TRIGGER IF NOT EXISTS personas_fts_au AFTER UPDATE OF nombre ON personas BEGIN "
+    "INSERT INTO personas_fts(personas_fts, rowid, nombre) "
+    "VALUES ('delete', old.id, old.nombre); "
+    "INSERT INTO personas_fts(rowid, nombre) VALUES (new.id, new.nombre); END",
+    # Indexa las personas que ya existían
+    "INSERT INTO personas_fts(personas_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    dialecto = op.get_context().dialect.name
+    if dialecto == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        crear_indice(
+            "ix_personas_nombre_trgm",
+            "personas",
+            ["nombre"],
+            postgresql_using="gin",
+            postgresql_ops={"nombre": "gin_trgm_ops"},
+        )
+        crear_indice(
+            "ix_personas_cedula_prefijo",
+            "personas",
+            ["cedula"],
+            postgresql_ops={"cedula": "text_pattern_ops"},
+        )
+    elif dialecto == "sqlite":
+        for sentencia in FTS_SQLITE:
+            op.execute(sentencia)
+
+
+def downgrade() -> None:
+    dialecto = op.get_context().dialect.name
+    if dialecto == "postgresql":
+        eliminar_indice("ix_personas_cedula_prefijo", "personas")
+        eliminar_indice("ix_personas_nombre_trgm", "personas")
+    elif dialecto == "sqlite":
+        for trigger in ("personas_fts_au", "personas_fts_ad", "personas_fts_ai"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS personas_fts")
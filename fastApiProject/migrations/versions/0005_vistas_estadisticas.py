@@ -0,0 +1,59 @@
+"""Vistas materializadas de estadísticas (solo PostgreSQL)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Respaldan ``/api/stats`` con ``STATS_MATERIALIZED=true``. Cada vista tiene un índice
+único para poder refrescarse con ``REFRESH MATERIALIZED VIEW CONCURRENTLY``
+(``refrescar_estadisticas.py``). En otros motores esta revisión no hace nada.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VISTAS = (
+    (
+        "mv_vehiculos_por_marca",
+        "SELECT m.id AS marca_id, m.nombre_marca, m.pais, count(v.id) AS total "
+        "FROM marcas m LEFT JOIN vehiculos v ON v.marca_id = m.id "
+        "GROUP BY m.id, m.nombre_marca, m.pais",
+        "marca_id",
+    ),
+    (
+        "mv_vehiculos_por_color_puertas",
+        "SELECT color, numero_puertas, count(*) AS total "
+        "FROM vehiculos GROUP BY color, numero_puertas",
+        "color, numero_puertas",
+    ),
+    (
+        "mv_propietarios_por_vehiculo",
+        "SELECT propietarios, count(*) AS total FROM ("
+        "SELECT count(vp.persona_id) AS propietarios FROM vehiculos v "
+        "LEFT JOIN vehiculo_propietario vp ON vp.vehiculo_id = v.id GROUP BY v.id"
+        ") AS por_vehiculo GROUP BY propietarios",
+        "propietarios",
+    ),
+)
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    for nombre, consulta, clave in VISTAS:
+        op.execute(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {nombre} AS {consulta}")
+        op.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{nombre} ON {nombre} ({clave})")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    for nombre, _, _ in reversed(VISTAS):
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {nombre}")
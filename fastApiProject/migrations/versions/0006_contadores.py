@@ -0,0 +1,60 @@
+"""Contadores desnormalizados de vehículos y propietarios
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+``marcas.vehiculo_count``, ``personas.vehiculo_count`` y ``vehiculos.propietario_count``
+los mantiene la API al escribir; aquí se rellenan una vez con un ``UPDATE`` por tabla.
+Para tablas grandes puede preferirse dejar el valor por defecto y ejecutar después
+``reconciliar_contadores.py``, que recorre las tablas por rangos de id.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabla, contador, subconsulta que calcula su valor)
+CONTADORES = (
+    (
+        "marcas",
+        "vehiculo_count",
+        "SELECT count(*) FROM vehiculos WHERE vehiculos.marca_id = marcas.id",
+    ),
+    (
+        "personas",
+        "vehiculo_count",
+        "SELECT count(*) FROM vehiculo_propietario "
+        "WHERE vehiculo_propietario.persona_id = personas.id",
+    ),
+    (
+        "vehiculos",
+        "propietario_count",
+        "SELECT count(*) FROM vehiculo_propietario "
+        "WHERE vehiculo_propietario.vehiculo_id = vehiculos.id",
+    ),
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind()) if not op.get_context().as_sql else None
+    for tabla, columna, conteo in CONTADORES:
+        if inspector is None or columna not in {
+            c["name"] for c in inspector.get_columns(tabla)
+        }:
+            op.add_column(
+                tabla, sa.Column(columna, sa.Integer(), nullable=False, server_default="0")
+            )
+        op.execute(f"UPDATE {tabla} SET {columna} = ({conteo})")
+
+
+def downgrade() -> None:
+    for tabla, columna, _ in CONTADORES:
+        op.drop_column(tabla, columna)
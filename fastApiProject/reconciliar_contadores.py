@@ -0,0 +1,63 @@
+"""
+Repara la deriva de los contadores de vehículos de marcas y personas y de propietarios de vehículos.
+
+La API mantiene los contadores en la misma transacción que cada escritura; este
+proceso corrige los que se desvíen por cargas o ediciones hechas directamente en
+la base de datos. Puede ejecutarse periódicamente, por ejemplo desde cron::
+
+    0 3 * * * cd /app && python reconciliar_contadores.py
+
+o como proceso dedicado con ``--cada 3600``. Recorre cada tabla por rangos de id,
+cada uno en su propia transacción, y solo escribe las filas incorrectas.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from typing import List, Optional
+
+from app.core.config import get_settings
+from app.infrastructure.db.repositories._contadores import reconciliar_contadores
+from app.infrastructure.db.session import _build_engine
+
+logger = logging.getLogger("reconciliar_contadores")
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--database-url", default=None, help="URL de la BD (por defecto la de la configuración)"
+    )
+    parser.add_argument(
+        "--lote", type=int, default=10_000, help="Ids por transacción (por defecto 10000)"
+    )
+    parser.add_argument(
+        "--cada", type=float, default=None, help="Repetir cada N segundos en lugar de una sola vez"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = _parse_args(argv)
+    engine = _build_engine(args.database_url or get_settings().database_url)
+    try:
+        while True:
+            inicio = time.perf_counter()
+            reparadas = reconciliar_contadores(engine, lote=args.lote)
+            logger.info(
+                "✅ Contadores reconciliados en %.1f s: %s",
+                time.perf_counter() - inicio,
+                ", ".join(f"{tabla}={total}" for tabla, total in reparadas.items()),
+            )
+            if args.cada is None:
+                return 0
+            time.sleep(args.cada)
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Refresca las vistas materializadas de ``/api/stats`` (PostgreSQL, ``STATS_MATERIALIZED``).
+
+Pensado para ejecutarse periódicamente, por ejemplo desde cron::
+
+    */15 * * * * cd /app && python refrescar_estadisticas.py
+
+o como proceso dedicado con ``--cada 900``. El refresco usa ``CONCURRENTLY``, así
+que la API sigue leyendo los valores anteriores mientras se recalculan.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from typing import List, Optional
+
+from app.core.config import get_settings
+from app.infrastructure.db.repositories._estadisticas import refrescar_vistas
+from app.infrastructure.db.session import _build_engine
+
+logger = logging.getLogger("refrescar_estadisticas")
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--database-url", default=None, help="URL de la BD (por defecto la de la configuración)"
+    )
+    parser.add_argument(
+        "--cada", type=float, default=None, help="Repetir cada N segundos en lugar de una sola vez"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = _parse_args(argv)
+    engine = _build_engine(args.database_url or get_settings().database_url)
+    if engine.dialect.name != "postgresql":
+        logger.error("Las vistas materializadas solo existen en PostgreSQL")
+        return 2
+    try:
+        while True:
+            inicio = time.perf_counter()
+            refrescar_vistas(engine)
+            logger.info("✅ Estadísticas refrescadas en %.1f s", time.perf_counter() - inicio)
+            if args.cada is None:
+                return 0
+            time.sleep(args.cada)
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
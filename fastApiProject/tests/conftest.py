@@ -0,0 +1,7 @@
+"""
+Configuración común de las pruebas.
+"""
+import os
+
+# Una ruta que supere su presupuesto de consultas (posible N+1) hace fallar la prueba
+os.environ.setdefault("DB_QUERY_BUDGET_STRICT", "true")
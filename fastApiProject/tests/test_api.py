@@ -3,22 +3,37 @@ Tests automatizados para la API de Gestión de Vehículos.
 """
 from __future__ import annotations
 
+import json
 import os
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Iterator, List
 
 import pytest
 import sys
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, select, update
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from app.api.dependencies import get_repositorios
+from app.api.middleware import (
+    ConsumoBDMiddleware,
+    PresupuestoConsultasExcedido,
+    presupuesto_consultas,
+)
 from app.core.config import get_settings
+from app.infrastructure.cache import get_marca_cache
 from app.infrastructure.db.base import Base
+from app.infrastructure.db.models import MarcaVehiculoDB, VehiculoDB
+from app.infrastructure.db.repositories import SQLAlchemyVehiculoRepository
+from app.infrastructure.db.repositories._contadores import reconciliar_contadores
 from app.infrastructure.db.session import get_db
+from app.infrastructure.metricas import instrumentar_motor
 from main import app
 
 settings = get_settings()
@@ -29,6 +44,7 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if SQLALCHEMY_TEST_DATABASE_URL.startswith("sqlite") else {},
     poolclass=StaticPool if SQLALCHEMY_TEST_DATABASE_URL.startswith("sqlite") else None,
 )
+instrumentar_motor(engine)
 TestingSessionLocal = sessionmaker(
     bind=engine, autocommit=False, autoflush=False, future=True
 )
@@ -51,10 +67,26 @@ def prepare_database() -> Generator:
     """Prepara la base de datos antes de cada test."""
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    get_marca_cache().clear()
     yield
     Base.metadata.drop_all(bind=engine)
 
 
+@contextmanager
+def contar_consultas() -> Iterator[List[str]]:
+    """Registra las sentencias SQL emitidas contra el motor de pruebas."""
+    sentencias: List[str] = []
+
+    def _registrar(conn, cursor, statement, parameters, context, executemany) -> None:
+        sentencias.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _registrar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(engine, "before_cursor_execute", _registrar)
+
+
 # ==================== TESTS DE MARCAS ====================
 
 def test_crear_marca() -> None:
@@ -230,6 +262,31 @@ def test_no_permite_cedulas_duplicadas() -> None:
     assert "Ya existe una persona con esa cédula" in segunda_respuesta.json()["detail"]
 
 
+def test_buscar_personas_por_nombre_y_cedula() -> None:
+    """La búsqueda ignora tildes, prioriza prefijos de cédula y sigue a las escrituras."""
+    client.post("/api/personas/bulk", json=[
+        {"nombre": "José Pérez", "cedula": "1710000001"},
+        {"nombre": "Josefina Ruiz", "cedula": "0920000002"},
+        {"nombre": "Ana Jose", "cedula": "0930000003"},
+    ])
+    otra = client.post("/api/personas/", json={"nombre": "Mario Gómez", "cedula": "1710000004"}).json()
+
+    por_nombre = client.get("/api/personas/search", params={"q": "jose"}).json()
+    assert {p["nombre"] for p in por_nombre} == {"José Pérez", "Josefina Ruiz", "Ana Jose"}
+
+    por_cedula = client.get("/api/personas/search", params={"q": "1710"}).json()
+    assert [p["cedula"] for p in por_cedula] == ["1710000001", "1710000004"]
+
+    assert client.get("/api/personas/search", params={"q": "jose perez"}).json()[0]["cedula"] == "1710000001"
+    assert client.get("/api/personas/search", params={"q": "jose", "limit": 1}).status_code == 200
+    assert client.get("/api/personas/search", params={"q": ""}).status_code == 422
+
+    client.put(f"/api/personas/{otra['id']}", json={"nombre": "Mario Josué"})
+    assert client.get("/api/personas/search", params={"q": "josue"}).json()[0]["id"] == otra["id"]
+    client.delete(f"/api/personas/{otra['id']}")
+    assert client.get("/api/personas/search", params={"q": "josue"}).json() == []
+
+
 # ==================== TESTS DE VEHÍCULOS ====================
 
 def test_crear_vehiculo() -> None:
@@ -457,3 +514,634 @@ def test_crear_vehiculo_con_marca_inexistente() -> None:
     )
     assert response.status_code == 404
     assert "Marca no encontrada" in response.json()["detail"]
+
+
+# ==================== TESTS DE RENDIMIENTO ====================
+
+def _crear_vehiculos_con_propietarios(cantidad: int) -> None:
+    """Crea ``cantidad`` vehículos, cada uno con su propio propietario."""
+    marca_id = client.post(
+        "/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"}
+    ).json()["id"]
+    for indice in range(cantidad):
+        vehiculo_id = client.post(
+            "/api/vehiculos/",
+            json={"modelo": f"Modelo {indice}", "marca_id": marca_id, "numero_puertas": 4, "color": "Rojo"},
+        ).json()["id"]
+        persona_id = client.post(
+            "/api/personas/", json={"nombre": f"Persona {indice}", "cedula": f"1000{indice:04d}"}
+        ).json()["id"]
+        client.post(f"/api/vehiculos/{vehiculo_id}/propietarios/", json={"persona_id": persona_id})
+
+
+def test_listar_vehiculos_consultas_constantes() -> None:
+    """El número de consultas al listar vehículos no crece con el tamaño de página."""
+    _crear_vehiculos_con_propietarios(20)
+
+    with contar_consultas() as pagina_pequena:
+        response = client.get("/api/vehiculos/", params={"limit": 5})
+    assert len(response.json()) == 5
+
+    with contar_consultas() as pagina_grande:
+        response = client.get("/api/vehiculos/", params={"limit": 20})
+    data = response.json()
+    assert len(data) == 20
+    assert all(v["marca"]["nombre_marca"] == "Toyota" for v in data)
+    assert all(len(v["propietarios"]) == 1 for v in data)
+
+    assert len(pagina_grande) == len(pagina_pequena)
+    assert len(pagina_grande) <= 2
+
+
+def test_listar_personas_en_una_consulta() -> None:
+    """Listado y lectura por id son una consulta sin vehículos, tenga cuantos tenga cada persona."""
+    _crear_vehiculos_con_propietarios(20)
+    personas = client.get("/api/personas/", params={"limit": 20}).json()
+    marca_id = client.get("/api/marcas/").json()[0]["id"]
+    for indice in range(6):
+        vehiculo_id = client.post(
+            "/api/vehiculos/",
+            json={"modelo": f"Extra {indice}", "marca_id": marca_id, "numero_puertas": 4, "color": "Azul"},
+        ).json()["id"]
+        client.post(
+            f"/api/vehiculos/{vehiculo_id}/propietarios/", json={"persona_id": personas[0]["id"]}
+        )
+
+    for limit in (5, 20):
+        with contar_consultas() as sentencias:
+            response = client.get("/api/personas/", params={"limit": limit})
+        data = response.json()
+        assert len(data) == limit
+        assert data[0]["vehiculo_count"] == 7
+        assert response.headers["X-DB-Queries"] == "1"
+        assert not any("vehiculo_propietario" in sentencia for sentencia in sentencias)
+
+    with contar_consultas() as sentencias:
+        response = client.get(f"/api/personas/{personas[0]['id']}")
+    assert response.json()["vehiculo_count"] == 7
+    assert response.headers["X-DB-Queries"] == "1"
+    assert not any("vehiculo_propietario" in sentencia for sentencia in sentencias)
+
+
+def test_vehiculos_de_persona_paginados_en_consultas_constantes() -> None:
+    """Los vehículos de una persona se paginan por cursor sin cargar la persona."""
+    marca_id = client.post("/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"}).json()["id"]
+    duena = client.post("/api/personas/", json={"nombre": "Flota S.A.", "cedula": "900000001"}).json()["id"]
+    otra = client.post("/api/personas/", json={"nombre": "Ana Ruiz", "cedula": "900000002"}).json()["id"]
+    ids = []
+    for indice in range(7):
+        vehiculo = client.post(
+            "/api/vehiculos/",
+            json={"modelo": f"Hilux {indice}", "marca_id": marca_id, "numero_puertas": 4, "color": "Blanco"},
+        ).json()
+        propietarios = [duena, otra] if indice == 3 else [duena]
+        client.put(f"/api/vehiculos/{vehiculo['id']}", json={"propietarios_ids": propietarios})
+        ids.append(vehiculo["id"])
+
+    vistos, params = [], {"limit": 3}
+    while True:
+        with contar_consultas() as consultas:
+            response = client.get(f"/api/personas/{duena}/vehiculos/", params=params)
+        assert response.status_code == 200
+        assert len(consultas) <= 2
+        vistos += response.json()
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert [v["id"] for v in vistos] == ids
+    assert {p["id"] for p in vistos[3]["propietarios"]} == {duena, otra}
+    assert all(v["marca"]["nombre_marca"] == "Toyota" for v in vistos)
+
+    assert [v["id"] for v in client.get(f"/api/personas/{otra}/vehiculos/").json()] == [ids[3]]
+    assert client.get("/api/personas/999/vehiculos/").status_code == 404
+    assert client.get(f"/api/personas/{duena}/vehiculos/", params={"limit": 5000}).status_code == 422
+
+
+def test_escrituras_de_vehiculo_en_dos_sentencias() -> None:
+    """Crear, leer y actualizar un vehículo cuesta a lo sumo dos sentencias SQL."""
+    marca_id = client.post("/api/marcas/", json={"nombre_marca": "Mazda", "pais": "Japón"}).json()["id"]
+    vehiculo = {"modelo": "3", "marca_id": marca_id, "numero_puertas": 4, "color": "Gris"}
+
+    with contar_consultas() as creacion:
+        response = client.post("/api/vehiculos/", json=vehiculo)
+    assert response.status_code == 201
+    assert response.json()["marca"]["nombre_marca"] == "Mazda"
+    vehiculo_id = response.json()["id"]
+
+    with contar_consultas() as lectura:
+        assert client.get(f"/api/vehiculos/{vehiculo_id}").status_code == 200
+
+    with contar_consultas() as actualizacion:
+        response = client.put(f"/api/vehiculos/{vehiculo_id}", json={"color": "Azul"})
+    assert response.json()["color"] == "Azul"
+
+    assert len(creacion) <= 2
+    assert len(lectura) <= 2
+    assert len(actualizacion) <= 2
+
+
+def _version_vehiculo(vehiculo_id: int) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(VehiculoDB.version).where(VehiculoDB.id == vehiculo_id))
+
+
+def test_actualizar_vehiculo_conserva_campos_y_propietarios() -> None:
+    """Campos y propietarios se aplican con un único cambio de versión; un id inexistente da 404."""
+    _crear_vehiculos_con_propietarios(1)
+    persona_id = client.post("/api/personas/", json={"nombre": "Ana", "cedula": "55555"}).json()["id"]
+    version = _version_vehiculo(1)
+
+    response = client.put(
+        "/api/vehiculos/1", json={"color": "Verde", "propietarios_ids": [persona_id]}
+    )
+    assert response.status_code == 200
+    assert response.json()["color"] == "Verde"
+    assert [p["id"] for p in response.json()["propietarios"]] == [persona_id]
+    assert _version_vehiculo(1) == version + 1
+
+    assert client.put("/api/vehiculos/999", json={"color": "Azul"}).status_code == 404
+    assert client.delete("/api/vehiculos/999").status_code == 404
+
+
+def test_contadores_se_mantienen_al_escribir_y_se_reconcilian() -> None:
+    """Altas, propietarios, cambio de marca y bajas ajustan los contadores; la deriva se repara."""
+    toyota = client.post("/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"}).json()["id"]
+    ford = client.post("/api/marcas/", json={"nombre_marca": "Ford", "pais": "EE.UU."}).json()["id"]
+    ana = client.post("/api/personas/", json={"nombre": "Ana", "cedula": "11111"}).json()["id"]
+    luis = client.post("/api/personas/", json={"nombre": "Luis", "cedula": "22222"}).json()["id"]
+    vehiculo = {"modelo": "Corolla", "marca_id": toyota, "numero_puertas": 4, "color": "Rojo"}
+    primero = client.post("/api/vehiculos/", json=vehiculo).json()["id"]
+    segundo = client.post("/api/vehiculos/", json=vehiculo).json()["id"]
+
+    def contador(ruta: str) -> int:
+        datos = client.get(ruta).json()
+        return datos.get("vehiculo_count", datos.get("propietario_count"))
+
+    assert contador(f"/api/marcas/{toyota}") == 2
+    response = client.post(f"/api/vehiculos/{primero}/propietarios/", json={"persona_id": ana})
+    assert response.json()["propietario_count"] == 1
+    client.put(f"/api/vehiculos/{segundo}", json={"propietarios_ids": [ana, luis]})
+    assert contador(f"/api/personas/{ana}") == 2
+    assert contador(f"/api/vehiculos/{segundo}") == 2
+
+    etag = client.get(f"/api/marcas/{ford}").headers["ETag"]
+    client.put(f"/api/vehiculos/{segundo}", json={"marca_id": ford, "propietarios_ids": [luis]})
+    assert contador(f"/api/marcas/{toyota}") == 1
+    assert contador(f"/api/marcas/{ford}") == 1
+    assert client.get(f"/api/marcas/{ford}", headers={"If-None-Match": etag}).status_code == 200
+    assert contador(f"/api/personas/{ana}") == 1
+
+    client.delete(f"/api/personas/{luis}")
+    assert contador(f"/api/vehiculos/{segundo}") == 0
+    client.delete(f"/api/vehiculos/{primero}")
+    assert contador(f"/api/marcas/{toyota}") == 0
+    assert contador(f"/api/personas/{ana}") == 0
+    assert reconciliar_contadores(engine) == {"marcas": 0, "personas": 0, "vehiculos": 0}
+
+    with engine.begin() as conn:
+        conn.execute(update(MarcaVehiculoDB).values(vehiculo_count=7))
+        conn.execute(update(VehiculoDB).values(propietario_count=3))
+    assert reconciliar_contadores(engine, lote=1) == {"marcas": 2, "personas": 0, "vehiculos": 1}
+    get_marca_cache().clear()
+    assert contador(f"/api/marcas/{toyota}") == 0
+    assert contador(f"/api/marcas/{ford}") == 1
+
+
+def test_asignar_muchos_propietarios_valida_con_una_consulta() -> None:
+    """Reemplazar propietarios valida todas las personas con un único ``IN``."""
+    _crear_vehiculos_con_propietarios(1)
+    personas = [{"nombre": f"Dueño {i}", "cedula": f"7000{i:04d}"} for i in range(500)]
+    ids = [p["id"] for p in client.post("/api/personas/bulk", json=personas).json()["creados"]]
+
+    with contar_consultas() as sentencias:
+        response = client.put("/api/vehiculos/1", json={"propietarios_ids": ids})
+    assert response.status_code == 200
+    assert response.json()["propietario_count"] == 500
+    consultas_personas = [
+        s for s in sentencias if s.startswith("SELECT") and "FROM personas" in s.split("WHERE")[0]
+    ]
+    assert len(consultas_personas) == 1
+
+    response = client.put("/api/vehiculos/1", json={"propietarios_ids": [ids[0], 99998, 99999]})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Propietarios no encontrados: 99998, 99999."
+    assert client.get("/api/vehiculos/1").json()["propietario_count"] == 500
+
+
+def test_actualizar_campos_y_propietarios_en_una_transaccion(monkeypatch) -> None:
+    """Si falla la escritura de propietarios, tampoco se guardan los campos."""
+    _crear_vehiculos_con_propietarios(1)
+    antes, version = client.get("/api/vehiculos/1").json(), _version_vehiculo(1)
+
+    def fallar(self, vehiculo_id, propietarios_ids):
+        raise RuntimeError("fallo al escribir propietarios")
+
+    monkeypatch.setattr(SQLAlchemyVehiculoRepository, "_reemplazar_propietarios", fallar)
+    with pytest.raises(RuntimeError):
+        client.put("/api/vehiculos/1", json={"color": "Verde", "propietarios_ids": []})
+    assert client.get("/api/vehiculos/1").json() == antes
+    assert _version_vehiculo(1) == version
+
+
+# ==================== TESTS DE PAGINACIÓN ====================
+
+def test_paginacion_por_cursor_personas() -> None:
+    """El cursor recorre todas las personas sin repetir ni omitir registros."""
+    for indice in range(5):
+        client.post("/api/personas/", json={"nombre": f"Persona {indice}", "cedula": f"2000{indice:04d}"})
+
+    primera = client.get("/api/personas/", params={"limit": 2})
+    assert primera.status_code == 200
+    cursor = primera.headers["X-Next-Cursor"]
+    vistos = [p["id"] for p in primera.json()]
+
+    while cursor:
+        pagina = client.get("/api/personas/", params={"limit": 2, "cursor": cursor})
+        assert pagina.status_code == 200
+        vistos.extend(p["id"] for p in pagina.json())
+        cursor = pagina.headers.get("X-Next-Cursor")
+
+    assert vistos == sorted(vistos)
+    assert len(vistos) == len(set(vistos)) == 5
+
+
+def test_paginacion_cursor_invalido() -> None:
+    """Un cursor malformado se rechaza con 400."""
+    response = client.get("/api/marcas/", params={"cursor": "no-es-un-cursor"})
+    assert response.status_code == 400
+
+
+def test_filtros_y_orden_de_vehiculos() -> None:
+    """Los filtros se combinan y el cursor recorre cualquier orden sin repetir filas."""
+    toyota = client.post("/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"}).json()["id"]
+    kia = client.post("/api/marcas/", json={"nombre_marca": "Kia", "pais": "Corea"}).json()["id"]
+    colores = ["Rojo", "Azul", "Rojo", "Verde", "Azul", "Rojo"]
+    for indice, color in enumerate(colores):
+        client.post(
+            "/api/vehiculos/",
+            json={
+                "modelo": f"Modelo {indice}",
+                "marca_id": toyota if indice % 2 == 0 else kia,
+                "numero_puertas": 2 + indice % 3,
+                "color": color,
+            },
+        )
+    persona_id = client.post("/api/personas/", json={"nombre": "Ana", "cedula": "55555"}).json()["id"]
+    client.post("/api/vehiculos/4/propietarios/", json={"persona_id": persona_id})
+
+    rojos_toyota = client.get("/api/vehiculos/", params={"marca_id": toyota, "color": "Rojo"}).json()
+    assert [v["id"] for v in rojos_toyota] == [1, 3]
+    assert [v["id"] for v in client.get("/api/vehiculos/", params={"numero_puertas": 3}).json()] == [2, 5]
+    assert [v["id"] for v in client.get("/api/vehiculos/", params={"propietario_id": persona_id}).json()] == [4]
+
+    vistos: List[int] = []
+    cursor = None
+    while True:
+        params = {"sort": "-color", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/vehiculos/", params=params)
+        vistos += [v["id"] for v in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert vistos == [4, 6, 3, 1, 5, 2]
+    assert client.get("/api/vehiculos/", params={"sort": "precio"}).status_code == 422
+
+
+def test_cursor_ordenado_sobrevive_al_borrado_del_ancla() -> None:
+    """El cursor guarda el valor de orden: borrar su fila no corta el recorrido."""
+    _crear_vehiculos_con_propietarios(6)
+    primera = client.get("/api/vehiculos/", params={"sort": "-modelo", "limit": 2})
+    assert [v["modelo"] for v in primera.json()] == ["Modelo 5", "Modelo 4"]
+    cursor = primera.headers["X-Next-Cursor"]
+
+    assert client.delete(f"/api/vehiculos/{primera.json()[-1]['id']}").status_code == 204
+    segunda = client.get("/api/vehiculos/", params={"sort": "-modelo", "limit": 2, "cursor": cursor})
+    assert [v["modelo"] for v in segunda.json()] == ["Modelo 3", "Modelo 2"]
+    assert "X-Next-Cursor" in segunda.headers
+
+    otro_orden = client.get("/api/vehiculos/", params={"sort": "color", "cursor": cursor})
+    assert otro_orden.status_code == 400
+    assert otro_orden.json()["detail"] == "El cursor pertenece a un listado con otro orden."
+    por_id = client.get("/api/vehiculos/", params={"limit": 2}).headers["X-Next-Cursor"]
+    assert client.get("/api/vehiculos/", params={"sort": "-modelo", "cursor": por_id}).status_code == 400
+
+
+# ==================== TESTS DE CREACIÓN POR LOTES ====================
+
+def test_crear_marcas_lote_reporta_duplicados() -> None:
+    """Los duplicados (en BD o dentro del lote) se reportan por índice sin abortar el lote."""
+    client.post("/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"})
+
+    with contar_consultas() as sentencias:
+        response = client.post(
+            "/api/marcas/bulk",
+            json=[
+                {"nombre_marca": "Ford", "pais": "EE.UU."},
+                {"nombre_marca": "Toyota", "pais": "Japón"},
+                {"nombre_marca": "Kia", "pais": "Corea"},
+                {"nombre_marca": "Ford", "pais": "EE.UU."},
+            ],
+        )
+    assert response.status_code == 201
+    assert len([s for s in sentencias if s.lstrip().upper().startswith("INSERT")]) == 1
+    data = response.json()
+    assert [m["nombre_marca"] for m in data["creados"]] == ["Ford", "Kia"]
+    assert [e["indice"] for e in data["errores"]] == [1, 3]
+    assert len(client.get("/api/marcas/").json()) == 3
+
+
+def test_crear_vehiculos_lote_valida_marcas_en_una_consulta() -> None:
+    """El lote de vehículos valida todas las marcas referenciadas con una sola consulta."""
+    marca_id = client.post("/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"}).json()["id"]
+    lote = [
+        {"modelo": f"Modelo {i}", "marca_id": marca_id, "numero_puertas": 4, "color": "Rojo"}
+        for i in range(50)
+    ]
+    lote.insert(10, {"modelo": "Fantasma", "marca_id": 999, "numero_puertas": 2, "color": "Negro"})
+
+    with contar_consultas() as sentencias:
+        response = client.post("/api/vehiculos/bulk", json=lote)
+    assert response.status_code == 201
+    data = response.json()
+    assert len(data["creados"]) == 50
+    assert data["errores"] == [{"indice": 10, "detalle": "Marca no encontrada."}]
+    assert data["creados"][0]["marca"]["nombre_marca"] == "Toyota"
+    assert [v["modelo"] for v in data["creados"]][:11] == [f"Modelo {i}" for i in range(11)]
+    assert len([s for s in sentencias if "FROM marcas" in s]) == 1
+    assert len(client.get("/api/vehiculos/").json()) == 50
+
+
+def test_listados_json_rapido_equivalen_a_response_model(monkeypatch) -> None:
+    """Con FAST_JSON los listados producen el mismo JSON y las mismas cabeceras."""
+    _crear_vehiculos_con_propietarios(3)
+    rutas = ["/api/marcas/", "/api/personas/", "/api/vehiculos/"]
+    normales = [client.get(ruta, params={"limit": 2}) for ruta in rutas]
+
+    monkeypatch.setattr(settings, "fast_json", True)
+    for ruta, normal in zip(rutas, normales):
+        rapida = client.get(ruta, params={"limit": 2})
+        assert rapida.status_code == 200
+        assert rapida.headers["content-type"] == "application/json"
+        assert rapida.json() == normal.json()
+        assert rapida.headers.get("X-Next-Cursor") == normal.headers.get("X-Next-Cursor")
+        assert rapida.headers["ETag"] == normal.headers["ETag"]
+
+
+# ==================== TESTS DE EXPORTACIÓN ====================
+
+def test_exportar_vehiculos_ndjson_y_csv() -> None:
+    """La exportación incluye marca y cédulas de propietarios en ambos formatos."""
+    _crear_vehiculos_con_propietarios(3)
+    persona_id = client.post("/api/personas/", json={"nombre": "Ana", "cedula": "99999"}).json()["id"]
+    client.post("/api/vehiculos/1/propietarios/", json={"persona_id": persona_id})
+
+    response = client.get("/api/vehiculos/export", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    filas = [json.loads(linea) for linea in response.text.splitlines()]
+    assert [f["id"] for f in filas] == [1, 2, 3]
+    assert filas[0]["nombre_marca"] == "Toyota"
+    assert sorted(filas[0]["propietarios_cedulas"]) == ["10000000", "99999"]
+
+    response = client.get("/api/vehiculos/export", params={"format": "csv"})
+    assert response.status_code == 200
+    lineas = response.text.splitlines()
+    assert lineas[0] == "id,modelo,marca_id,nombre_marca,numero_puertas,color,propietarios_cedulas"
+    assert len(lineas) == 4
+    assert lineas[2] == "2,Modelo 1,1,Toyota,4,Rojo,10000001"
+
+
+def test_exportar_vehiculos_formato_invalido() -> None:
+    """Un formato no soportado se rechaza con 422."""
+    response = client.get("/api/vehiculos/export", params={"format": "xml"})
+    assert response.status_code == 422
+
+
+# ==================== TESTS DE CACHÉ DE MARCAS ====================
+
+def test_cache_marcas_evita_consultas_y_se_invalida() -> None:
+    """Validar la marca al crear vehículos no consulta la BD y ve las actualizaciones.
+
+    ``GET /api/marcas/{id}`` no pasa por la caché: el contador sale de la base de datos.
+    """
+    marca_id = client.post("/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"}).json()["id"]
+    vehiculo = {"modelo": "Corolla", "marca_id": marca_id, "numero_puertas": 4, "color": "Rojo"}
+    hits_iniciales = client.get("/cache/marcas").json()["hits"]
+
+    with contar_consultas() as sentencias:
+        assert client.post("/api/vehiculos/", json=vehiculo).status_code == 201
+    assert not any(s.startswith("SELECT marcas.id") for s in sentencias)
+    assert client.get("/cache/marcas").json()["hits"] == hits_iniciales + 1
+
+    client.put(f"/api/marcas/{marca_id}", json={"pais": "Japan"})
+    with contar_consultas() as sentencias:
+        creado = client.post("/api/vehiculos/", json=vehiculo).json()
+    assert creado["marca"]["pais"] == "Japan"
+    assert not any(s.startswith("SELECT marcas.id") for s in sentencias)
+    assert client.get(f"/api/marcas/{marca_id}").json()["vehiculo_count"] == 2
+
+    client.delete(f"/api/marcas/{marca_id}")
+    assert client.post("/api/vehiculos/", json=vehiculo).status_code == 404
+
+
+def test_estadisticas_del_pool() -> None:
+    """``GET /db/pool`` expone el estado del pool del proceso y su histograma de esperas."""
+    stats = client.get("/db/pool").json()["sync"]
+    assert stats["size"] == settings.db_pool_size
+    assert {"checked_out", "overflow", "timeouts", "wait_seconds"} <= stats.keys()
+    assert "+Inf" in stats["wait_seconds"]["buckets"]
+
+
+def _leer_metricas() -> dict:
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return dict(
+        linea.rsplit(" ", 1) for linea in response.text.splitlines() if not linea.startswith("#")
+    )
+
+
+def test_metricas_por_ruta_y_por_tipo_de_sentencia() -> None:
+    """``GET /metrics`` agrupa por plantilla de ruta y mide las sentencias SQL por tipo."""
+    ruta = 'method="GET",route="/api/marcas/{marca_id}"'
+    insert = 'db_statement_duration_seconds_count{type="insert"}'
+    antes = _leer_metricas()
+    marca_id = client.post("/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"}).json()["id"]
+    client.get(f"/api/marcas/{marca_id}")
+    client.get("/api/marcas/999")
+    despues = _leer_metricas()
+
+    def incremento(serie: str) -> float:
+        return float(despues.get(serie, 0)) - float(antes.get(serie, 0))
+
+    assert incremento(f'http_requests_total{{{ruta},status="200"}}') == 1
+    assert incremento(f'http_requests_total{{{ruta},status="404"}}') == 1
+    assert incremento(f"http_request_duration_seconds_count{{{ruta}}}") == 2
+    assert incremento(insert) >= 1
+    # La propia petición a /metrics está en curso mientras se genera
+    assert despues["http_requests_in_progress"] == "1"
+
+
+def test_cabeceras_de_consumo_de_base_de_datos() -> None:
+    """Cada respuesta informa sus sentencias SQL en ``X-DB-Queries`` y ``Server-Timing``."""
+    _crear_vehiculos_con_propietarios(1)
+    response = client.get("/api/vehiculos/1")
+    assert response.headers["X-DB-Queries"] == "1"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="consultas=1"' in response.headers["Server-Timing"]
+    assert client.get("/metrics").headers["X-DB-Queries"] == "0"
+
+
+def test_presupuesto_de_consultas_detecta_n_mas_1(caplog) -> None:
+    """Una ruta que consulta por cada elemento supera su presupuesto: aviso o excepción."""
+    mini = FastAPI()
+
+    @mini.get("/marcas/{cantidad}")
+    @presupuesto_consultas(2)
+    def marcas_una_a_una(cantidad: int) -> int:
+        with engine.connect() as conn:
+            for _ in range(cantidad):
+                conn.execute(select(MarcaVehiculoDB.id).limit(1))
+        return cantidad
+
+    estricto = TestClient(ConsumoBDMiddleware(mini, estricto=True))
+    assert estricto.get("/marcas/2").headers["X-DB-Queries"] == "2"
+    with pytest.raises(PresupuestoConsultasExcedido, match="/marcas/{cantidad} emitió 3"):
+        estricto.get("/marcas/3")
+
+    with caplog.at_level("WARNING", logger="app.api.middleware"):
+        response = TestClient(ConsumoBDMiddleware(mini, estricto=False)).get("/marcas/3")
+    assert response.status_code == 200
+    assert "presupuesto: 2" in caplog.text
+
+
+def test_repositorios_de_la_peticion_agrupan_y_memorizan_lecturas() -> None:
+    """Las lecturas por id se agrupan en un ``IN`` y no se repiten dentro de la petición."""
+    personas = [{"nombre": f"Persona {i}", "cedula": f"8000{i:04d}"} for i in range(3)]
+    ids = [p["id"] for p in client.post("/api/personas/bulk", json=personas).json()["creados"]]
+    db = TestingSessionLocal()
+    try:
+        repos = get_repositorios(db)
+        with contar_consultas() as sentencias:
+            assert [p.id for p in repos.personas.get_many(ids[:2])] == ids[:2]
+            assert repos.personas.get(ids[0]).nombre == "Persona 0"
+            assert repos.personas.get(99999) is None
+            assert repos.personas.get(99999) is None
+            assert repos.personas.exists_many([ids[0], ids[1], 99999]) == {ids[0], ids[1]}
+        assert len([s for s in sentencias if s.startswith("SELECT personas.id")]) == 2
+
+        with contar_consultas() as sentencias:
+            repos.personas.update(ids[0], {"nombre": "Renombrada"})
+            assert repos.personas.get(ids[0]).nombre == "Renombrada"
+        assert sentencias[-1].startswith("SELECT")
+    finally:
+        db.close()
+
+
+# ==================== TESTS DE ETAG ====================
+
+def test_get_condicional_vehiculo_responde_304_sin_cargar_relaciones() -> None:
+    """Con el ETag vigente se responde 304 con una única consulta de versión."""
+    _crear_vehiculos_con_propietarios(1)
+    response = client.get("/api/vehiculos/1")
+    etag = response.headers["ETag"]
+
+    with contar_consultas() as sentencias:
+        condicional = client.get("/api/vehiculos/1", headers={"If-None-Match": etag})
+    assert condicional.status_code == 304
+    assert condicional.headers["ETag"] == etag
+    assert condicional.content == b""
+    assert len(sentencias) == 1
+
+    # Editar a un propietario cambia la representación del vehículo
+    client.put("/api/personas/1", json={"nombre": "Otro nombre"})
+    cambiado = client.get("/api/vehiculos/1", headers={"If-None-Match": etag})
+    assert cambiado.status_code == 200
+    assert cambiado.headers["ETag"] != etag
+    assert cambiado.json()["propietarios"][0]["nombre"] == "Otro nombre"
+
+
+def test_etag_en_listados_y_personas() -> None:
+    """Los listados y las personas también publican ETag y aceptan If-None-Match."""
+    persona_id = client.post("/api/personas/", json={"nombre": "Ana", "cedula": "55555"}).json()["id"]
+
+    listado = client.get("/api/personas/")
+    assert client.get("/api/personas/", headers={"If-None-Match": listado.headers["ETag"]}).status_code == 304
+
+    etag = client.get(f"/api/personas/{persona_id}").headers["ETag"]
+    assert client.get(f"/api/personas/{persona_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/api/personas/", json={"nombre": "Luis", "cedula": "66666"})
+    assert client.get("/api/personas/", headers={"If-None-Match": listado.headers["ETag"]}).status_code == 200
+
+
+def test_put_con_if_match_detecta_actualizaciones_perdidas() -> None:
+    """Un If-Match desactualizado se rechaza con 412 y no modifica el registro."""
+    marca = client.post("/api/marcas/", json={"nombre_marca": "Kia", "pais": "Corea"})
+    marca_id = marca.json()["id"]
+    etag = client.get(f"/api/marcas/{marca_id}").headers["ETag"]
+
+    primera = client.put(f"/api/marcas/{marca_id}", json={"pais": "Corea del Sur"}, headers={"If-Match": etag})
+    assert primera.status_code == 200
+    assert primera.headers["ETag"] != etag
+
+    segunda = client.put(f"/api/marcas/{marca_id}", json={"pais": "Otro"}, headers={"If-Match": etag})
+    assert segunda.status_code == 412
+    assert client.get(f"/api/marcas/{marca_id}").json()["pais"] == "Corea del Sur"
+
+    assert client.put("/api/marcas/999", json={"pais": "X"}, headers={"If-Match": etag}).status_code == 404
+
+
+# ==================== TESTS DE ESTADÍSTICAS ====================
+
+def test_estadisticas_de_vehiculos() -> None:
+    """Los agregados coinciden con los datos e incluyen los grupos vacíos."""
+    toyota = client.post("/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"}).json()["id"]
+    mazda = client.post("/api/marcas/", json={"nombre_marca": "Mazda", "pais": "Japón"}).json()["id"]
+    ford = client.post("/api/marcas/", json={"nombre_marca": "Ford", "pais": "EE.UU."}).json()["id"]
+    client.post("/api/marcas/", json={"nombre_marca": "Lada", "pais": "Rusia"})
+    ana = client.post("/api/personas/", json={"nombre": "Ana", "cedula": "11111"}).json()["id"]
+    luis = client.post("/api/personas/", json={"nombre": "Luis", "cedula": "22222"}).json()["id"]
+    client.post("/api/vehiculos/bulk", json=[
+        {"modelo": "Corolla", "marca_id": toyota, "numero_puertas": 4, "color": "Rojo"},
+        {"modelo": "Hilux", "marca_id": toyota, "numero_puertas": 2, "color": "Blanco"},
+        {"modelo": "CX-5", "marca_id": mazda, "numero_puertas": 4, "color": "Rojo"},
+        {"modelo": "Fiesta", "marca_id": ford, "numero_puertas": 4, "color": "Azul"},
+    ])
+    client.put("/api/vehiculos/1", json={"propietarios_ids": [ana, luis]})
+    client.put("/api/vehiculos/2", json={"propietarios_ids": [ana]})
+
+    por_marca = client.get("/api/stats/vehiculos/por-marca").json()
+    assert [(m["nombre_marca"], m["total"]) for m in por_marca] == [
+        ("Toyota", 2), ("Mazda", 1), ("Ford", 1), ("Lada", 0)
+    ]
+    assert client.get("/api/stats/vehiculos/por-marca", params={"limit": 1}).json()[0]["pais"] == "Japón"
+    assert client.get("/api/stats/vehiculos/por-pais").json() == [
+        {"valor": "Japón", "total": 3}, {"valor": "EE.UU.", "total": 1}, {"valor": "Rusia", "total": 0}
+    ]
+    assert client.get("/api/stats/vehiculos/por-color").json() == [
+        {"valor": "Rojo", "total": 2}, {"valor": "Azul", "total": 1}, {"valor": "Blanco", "total": 1}
+    ]
+    assert client.get("/api/stats/vehiculos/por-puertas").json() == [
+        {"valor": 2, "total": 1}, {"valor": 4, "total": 3}
+    ]
+    assert client.get("/api/stats/vehiculos/por-propietarios").json() == [
+        {"valor": 0, "total": 2}, {"valor": 1, "total": 1}, {"valor": 2, "total": 1}
+    ]
+
+
+def test_estadisticas_en_una_consulta_y_dentro_del_presupuesto() -> None:
+    """Cada agregado es una sola sentencia y responde en menos de 250 ms sobre 20.000 vehículos."""
+    from benchmarks.datos import poblar
+
+    poblar(engine, vehiculos=20_000, marcas=200)
+    for ruta in ("por-marca", "por-pais", "por-color", "por-puertas", "por-propietarios"):
+        tiempos = []
+        for _ in range(3):
+            with contar_consultas() as sentencias:
+                inicio = time.perf_counter()
+                response = client.get(f"/api/stats/vehiculos/{ruta}")
+                tiempos.append(time.perf_counter() - inicio)
+            assert response.status_code == 200
+            assert len(sentencias) == 1
+        assert sorted(tiempos)[1] < 0.25, ruta
+    assert sum(c["total"] for c in client.get("/api/stats/vehiculos/por-puertas").json()) == 20_000
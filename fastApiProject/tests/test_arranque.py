@@ -0,0 +1,69 @@
+"""
+Tests del coste de arranque de un worker: importar ``main`` en un intérprete nuevo.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Segundos que puede tardar ``import main`` en frío; ajustable en máquinas lentas
+PRESUPUESTO_IMPORTACION = float(os.getenv("IMPORT_TIME_BUDGET", "3.0"))
+
+# Módulos que solo hacen falta al conectar o al migrar, no para importar la aplicación
+DIFERIDOS = ("psycopg2", "asyncpg", "aiosqlite", "alembic")
+
+
+def _importar(codigo: str) -> subprocess.CompletedProcess:
+    entorno = {k: v for k, v in os.environ.items() if k not in ("DB_ASYNC", "DB_REPLICA_URLS")}
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ,
+        env=entorno,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+    )
+
+
+def test_importar_main_no_crea_motores_ni_carga_drivers() -> None:
+    """Los motores se crean en el primer ``get_db``; importar no conecta ni carga alembic."""
+    salida = _importar(
+        "import json, sys, main\n"
+        "from app.infrastructure.db import session\n"
+        "motores = [session.get_engine, session.get_async_engine, session.get_sessionmaker]\n"
+        "print(json.dumps({\n"
+        "    'modulos': sorted({m.split('.')[0] for m in sys.modules}),\n"
+        "    'motores': sum(f.cache_info().currsize for f in motores),\n"
+        "}))\n"
+    )
+    resultado = json.loads(salida.stdout)
+    assert [m for m in DIFERIDOS if m in resultado["modulos"]] == []
+    assert resultado["motores"] == 0
+
+
+def test_importar_main_dentro_del_presupuesto() -> None:
+    """``python -X importtime``: el tiempo acumulado de ``main`` no supera el presupuesto."""
+    salida = _importar("import main")
+    acumulado_us = next(
+        int(coincidencia.group(1))
+        for linea in salida.stderr.splitlines()
+        if (coincidencia := re.match(r"import time:\s+\d+ \|\s+(\d+) \| main$", linea))
+    )
+    lentos = sorted(
+        (
+            (int(m.group(1)), m.group(2))
+            for m in re.finditer(r"import time:\s+\d+ \|\s+(\d+) \| {2,3}(\S+)\n", salida.stderr)
+        ),
+        reverse=True,
+    )[:5]
+    assert acumulado_us / 1e6 <= PRESUPUESTO_IMPORTACION, (
+        f"import main tardó {acumulado_us / 1e6:.2f} s (presupuesto: "
+        f"{PRESUPUESTO_IMPORTACION:.2f} s); importaciones más lentas: {lentos}"
+    )
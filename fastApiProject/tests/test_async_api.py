@@ -0,0 +1,173 @@
+"""
+Tests de la pila asíncrona (AsyncSession + rutas ``async def``).
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import AsyncGenerator, Generator, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("aiosqlite")
+
+from app.api.dependencies import get_async_repositorios
+from app.api.middleware import ConsumoBDMiddleware
+from app.api.routes import async_estadisticas, async_marcas, async_personas, async_vehiculos
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.models import PersonaDB
+from app.infrastructure.db.session import get_async_db
+from app.infrastructure.metricas import instrumentar_motor
+
+
+@pytest.fixture
+def client(tmp_path) -> Generator[TestClient, None, None]:
+    """Aplicación con las rutas asíncronas sobre un SQLite temporal."""
+    database_path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(bind=sync_engine)
+
+    # NullPool: cada sesión abre su conexión en el bucle de eventos que la usa
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    instrumentar_motor(async_engine.sync_engine)
+    AsyncTestingSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_async_db() -> AsyncGenerator:
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.add_middleware(ConsumoBDMiddleware)
+    app.include_router(async_marcas.router)
+    app.include_router(async_personas.router)
+    app.include_router(async_vehiculos.router)
+    app.include_router(async_estadisticas.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    yield TestClient(app)
+
+    Base.metadata.drop_all(bind=sync_engine)
+    sync_engine.dispose()
+
+
+def test_flujo_completo_async(client: TestClient) -> None:
+    """Flujo CRUD con relaciones sobre las rutas asíncronas."""
+    marca_id = client.post("/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"}).json()["id"]
+    persona_id = client.post(
+        "/api/personas/", json={"nombre": "Juan Pérez", "cedula": "123456789"}
+    ).json()["id"]
+
+    response = client.post(
+        "/api/vehiculos/",
+        json={"modelo": "Corolla", "marca_id": marca_id, "numero_puertas": 4, "color": "Rojo"},
+    )
+    assert response.status_code == 201
+    vehiculo_id = response.json()["id"]
+    assert response.json()["marca"]["nombre_marca"] == "Toyota"
+
+    response = client.post(f"/api/vehiculos/{vehiculo_id}/propietarios/", json={"persona_id": persona_id})
+    assert response.status_code == 201
+    assert [p["id"] for p in response.json()["propietarios"]] == [persona_id]
+
+    response = client.put(f"/api/vehiculos/{vehiculo_id}", json={"color": "Verde", "propietarios_ids": []})
+    assert response.status_code == 200
+    assert response.json()["color"] == "Verde"
+    assert response.json()["propietarios"] == []
+
+    client.post(f"/api/vehiculos/{vehiculo_id}/propietarios/", json={"persona_id": persona_id})
+    vehiculos = client.get(f"/api/personas/{persona_id}/vehiculos/").json()
+    assert [v["id"] for v in vehiculos] == [vehiculo_id]
+    assert vehiculos[0]["propietario_count"] == 1
+    assert client.get(f"/api/personas/{persona_id}").json()["vehiculo_count"] == 1
+    assert client.get(f"/api/marcas/{marca_id}").json()["vehiculo_count"] == 1
+    encontradas = client.get("/api/personas/search", params={"q": "perez"}).json()
+    assert [p["id"] for p in encontradas] == [persona_id]
+    assert client.get("/api/stats/vehiculos/por-marca").json()[0]["total"] == 1
+    assert client.get("/api/stats/vehiculos/por-propietarios").json() == [{"valor": 1, "total": 1}]
+
+    assert client.delete(f"/api/marcas/{marca_id}").status_code == 204
+    assert client.get(f"/api/vehiculos/{vehiculo_id}").status_code == 404
+    assert client.get("/api/marcas/").json() == []
+
+
+def test_errores_async(client: TestClient) -> None:
+    """Los errores de dominio se traducen igual que en la pila síncrona."""
+    response = client.post(
+        "/api/vehiculos/",
+        json={"modelo": "Corolla", "marca_id": 999, "numero_puertas": 4, "color": "Rojo"},
+    )
+    assert response.status_code == 404
+
+    payload = {"nombre": "Juan Pérez", "cedula": "123456789"}
+    assert client.post("/api/personas/", json=payload).status_code == 201
+    assert client.post("/api/personas/", json=payload).status_code == 400
+
+
+def test_etag_async(client: TestClient) -> None:
+    """If-None-Match e If-Match funcionan igual sobre las rutas asíncronas."""
+    marca_id = client.post("/api/marcas/", json={"nombre_marca": "Toyota", "pais": "Japón"}).json()["id"]
+    vehiculo_id = client.post(
+        "/api/vehiculos/",
+        json={"modelo": "Corolla", "marca_id": marca_id, "numero_puertas": 4, "color": "Rojo"},
+    ).json()["id"]
+
+    response = client.get(f"/api/vehiculos/{vehiculo_id}")
+    assert response.headers["X-DB-Queries"] == "1"
+    etag = response.headers["ETag"]
+    assert client.get(f"/api/vehiculos/{vehiculo_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    response = client.put(f"/api/vehiculos/{vehiculo_id}", json={"color": "Azul"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    response = client.put(f"/api/vehiculos/{vehiculo_id}", json={"color": "Gris"}, headers={"If-Match": etag})
+    assert response.status_code == 412
+
+
+def test_cargas_concurrentes_se_agrupan_en_una_consulta(tmp_path) -> None:
+    """Las cargas por id lanzadas a la vez con ``gather`` se resuelven con un único ``IN``."""
+    database_path = tmp_path / "cargador.db"
+    sync_engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    with sync_engine.begin() as conn:
+        conn.execute(
+            PersonaDB.__table__.insert(),
+            [{"nombre": f"Persona {i}", "cedula": f"9000{i:04d}"} for i in range(1, 4)],
+        )
+
+    async def escenario() -> List[List[str]]:
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+        sentencias: List[str] = []
+
+        def _registrar(conn, cursor, statement, parameters, context, executemany) -> None:
+            if statement.startswith("SELECT personas.id"):
+                sentencias.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", _registrar)
+        try:
+            async with AsyncSession(async_engine, expire_on_commit=False) as db:
+                repos = get_async_repositorios(db)
+                personas = await asyncio.gather(
+                    repos.personas.get(1), repos.personas.get(3), repos.personas.get(1),
+                    repos.personas.get(99),
+                )
+                assert [p.id if p else None for p in personas] == [1, 3, 1, None]
+                primera = list(sentencias)
+                assert await repos.personas.exists_many([1, 3, 99]) == {1, 3}
+                assert (await repos.personas.get(3)).nombre == "Persona 3"
+        finally:
+            await async_engine.dispose()
+        return [primera, sentencias]
+
+    primera, todas = asyncio.run(escenario())
+    assert len(primera) == 1
+    assert todas == primera
+    sync_engine.dispose()
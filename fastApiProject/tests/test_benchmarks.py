@@ -0,0 +1,73 @@
+"""
+Tests del generador de datos y de la prueba de carga (``benchmarks/``).
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from collections import Counter
+from dataclasses import replace
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.infrastructure.db.models import VehiculoDB, vehiculo_propietario
+from app.infrastructure.db.repositories._contadores import reconciliar_contadores
+from app.infrastructure.db.session import _build_engine
+from benchmarks.carga import ESCENARIOS, cliente_en_proceso, comparar, maximos_ids, medir
+from benchmarks.datos import poblar
+
+
+def test_poblar_reparte_propietarios_y_deja_contadores_coherentes(tmp_path) -> None:
+    """El reparto fija cuántos propietarios tiene cada vehículo; se puede poblar dos veces."""
+    engine = _build_engine(f"sqlite:///{tmp_path / 'datos.db'}")
+    poblar(engine, 2_000, marcas=20, personas=500, reparto=(0.25, 0.5, 0.25), lote=700)
+    poblar(engine, 1_000, marcas=5, personas=100, semilla=1, reparto=(0.25, 0.5, 0.25))
+
+    with engine.connect() as conn:
+        por_vehiculo = Counter(
+            conn.execute(
+                select(func.count(vehiculo_propietario.c.persona_id))
+                .select_from(VehiculoDB)
+                .outerjoin(vehiculo_propietario)
+                .group_by(VehiculoDB.id)
+            ).scalars()
+        )
+    assert sum(por_vehiculo.values()) == 3_000
+    assert set(por_vehiculo) == {0, 1, 2}
+    assert 0.4 < por_vehiculo[1] / 3_000 < 0.6
+    assert maximos_ids(engine) == {"marcas": 25, "personas": 600, "vehiculos": 3_000}
+    assert all(reparadas == 0 for reparadas in reconciliar_contadores(engine).values())
+    engine.dispose()
+
+
+def test_carga_en_proceso_mide_escenarios_y_detecta_regresiones(tmp_path) -> None:
+    """Cada escenario reporta latencias y consultas; la comparación marca los empeoramientos."""
+    database_url = f"sqlite:///{tmp_path / 'carga.db'}"
+    engine = _build_engine(database_url)
+    poblar(engine, 300, marcas=10, personas=150)
+    cliente, restaurar = cliente_en_proceso(engine, database_url)
+
+    async def ejecutar():
+        async with cliente:
+            return await medir(cliente, maximos_ids(engine), 8, 2, calentamiento=2)
+
+    try:
+        resultados = asyncio.run(ejecutar())
+    finally:
+        restaurar()
+        engine.dispose()
+
+    assert list(resultados) == [nombre for nombre, _, _ in ESCENARIOS]
+    for nombre, resultado in resultados.items():
+        assert resultado.peticiones == 8 and resultado.errores == 0, nombre
+        assert 0 < resultado.p50_ms <= resultado.p95_ms <= resultado.p99_ms, nombre
+    assert resultados["personas"].consultas_por_peticion == 1
+    assert resultados["vehiculo"].consultas_por_peticion == 1
+
+    base = {nombre: vars(r) for nombre, r in resultados.items()}
+    assert comparar(resultados, base, tolerancia=0.25) == []
+    peor = dict(resultados, vehiculo=replace(resultados["vehiculo"], consultas_por_peticion=3))
+    assert comparar(peor, base, tolerancia=0.25) == ["vehiculo: 1.0 -> 3.0 consultas/petición"]
@@ -0,0 +1,103 @@
+"""
+Tests del cargador masivo fuera de línea (``cargar_datos.py``).
+"""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.loader import CargadorMasivo
+from app.infrastructure.db.models import (
+    MarcaVehiculoDB,
+    PersonaDB,
+    VehiculoDB,
+    vehiculo_propietario,
+)
+from app.infrastructure.db.repositories._contadores import reconciliar_contadores
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'carga.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def archivos(tmp_path):
+    marcas = tmp_path / "marcas.csv"
+    marcas.write_text("nombre_marca,pais\nToyota,Japón\nFord,EE.UU.\nToyota,Japón\n", encoding="utf-8")
+    personas = tmp_path / "personas.ndjson"
+    personas.write_text(
+        "\n".join(
+            json.dumps({"nombre": f"Persona {i}", "cedula": f"3000{i:04d}"}) for i in range(20)
+        )
+        + '\n{"nombre": "Sin cédula"}\n',
+        encoding="utf-8",
+    )
+    vehiculos = tmp_path / "vehiculos.csv"
+    filas = ["modelo,nombre_marca,numero_puertas,color,propietarios_cedulas"]
+    filas += [f"Modelo {i},Toyota,4,Rojo,3000{i:04d};3000{(i + 1) % 20:04d}" for i in range(20)]
+    filas += ["Fantasma,Lada,4,Gris,", "Puertas,Ford,9,Azul,"]
+    vehiculos.write_text("\n".join(filas) + "\n", encoding="utf-8")
+    return {"marcas": marcas, "personas": personas, "vehiculos": vehiculos}
+
+
+def _contar(engine, tabla) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(tabla))
+
+
+def test_carga_completa_con_pool_de_procesos(engine, archivos) -> None:
+    """Carga los tres archivos validando en procesos y reporta las filas rechazadas."""
+    resumen = CargadorMasivo(engine, workers=2, batch_size=7).cargar(archivos)
+
+    assert resumen.insertadas == {"marcas": 2, "personas": 20, "vehiculos": 20}
+    assert resumen.rechazadas == {"marcas": 0, "personas": 1, "vehiculos": 2}
+    assert _contar(engine, MarcaVehiculoDB.__table__) == 2
+    assert _contar(engine, PersonaDB.__table__) == 20
+    assert _contar(engine, VehiculoDB.__table__) == 20
+    assert _contar(engine, vehiculo_propietario) == 40
+    # La carga mantiene los contadores: no queda nada que reconciliar
+    assert reconciliar_contadores(engine) == {"marcas": 0, "personas": 0, "vehiculos": 0}
+
+
+def test_carga_reanuda_desde_checkpoint(engine, archivos, tmp_path) -> None:
+    """Con checkpoint, una segunda ejecución no vuelve a insertar lo ya confirmado."""
+    checkpoint = tmp_path / "carga.json"
+    CargadorMasivo(engine, workers=1, batch_size=5, checkpoint=checkpoint).cargar(archivos)
+    assert checkpoint.exists()
+
+    resumen = CargadorMasivo(engine, workers=1, batch_size=5, checkpoint=checkpoint).cargar(archivos)
+
+    assert resumen.insertadas == {"marcas": 0, "personas": 0, "vehiculos": 0}
+    assert _contar(engine, VehiculoDB.__table__) == 20
+
+
+def test_carga_csv_con_saltos_de_linea_entre_comillas(engine, archivos, tmp_path, caplog) -> None:
+    """Un campo entre comillas puede abarcar varias líneas; los errores citan la línea inicial."""
+    vehiculos = tmp_path / "multilinea.csv"
+    vehiculos.write_text(
+        "modelo,nombre_marca,numero_puertas,color,propietarios_cedulas\n"
+        '"Corolla\nedición ""especial""",Toyota,4,Rojo,30000001\n'
+        "Puertas,Ford,9,Azul,\n",
+        encoding="utf-8",
+    )
+    cargador = CargadorMasivo(engine, workers=1, batch_size=1)
+    cargador.cargar({"marcas": archivos["marcas"], "personas": archivos["personas"]})
+
+    with caplog.at_level("WARNING"):
+        resumen = cargador.cargar({"vehiculos": vehiculos})
+
+    assert (resumen.insertadas["vehiculos"], resumen.rechazadas["vehiculos"]) == (1, 1)
+    with engine.connect() as conn:
+        assert conn.scalar(select(VehiculoDB.modelo)) == 'Corolla\nedición "especial"'
+    assert "multilinea.csv línea 4 rechazada" in caplog.text
@@ -0,0 +1,75 @@
+"""
+Tests de las migraciones de esquema (``migrations/``).
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.schema import (
+    alembic_config,
+    downgrade,
+    esquema_actualizado,
+    filtro_autogenerate,
+    upgrade,
+)
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'migraciones.db'}"
+
+
+def _diferencias(engine):
+    with engine.connect() as conn:
+        contexto = MigrationContext.configure(
+            conn, opts={"include_object": filtro_autogenerate(conn.dialect.name)}
+        )
+        return compare_metadata(contexto, Base.metadata)
+
+
+def test_upgrade_crea_el_esquema_de_los_modelos_y_downgrade_lo_elimina(database_url) -> None:
+    engine = create_engine(database_url)
+    upgrade(database_url)
+    try:
+        assert _diferencias(engine) == []
+        with engine.connect() as conn:
+            assert esquema_actualizado(conn)
+        indices = {i["name"] for i in inspect(engine).get_indexes("vehiculo_propietario")}
+        assert "ix_vehiculo_propietario_persona_id" in indices
+
+        downgrade(database_url, "base")
+        assert set(inspect(engine).get_table_names()) == {"alembic_version"}
+    finally:
+        engine.dispose()
+
+
+def test_base_creada_con_create_all_se_incorpora_con_stamp(database_url) -> None:
+    """Una base anterior a las migraciones se marca en 0001 y se actualiza sin errores."""
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO personas (nombre, cedula) VALUES ('Ana Ruiz', '12345')"))
+        conn.execute(text("DROP TABLE personas_fts"))
+    try:
+        command.stamp(alembic_config(database_url), "0001")
+        with engine.connect() as conn:
+            assert not esquema_actualizado(conn)
+        upgrade(database_url)
+        assert _diferencias(engine) == []
+        with engine.connect() as conn:
+            encontrada = conn.scalar(
+                text("SELECT rowid FROM personas_fts WHERE personas_fts MATCH 'ruiz'")
+            )
+        assert encontrada == 1
+    finally:
+        engine.dispose()
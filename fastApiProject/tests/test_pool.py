@@ -0,0 +1,57 @@
+"""
+Tests de la configuración y las estadísticas del pool de conexiones.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import NullPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import Settings
+from app.infrastructure.db.pool import QueuePoolMedido, estadisticas_pool, opciones_pool
+
+
+def test_opciones_pool_desde_la_configuracion(monkeypatch) -> None:
+    """``DB_POOL_*`` llega al motor y ``DB_PGBOUNCER`` desactiva pool y sentencias preparadas."""
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    opciones = opciones_pool("postgresql+psycopg2://u:p@db/x", Settings())
+    assert opciones["poolclass"] is QueuePoolMedido
+    assert (opciones["pool_size"], opciones["max_overflow"]) == (20, 0)
+    assert opciones["pool_pre_ping"] is False
+
+    monkeypatch.setenv("DB_PGBOUNCER", "true")
+    opciones = opciones_pool("postgresql+asyncpg://u:p@db/x", Settings(), asincrono=True)
+    assert opciones["poolclass"] is NullPool
+    assert opciones["connect_args"]["statement_cache_size"] == 0
+    assert opciones["connect_args"]["prepared_statement_cache_size"] == 0
+
+
+def test_estadisticas_registran_conexiones_en_uso_y_esperas_agotadas(tmp_path) -> None:
+    """Con el pool lleno, la espera agota ``pool_timeout`` y queda contada."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=QueuePoolMedido,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    conexiones = [engine.connect(), engine.connect()]
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    stats = estadisticas_pool(engine)
+    assert (stats["checked_out"], stats["overflow"], stats["timeouts"]) == (2, 1, 1)
+    assert stats["wait_seconds"]["count"] == 3
+    assert stats["wait_seconds"]["buckets"]["0.025"] == 2
+
+    for conexion in conexiones:
+        conexion.close()
+    assert estadisticas_pool(engine)["checked_out"] == 0
+    engine.dispose()
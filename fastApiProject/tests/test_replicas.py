@@ -0,0 +1,194 @@
+"""
+Tests del enrutado de lecturas a réplicas.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, insert, select, update
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.api.middleware import COOKIE_LEER_PRIMARIA, ReplicasMiddleware
+from app.infrastructure.db.base import Base
+from app.infrastructure.cache import CachedMarcaRepository, TTLCache
+from app.infrastructure.db.models import MarcaVehiculoDB, PersonaDB, VehiculoDB
+from app.infrastructure.db.replicas import (
+    EnrutadorReplicas,
+    SesionEnrutada,
+    lectura_en_replica,
+    lee_de_primaria,
+)
+from app.infrastructure.db.repositories import (
+    AsyncSQLAlchemyVehiculoRepository,
+    SQLAlchemyMarcaRepository,
+)
+from app.infrastructure.db.session import get_db
+from main import app
+
+
+def _motor(tmp_path, nombre: str, persona: str):
+    engine = create_engine(f"sqlite:///{tmp_path / nombre}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(PersonaDB).values(id=1, nombre=persona, cedula="10000001"))
+        conn.execute(insert(MarcaVehiculoDB).values(id=1, nombre_marca="Vieja", pais="Japón"))
+    return engine
+
+
+def test_seleccion_por_turnos_y_por_menos_conexiones(tmp_path) -> None:
+    """Por turnos se alternan; con ``least_connections`` gana la de menos peticiones en curso."""
+    motores = [create_engine(f"sqlite:///{tmp_path / f'r{i}.db'}") for i in range(3)]
+    por_turnos = EnrutadorReplicas(motores)
+    elegidas = [por_turnos.elegir() for _ in range(4)]
+    assert [r.motor for r in elegidas] == motores + motores[:1]
+    assert [r.en_uso for r in por_turnos.replicas] == [2, 1, 1]
+
+    menos = EnrutadorReplicas(motores, "least_connections")
+    ocupadas = [menos.elegir() for _ in range(3)]
+    menos.liberar(ocupadas[1])
+    assert menos.elegir() is ocupadas[1]
+
+    with pytest.raises(ValueError, match="Estrategia de réplicas desconocida"):
+        EnrutadorReplicas(motores, "aleatoria")
+
+
+def test_replica_que_no_conecta_queda_expulsada(tmp_path) -> None:
+    """Un fallo de conexión saca la réplica durante la expulsión; sin réplicas, la primaria."""
+    caida = create_engine(f"sqlite:///{tmp_path / 'no' / 'existe.db'}")
+    sana = create_engine(f"sqlite:///{tmp_path / 'sana.db'}")
+    enrutador = EnrutadorReplicas([caida, sana], expulsion_segundos=60)
+
+    with pytest.raises(exc.OperationalError):
+        caida.connect()
+    assert [r.sana(time.monotonic()) for r in enrutador.replicas] == [False, True]
+    assert {enrutador.elegir().motor for _ in range(3)} == {sana}
+    assert enrutador.stats()[0]["failures"] == 1
+
+    enrutador.expulsar(enrutador.replicas[1])
+    assert enrutador.elegir() is None
+    enrutador.replicas[0].expulsada_hasta = 0.0
+    assert enrutador.elegir().motor is caida
+
+
+def test_sesion_lee_de_la_replica_y_escribe_en_la_primaria(tmp_path) -> None:
+    """Las lecturas van a la réplica hasta la primera escritura; después, todo a la primaria."""
+    primaria = _motor(tmp_path, "primaria.db", "Primaria")
+    replica = _motor(tmp_path, "replica.db", "Réplica")
+    enrutador = EnrutadorReplicas([replica])
+    Sesion = sessionmaker(bind=primaria, class_=SesionEnrutada, autoflush=False)
+    nombre = select(PersonaDB.nombre).where(PersonaDB.id == 1)
+
+    with enrutador.motor_lectura() as motor:
+        assert motor is None
+
+    token = lectura_en_replica.set(True)
+    try:
+        with enrutador.motor_lectura() as motor, Sesion() as db:
+            db.replica = motor
+            assert db.scalar(nombre) == "Réplica"
+            db.add(PersonaDB(nombre="Nueva", cedula="20000002"))
+            db.flush()
+            nueva = select(PersonaDB.nombre).where(PersonaDB.cedula == "20000002")
+            assert db.scalar(nueva) == "Nueva"
+            assert db.scalar(nombre) == "Primaria"
+            db.commit()
+        assert enrutador.replicas[0].en_uso == 0
+    finally:
+        lectura_en_replica.reset(token)
+
+
+def test_lecturas_propias_tras_escribir(tmp_path, monkeypatch) -> None:
+    """GET lee de la réplica salvo durante la ventana que abre una escritura del cliente."""
+    primaria = _motor(tmp_path, "primaria.db", "Primaria")
+    replica = _motor(tmp_path, "replica.db", "Réplica")
+    enrutador = EnrutadorReplicas([replica])
+    Sesion = sessionmaker(bind=primaria, class_=SesionEnrutada, autoflush=False)
+
+    def get_db_con_replicas() -> Generator:
+        with enrutador.motor_lectura() as motor:
+            db = Sesion()
+            db.replica = motor
+            try:
+                yield db
+            finally:
+                db.close()
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, get_db_con_replicas)
+    client = TestClient(ReplicasMiddleware(app, ventana=30))
+
+    assert client.get("/api/personas/1").json()["nombre"] == "Réplica"
+    response = client.put("/api/personas/1", json={"nombre": "Actualizada"})
+    assert response.status_code == 200
+    assert COOKIE_LEER_PRIMARIA in response.cookies
+    assert client.get("/api/personas/1").json()["nombre"] == "Actualizada"
+
+    client.cookies.set(COOKIE_LEER_PRIMARIA, f"{time.time() - 1:.3f}")
+    assert client.get("/api/personas/1").json()["nombre"] == "Réplica"
+    client.cookies.clear()
+    assert client.put("/api/personas/99", json={"nombre": "X"}).status_code == 404
+    assert COOKIE_LEER_PRIMARIA not in client.cookies
+
+
+def test_cache_de_marcas_no_guarda_lo_leido_de_una_replica(tmp_path) -> None:
+    """Una réplica retrasada no rellena la caché: quien escribió sigue viendo su escritura."""
+    primaria = _motor(tmp_path, "primaria.db", "Primaria")
+    replica = _motor(tmp_path, "replica.db", "Réplica")
+    Sesion = sessionmaker(bind=primaria, class_=SesionEnrutada, autoflush=False)
+    cache: TTLCache = TTLCache(maxsize=10, ttl=60)
+
+    def repositorio(db: SesionEnrutada) -> CachedMarcaRepository:
+        return CachedMarcaRepository(
+            SQLAlchemyMarcaRepository(db), cache, puede_guardar=lambda: lee_de_primaria(db)
+        )
+
+    # Otro worker escribió en la primaria; la réplica aún no lo tiene y aquí no hay entrada
+    with primaria.begin() as conn:
+        conn.execute(update(MarcaVehiculoDB).values(nombre_marca="Nueva"))
+
+    with Sesion() as otro_cliente:
+        otro_cliente.replica = replica
+        assert [m.nombre_marca for m in repositorio(otro_cliente).get_many([1])] == ["Vieja"]
+        assert repositorio(otro_cliente).get(1).nombre_marca == "Vieja"
+    assert cache.get(1) is None
+
+    with Sesion() as quien_escribio:
+        assert repositorio(quien_escribio).get(1).nombre_marca == "Nueva"
+    assert cache.get(1).nombre_marca == "Nueva"
+
+
+def test_exportacion_asincrona_lee_de_la_replica(tmp_path) -> None:
+    """``iter_export`` abre su conexión con el motor que elige la sesión enrutada."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    for nombre, modelo in (("primaria.db", "Primaria"), ("replica.db", "Réplica")):
+        with _motor(tmp_path, nombre, "Persona").begin() as conn:
+            conn.execute(
+                insert(VehiculoDB).values(modelo=modelo, marca_id=1, numero_puertas=4, color="Rojo")
+            )
+    primaria = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primaria.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+
+    async def exportar(con_replica: bool) -> list:
+        async with AsyncSession(primaria, sync_session_class=SesionEnrutada) as db:
+            if con_replica:
+                db.sync_session.replica = replica.sync_engine
+            repositorio = AsyncSQLAlchemyVehiculoRepository(db)
+            return [v.modelo async for v in repositorio.iter_export()]
+
+    async def ejecutar() -> tuple:
+        try:
+            return await exportar(True), await exportar(False)
+        finally:
+            await primaria.dispose()
+            await replica.dispose()
+
+    assert asyncio.run(ejecutar()) == (["Réplica"], ["Primaria"])
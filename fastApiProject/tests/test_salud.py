@@ -0,0 +1,103 @@
+"""
+Tests de las sondas de vida (``/livez``) y disponibilidad (``/readyz``).
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main
+from app.infrastructure.db.pool import QueuePoolMedido
+from app.infrastructure.db.salud import MonitorSalud
+
+client = TestClient(main.app)
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch) -> MonitorSalud:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'salud.db'}",
+        poolclass=QueuePoolMedido,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    monitor = MonitorSalud(engine, intervalo=5.0, timeout=1.0)
+    monkeypatch.setattr(main, "get_monitor_salud", lambda: monitor)
+    yield monitor
+    engine.dispose()
+
+
+def test_livez_no_consulta_la_base_de_datos() -> None:
+    response = client.get("/livez")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    assert response.headers["X-DB-Queries"] == "0"
+
+
+def test_readyz_sirve_la_ultima_comprobacion(monitor) -> None:
+    """Sin comprobar o con la comprobación caducada, 503; tras comprobar, 200 sin consultar."""
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["reasons"] == ["La base de datos no se ha comprobado todavía"]
+
+    asyncio.run(monitor.refrescar())
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "0"
+    informe = response.json()
+    assert informe["status"] == "ready"
+    assert informe["database"]["connected"] is True
+    assert informe["pool"]["capacity"] == 2
+    assert "host" not in informe["database"]
+
+    monitor.estado.comprobado = time.monotonic() - 60
+    assert client.get("/readyz").json()["reasons"] == [
+        "La última comprobación de la base de datos es demasiado antigua"
+    ]
+
+
+def test_readyz_no_disponible_con_el_pool_saturado(monitor) -> None:
+    """Con el pool lleno no se pide otra conexión y el proceso sale del balanceo."""
+    conexiones = [monitor.engine.connect(), monitor.engine.connect()]
+    inicio = time.perf_counter()
+    estado = asyncio.run(monitor.refrescar())
+    assert time.perf_counter() - inicio < monitor.engine.pool.timeout()
+    assert estado.saturado and estado.pool["saturation"] == 1.0
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert "Pool de conexiones saturado" in response.json()["reasons"]
+
+    for conexion in conexiones:
+        conexion.close()
+    assert asyncio.run(monitor.refrescar()).saturado is False
+    assert client.get("/readyz").status_code == 200
+
+
+def test_readyz_sin_conexion_y_comprobacion_periodica(tmp_path) -> None:
+    """Un fallo de conexión deja el proceso no disponible; el bucle refresca por intervalos."""
+    caida = MonitorSalud(create_engine(f"sqlite:///{tmp_path / 'no' / 'existe.db'}"))
+    estado = asyncio.run(caida.refrescar())
+    assert (estado.conectada, estado.error) == (False, "OperationalError")
+    assert caida.motivos() == ["Sin conexión con la base de datos: OperationalError"]
+
+    periodico = MonitorSalud(create_engine(f"sqlite:///{tmp_path / 'bucle.db'}"), intervalo=0.01)
+
+    async def ejecutar() -> float:
+        periodico.iniciar()
+        await asyncio.sleep(0.05)
+        primera = periodico.estado.comprobado
+        await asyncio.sleep(0.05)
+        await periodico.detener()
+        return primera
+
+    primera = asyncio.run(ejecutar())
+    assert periodico.estado.conectada and periodico.estado.comprobado > primera